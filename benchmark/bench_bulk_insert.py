@@ -0,0 +1,107 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure executemany INSERT throughput on SQLite with and without batch encoding of JSONField values.
+
+Usage::
+
+    python benchmark/bench_bulk_insert.py --rows 1000 10000 100000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlalchemy
+import sqlalchemy.orm
+
+import sqlalchemy_jsonfield
+
+Base = sqlalchemy.orm.declarative_base()
+
+
+class Record(Base):  # type: ignore[misc,valid-type]
+    """Benchmark table."""
+
+    __tablename__ = "bench_bulk_insert"
+    id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(enforce_string=True), nullable=False)
+
+
+def make_rows(count: int) -> list[dict[str, typing.Any]]:
+    """Generate insert parameters.
+
+    :param count: rows count
+    :type count: int
+    :return: parameters list
+    :rtype: list[dict[str, typing.Any]]
+    """
+    return [
+        {
+            "id": idx,
+            "json_record": {"id": idx, "name": f"row{idx}", "tags": [f"tag{tag}" for tag in range(10)], "ratio": 0.5},
+        }
+        for idx in range(count)
+    ]
+
+
+def run(rows: list[dict[str, typing.Any]], mode: str, workers: int) -> float:
+    """Insert rows into the new in-memory database.
+
+    :param rows: insert parameters
+    :type rows: list[dict[str, typing.Any]]
+    :param mode: "per-row", "batch" or "threads"
+    :type mode: str
+    :param workers: thread pool size for "threads" mode
+    :type workers: int
+    :return: rows per second
+    :rtype: float
+    """
+    engine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with ThreadPoolExecutor(workers) as executor:
+        if mode == "batch":
+            sqlalchemy_jsonfield.enable_bulk_encoding(engine)
+        elif mode == "threads":
+            sqlalchemy_jsonfield.enable_bulk_encoding(engine, executor=executor)
+
+        started = time.perf_counter()
+        with sqlalchemy.orm.Session(engine) as session:
+            session.execute(sqlalchemy.insert(Record), rows)
+            session.commit()
+        elapsed = time.perf_counter() - started
+    engine.dispose()
+    return len(rows) / elapsed
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3, help="best result of N runs is reported")
+    args = parser.parse_args()
+
+    for count in args.rows:
+        rows = make_rows(count)
+        for mode in ("per-row", "batch", "threads"):
+            rate = max(run(rows, mode, args.workers) for _ in range(args.repeat))
+            print(f"{count:>7} rows {mode:>8}: {rate:10.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
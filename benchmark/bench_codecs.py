@@ -0,0 +1,81 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compare JSONField bind/result processors for available codecs against the stdlib json.
+
+Usage::
+
+    python benchmark/bench_codecs.py --iterations 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+from sqlalchemy.dialects import sqlite
+
+import sqlalchemy_jsonfield
+
+PAYLOAD = {
+    "id": 12345,
+    "name": "benchmark",
+    "tags": [f"tag{idx}" for idx in range(20)],
+    "nested": {"values": list(range(50)), "ratio": 0.125, "enabled": True, "missing": None},
+}
+
+
+def codecs() -> dict[str, sqlalchemy_jsonfield.JSONCodec]:
+    """Collect installed codecs.
+
+    :return: codec adapters by name
+    :rtype: dict[str, sqlalchemy_jsonfield.JSONCodec]
+    """
+    result: dict[str, sqlalchemy_jsonfield.JSONCodec] = {"json": sqlalchemy_jsonfield.StdlibCodec(json)}
+    for name, factory in (("orjson", sqlalchemy_jsonfield.OrjsonCodec), ("msgspec", sqlalchemy_jsonfield.MsgspecCodec)):
+        try:
+            result[name] = factory()
+        except ImportError:  # noqa: PERF203
+            print(f"{name} is not installed, skipped")
+    return result
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    dialect = sqlite.dialect()
+    available = codecs()
+
+    for storage in ("enforce_string", "enforce_binary"):
+        for name, codec in available.items():
+            field = sqlalchemy_jsonfield.JSONField(json=codec, enforce_unicode=True, **{storage: True})
+            impl = field.dialect_impl(dialect)
+            bind = impl.bind_processor(dialect)
+            result = impl.result_processor(dialect, None)
+            encoded = bind(PAYLOAD)
+
+            encode_time = timeit.timeit(lambda bind=bind: bind(PAYLOAD), number=args.iterations)
+            decode_time = timeit.timeit(lambda result=result, encoded=encoded: result(encoded), number=args.iterations)
+            print(
+                f"{storage:>15} {name:>8}: "
+                f"encode {args.iterations / encode_time:10.0f}/sec, decode {args.iterations / decode_time:10.0f}/sec"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compare memory of large yield_per scans with and without key interning.
+
+Table of same-shaped documents is created once, each mode scans it in a separate process
+and keeps all decoded documents, RSS growth is reported.
+
+Usage::
+
+    python benchmark/bench_intern.py --rows 200000 --keys 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+import sqlalchemy
+
+import sqlalchemy_jsonfield
+
+MODES: dict[str, dict[str, typing.Any]] = {
+    "plain": {},
+    "intern_keys": {"intern_table": True},
+    "intern_values": {"intern_table": sqlalchemy_jsonfield.InternTable(max_value_length=16)},
+}
+
+
+def rss() -> int:
+    """Current resident set size of the process.
+
+    :return: RSS in bytes (peak RSS if current is not available)
+    :rtype: int
+    """
+    try:
+        pages = int(pathlib.Path("/proc/self/statm").read_text(encoding="ascii").split()[1])
+    except OSError:
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def make_table(field: sqlalchemy_jsonfield.JSONField) -> sqlalchemy.Table:
+    """Make benchmark table.
+
+    :param field: JSONField instance
+    :type field: sqlalchemy_jsonfield.JSONField
+    :return: table
+    :rtype: sqlalchemy.Table
+    """
+    return sqlalchemy.Table(
+        "bench",
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+        sqlalchemy.Column("json_record", field, nullable=False),
+    )
+
+
+def populate(database: str, rows: int, keys: int) -> None:
+    """Create table with same-shaped documents.
+
+    :param database: SQLite database path
+    :type database: str
+    :param rows: documents count
+    :type rows: int
+    :param keys: keys per document
+    :type keys: int
+    """
+    table = make_table(sqlalchemy_jsonfield.JSONField(enforce_string=True))
+    engine = sqlalchemy.create_engine(f"sqlite:///{database}")
+    table.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for start in range(0, rows, 10000):
+            connection.execute(
+                table.insert(),
+                [
+                    {
+                        "json_record": {
+                            f"attribute_{key:02d}": f"state_{(idx + key) % 8}" if key % 2 else idx * key
+                            for key in range(keys)
+                        }
+                    }
+                    for idx in range(start, min(start + 10000, rows))
+                ],
+            )
+    engine.dispose()
+
+
+def scan(database: str, mode: str, batch: int) -> dict[str, typing.Any]:
+    """Scan all documents with yield_per and keep decoded values.
+
+    :param database: SQLite database path
+    :type database: str
+    :param mode: benchmark mode name
+    :type mode: str
+    :param batch: yield_per batch size
+    :type batch: int
+    :return: measurements
+    :rtype: dict[str, typing.Any]
+    """
+    field = sqlalchemy_jsonfield.JSONField(enforce_string=True, **MODES[mode])
+    table = make_table(field)
+    engine = sqlalchemy.create_engine(f"sqlite:///{database}")
+    before = rss()
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        documents = [
+            row.json_record
+            for row in connection.execution_options(yield_per=batch).execute(sqlalchemy.select(table.c.json_record))
+        ]
+    elapsed = time.perf_counter() - started
+    result = {"rows": len(documents), "rss_growth": rss() - before, "seconds": elapsed}
+    if field.intern_table is not None:
+        result["intern"] = field.intern_table.info()._asdict()
+    return result
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--keys", type=int, default=40)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--mode", choices=tuple(MODES), help=argparse.SUPPRESS)
+    parser.add_argument("--database", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode is not None:  # Worker process
+        print(json.dumps(scan(args.database, args.mode, args.batch)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = str(pathlib.Path(directory) / "bench.sqlite")
+        populate(database, args.rows, args.keys)
+        for mode in MODES:
+            output = subprocess.run(  # noqa: S603
+                [sys.executable, __file__, "--mode", mode, "--database", database, "--batch", str(args.batch)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{mode:>14}: {result['rss_growth'] / 2**20:8.1f} MiB RSS growth, "
+                f"{result['rows'] / result['seconds']:10.1f} rows/sec"
+            )
+            if "intern" in result:
+                print(f"{'':>14}  {result['intern']}")
+
+
+if __name__ == "__main__":
+    main()
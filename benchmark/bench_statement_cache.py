@@ -0,0 +1,88 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compare repeated select throughput with and without compiled statements cache usage.
+
+Usage::
+
+    python benchmark/bench_statement_cache.py --rows 100 --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import sqlalchemy.orm
+
+import sqlalchemy_jsonfield
+
+
+class UncachedJSONField(sqlalchemy_jsonfield.JSONField):  # pylint: disable=abstract-method
+    """JSONField with disabled statement cache participation (behavior before cache key support)."""
+
+    cache_ok = False
+
+
+def run(field: sqlalchemy_jsonfield.JSONField, rows: int, iterations: int) -> float:
+    """Execute select statement multiple times and return executions per second.
+
+    :param field: JSONField instance to benchmark
+    :type field: sqlalchemy_jsonfield.JSONField
+    :param rows: amount of rows in the table
+    :type rows: int
+    :param iterations: amount of select executions
+    :type iterations: int
+    :return: executions per second
+    :rtype: float
+    """
+    metadata = sqlalchemy.MetaData()
+    table = sqlalchemy.Table(
+        "bench",
+        metadata,
+        sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+        sqlalchemy.Column("json_record", field, nullable=False),
+    )
+    engine = sqlalchemy.create_engine("sqlite://")
+    metadata.create_all(engine)
+
+    with sqlalchemy.orm.Session(engine) as session:
+        session.execute(table.insert(), [{"json_record": {"key": idx}} for idx in range(rows)])
+        session.commit()
+
+        started = time.perf_counter()
+        for idx in range(iterations):
+            session.execute(sqlalchemy.select(table).where(table.c.id == idx % rows + 1)).all()
+        elapsed = time.perf_counter() - started
+
+    engine.dispose()
+    return iterations / elapsed
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, field in (
+        ("cache_ok=False", UncachedJSONField(enforce_string=True)),
+        ("cache_ok=True", sqlalchemy_jsonfield.JSONField(enforce_string=True)),
+    ):
+        print(f"{name:>16}: {run(field, args.rows, args.iterations):10.1f} selects/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Reproducible benchmark suite: JSONField and mutable_json_field on SQLite.
+
+Matrix: field (plain/mutable) x mode (native/enforce_string) x codec (json/ujson/orjson, installed only)
+x payload (small/medium/huge/wide/deep) x operation (single-row insert, bulk insert, full fetch, update).
+Plain fields are measured by the Core statements, mutable fields by the ORM session: fetched documents are changed
+in place and committed, so change tracking and flush are measured.
+Payloads are generated deterministically, each case reports the best of N runs.
+
+Usage::
+
+    python benchmark/run.py --output results.json
+    python benchmark/run.py --filter orjson --filter small --baseline results.json --tolerance 0.1
+
+With `--baseline` cases slower than baseline more than tolerance are reported and exit code is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import itertools
+import json
+import pathlib
+import platform
+import sqlite3
+import sys
+import time
+import typing
+
+import sqlalchemy
+import sqlalchemy.orm
+
+import sqlalchemy_jsonfield
+
+# name: (factory, rows)
+PAYLOADS: dict[str, tuple[typing.Callable[[int], typing.Any], int]] = {}
+
+OPERATIONS = ("insert_single", "insert_bulk", "fetch", "update")
+MODES = ("native", "enforce_string")
+FIELDS = ("plain", "mutable")
+CODEC_MODULES = ("json", "ujson", "orjson")
+
+
+def payload(
+    name: str, rows: int
+) -> typing.Callable[[typing.Callable[[int], typing.Any]], typing.Callable[[int], typing.Any]]:
+    """Register payload factory.
+
+    :param name: payload name
+    :type name: str
+    :param rows: rows count used for the payload
+    :type rows: int
+    :return: decorator
+    :rtype: typing.Callable[[typing.Callable[[int], typing.Any]], typing.Callable[[int], typing.Any]]
+    """
+
+    def register(factory: typing.Callable[[int], typing.Any]) -> typing.Callable[[int], typing.Any]:
+        PAYLOADS[name] = (factory, rows)
+        return factory
+
+    return register
+
+
+@payload("small", 2000)
+def small(idx: int) -> dict[str, typing.Any]:
+    """Small flat document (~100 bytes)."""
+    return {"id": idx, "name": f"row{idx}", "enabled": idx % 2 == 0, "ratio": 0.5}
+
+
+@payload("medium", 1000)
+def medium(idx: int) -> dict[str, typing.Any]:
+    """Typical document (~2 KB)."""
+    return {
+        "id": idx,
+        "name": f"row{idx}",
+        "tags": [f"tag{tag}" for tag in range(20)],
+        "items": [{"sku": f"sku-{idx}-{item}", "qty": item, "price": item * 1.25} for item in range(20)],
+        "owner": {"name": "benchmark", "email": "bench@example.com", "roles": ["reader", "writer"]},
+    }
+
+
+@payload("huge", 20)
+def huge(idx: int) -> dict[str, typing.Any]:
+    """Huge document (~1 MB)."""
+    return {
+        "id": idx,
+        "events": [
+            {"seq": seq, "kind": f"kind{seq % 7}", "payload": {"value": seq * 0.5, "text": "x" * 40}}
+            for seq in range(10000)
+        ],
+    }
+
+
+@payload("wide", 200)
+def wide(idx: int) -> dict[str, typing.Any]:
+    """Wide document: 2000 top-level keys."""
+    return {f"key{key}": key + idx for key in range(2000)}
+
+
+@payload("deep", 500)
+def deep(idx: int) -> dict[str, typing.Any]:
+    """Deep document: 100 nesting levels."""
+    document: dict[str, typing.Any] = {"id": idx}
+    for level in range(100):
+        document = {"level": level, "child": document}
+    return document
+
+
+def codecs() -> dict[str, typing.Any]:
+    """Collect installed codec modules.
+
+    :return: modules by name
+    :rtype: dict[str, typing.Any]
+    """
+    result: dict[str, typing.Any] = {}
+    for name in CODEC_MODULES:
+        try:
+            result[name] = importlib.import_module(name)
+        except ImportError:  # noqa: PERF203
+            print(f"{name} is not installed, skipped", file=sys.stderr)
+    return result
+
+
+def make_field(field: str, mode: str, codec: typing.Any) -> sqlalchemy_jsonfield.JSONField:
+    """Create field for the case.
+
+    :param field: "plain" or "mutable"
+    :type field: str
+    :param mode: "native" or "enforce_string"
+    :type mode: str
+    :param codec: json library
+    :type codec: typing.Any
+    :return: field
+    :rtype: sqlalchemy_jsonfield.JSONField
+    """
+    enforce_string = mode == "enforce_string"
+    if field == "mutable":
+        return sqlalchemy_jsonfield.mutable_json_field(enforce_string=enforce_string, json=codec)
+    return sqlalchemy_jsonfield.JSONField(enforce_string=enforce_string, json=codec)
+
+
+def _run_core(
+    table: sqlalchemy.Table,
+    engine: sqlalchemy.Engine,
+    parameters: list[dict[str, typing.Any]],
+    single: list[dict[str, typing.Any]],
+    bulk: list[dict[str, typing.Any]],
+) -> dict[str, float]:
+    """Run operations by the Core statements: plain field has no change tracking.
+
+    :param table: benchmark table
+    :type table: sqlalchemy.Table
+    :param engine: engine of the new in-memory database
+    :type engine: sqlalchemy.Engine
+    :param parameters: all rows
+    :type parameters: list[dict[str, typing.Any]]
+    :param single: rows for the single-row inserts
+    :type single: list[dict[str, typing.Any]]
+    :param bulk: rows for the bulk insert
+    :type bulk: list[dict[str, typing.Any]]
+    :return: seconds by operation
+    :rtype: dict[str, float]
+    """
+    rows = len(parameters)
+    results: dict[str, float] = {}
+    with engine.connect() as connection:
+        started = time.perf_counter()
+        for item in single:
+            connection.execute(table.insert(), item)
+        results["insert_single"] = (time.perf_counter() - started) / len(single) * rows  # Normalized to rows count
+
+        started = time.perf_counter()
+        connection.execute(table.insert(), bulk)
+        results["insert_bulk"] = time.perf_counter() - started
+        connection.commit()
+
+        statement = sqlalchemy.select(table.c.id, table.c.json_record).where(table.c.id >= rows)
+        started = time.perf_counter()
+        fetched = connection.execute(statement).all()
+        results["fetch"] = time.perf_counter() - started
+
+        update = (
+            table.update()
+            .where(table.c.id == sqlalchemy.bindparam("row_id"))
+            .values(json_record=sqlalchemy.bindparam("row_json"))
+        )
+        started = time.perf_counter()
+        connection.execute(update, [{"row_id": key, "row_json": {**value, "bench": key}} for key, value in fetched])
+        connection.commit()
+        results["update"] = time.perf_counter() - started
+
+    if len(fetched) != rows:
+        raise RuntimeError(f"Fetched {len(fetched)} rows instead of {rows}")
+    return results
+
+
+def _run_orm(
+    table: sqlalchemy.Table,
+    engine: sqlalchemy.Engine,
+    parameters: list[dict[str, typing.Any]],
+    single: list[dict[str, typing.Any]],
+    bulk: list[dict[str, typing.Any]],
+) -> dict[str, float]:
+    """Run operations by the ORM session: mutable field tracks changes of loaded documents.
+
+    :param table: benchmark table
+    :type table: sqlalchemy.Table
+    :param engine: engine of the new in-memory database
+    :type engine: sqlalchemy.Engine
+    :param parameters: all rows
+    :type parameters: list[dict[str, typing.Any]]
+    :param single: rows for the single-row inserts
+    :type single: list[dict[str, typing.Any]]
+    :param bulk: rows for the bulk insert
+    :type bulk: list[dict[str, typing.Any]]
+    :return: seconds by operation
+    :rtype: dict[str, float]
+    """
+
+    class Record:
+        """Mapped benchmark row."""
+
+        def __init__(self, **kwargs: typing.Any) -> None:
+            self.__dict__.update(kwargs)
+
+    registry = sqlalchemy.orm.registry()
+    registry.map_imperatively(Record, table)
+
+    rows = len(parameters)
+    results: dict[str, float] = {}
+    with sqlalchemy.orm.Session(engine) as session:
+        started = time.perf_counter()
+        for item in single:
+            session.add(Record(**item))
+            session.flush()
+        results["insert_single"] = (time.perf_counter() - started) / len(single) * rows  # Normalized to rows count
+
+        started = time.perf_counter()
+        session.add_all([Record(**item) for item in bulk])
+        session.commit()
+        results["insert_bulk"] = time.perf_counter() - started
+
+    with sqlalchemy.orm.Session(engine) as session:  # Empty identity map: documents are decoded
+        statement = sqlalchemy.select(Record).where(table.c.id >= rows)
+        started = time.perf_counter()
+        fetched = session.scalars(statement).all()
+        results["fetch"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for record in fetched:
+            record.json_record["bench"] = record.id  # type: ignore[attr-defined]
+        session.commit()
+        results["update"] = time.perf_counter() - started
+
+    with sqlalchemy.orm.Session(engine) as session:
+        last = session.get(Record, rows * 2 - 1)
+        if last is None or "bench" not in last.json_record:  # type: ignore[attr-defined]
+            raise RuntimeError("Changed documents are not written")
+
+    registry.dispose()
+    if len(fetched) != rows:
+        raise RuntimeError(f"Fetched {len(fetched)} rows instead of {rows}")
+    return results
+
+
+def run_case(
+    field_kind: str,
+    field: sqlalchemy_jsonfield.JSONField,
+    factory: typing.Callable[[int], typing.Any],
+    rows: int,
+) -> dict[str, float]:
+    """Run all operations of the case once on the new in-memory database.
+
+    Plain field is measured by the Core statements, mutable field by the ORM session:
+    loaded documents are changed in place and committed, so change tracking is measured.
+
+    :param field_kind: "plain" or "mutable"
+    :type field_kind: str
+    :param field: field under test
+    :type field: sqlalchemy_jsonfield.JSONField
+    :param factory: payload factory
+    :type factory: typing.Callable[[int], typing.Any]
+    :param rows: rows count
+    :type rows: int
+    :return: seconds by operation
+    :rtype: dict[str, float]
+    """
+    metadata = sqlalchemy.MetaData()
+    table = sqlalchemy.Table(
+        "bench",
+        metadata,
+        sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+        sqlalchemy.Column("json_record", field, nullable=False),
+    )
+    engine = sqlalchemy.create_engine("sqlite://")
+    metadata.create_all(engine)
+    parameters = [{"id": idx, "json_record": factory(idx)} for idx in range(rows)]
+    single = parameters[: max(1, rows // 10)]
+    bulk = [{"id": rows + item["id"], "json_record": item["json_record"]} for item in parameters]
+
+    run = _run_orm if field_kind == "mutable" else _run_core
+    results = run(table, engine, parameters, single, bulk)
+    engine.dispose()
+    return results
+
+
+def collect(patterns: list[str], repeat: int, scale: float) -> list[dict[str, typing.Any]]:
+    """Run matching cases.
+
+    :param patterns: substrings of the case name, all should match
+    :type patterns: list[str]
+    :param repeat: runs per case, best result is reported
+    :type repeat: int
+    :param scale: rows count multiplier
+    :type scale: float
+    :return: results
+    :rtype: list[dict[str, typing.Any]]
+    """
+    available = codecs()
+    results: list[dict[str, typing.Any]] = []
+    for field, mode, (codec_name, codec), (payload_name, (factory, rows)) in itertools.product(
+        FIELDS, MODES, available.items(), PAYLOADS.items()
+    ):
+        case = f"{field}/{mode}/{codec_name}/{payload_name}"
+        if not all(pattern in case for pattern in patterns):
+            continue
+        count = max(1, int(rows * scale))
+        runs = [run_case(field, make_field(field, mode, codec), factory, count) for _ in range(repeat)]
+        for operation in OPERATIONS:
+            best = min(run[operation] for run in runs)
+            name = f"{case}/{operation}"
+            results.append({"name": name, "rows": count, "seconds": best, "rows_per_sec": count / best})
+            print(f"{name:<50} {count / best:12.0f} rows/sec", file=sys.stderr)
+    return results
+
+
+def compare(results: list[dict[str, typing.Any]], baseline: dict[str, typing.Any], tolerance: float) -> list[str]:
+    """Compare results with baseline.
+
+    :param results: current results
+    :type results: list[dict[str, typing.Any]]
+    :param baseline: previous output of the runner
+    :type baseline: dict[str, typing.Any]
+    :param tolerance: allowed slowdown ratio
+    :type tolerance: float
+    :return: regression descriptions
+    :rtype: list[str]
+    """
+    previous = {case["name"]: case for case in baseline["results"]}
+    regressions: list[str] = []
+    for case in results:
+        reference = previous.get(case["name"])
+        if reference is None:
+            continue
+        ratio = case["rows_per_sec"] / reference["rows_per_sec"]
+        case["baseline_ratio"] = ratio
+        if ratio < 1 - tolerance:
+            regressions.append(f"{case['name']}: {ratio:.2f}x of baseline")
+    return regressions
+
+
+def main() -> None:
+    """Run benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", action="append", default=[], help="run cases containing substring (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="best result of N runs is reported")
+    parser.add_argument("--scale", type=float, default=1.0, help="rows count multiplier")
+    parser.add_argument("--output", help="write JSON results to the file instead of stdout")
+    parser.add_argument("--baseline", help="previous JSON results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown ratio against baseline")
+    args = parser.parse_args()
+
+    results = collect(args.filter, args.repeat, args.scale)
+    regressions: list[str] = []
+    if args.baseline:
+        baseline = json.loads(pathlib.Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+
+    report = {
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sqlite": sqlite3.sqlite_version,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        pathlib.Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
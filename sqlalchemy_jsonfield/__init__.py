@@ -17,10 +17,75 @@ from __future__ import annotations
 
 from ._version import __version__
 from ._version import __version_tuple__
+from .bulk import enable_bulk_encoding
+from .cache import DecodeCache
+from .cache import EncodeCache
+from .chunks import ChunkedJSON
+from .chunks import ChunkStore
+from .codec import CallableCodec
+from .codec import JSONCodec
+from .codec import MsgspecCodec
+from .codec import OrjsonCodec
+from .codec import StdlibCodec
+from .codec import get_codec
+from .content import ContentStore
+from .formats import StorageFormat
+from .formats import register_format
+from .frozen import FrozenDict
+from .frozen import PartialJSON
+from .frozen import freeze
+from .frozen import thaw
+from .intern import InternTable
 from .jsonfield import JSONField
 from .jsonfield import mutable_json_field
+from .lazy import LazyJSON
+from .migration import reencode_column
+from .mutable import MutableJSONDict
+from .mutable import NestedMutable
+from .mutable import NestedMutableDict
+from .mutable import NestedMutableList
+from .projection import json_projection
+from .projection import load_json_paths
+from .storage import Compressor
+from .storage import register_compressor
+from .stream import JSONStream
 
-__all__ = ("JSONField", "__version__", "__version_tuple__", "mutable_json_field")
+__all__ = (
+    "CallableCodec",
+    "ChunkStore",
+    "ChunkedJSON",
+    "Compressor",
+    "ContentStore",
+    "DecodeCache",
+    "EncodeCache",
+    "FrozenDict",
+    "InternTable",
+    "JSONCodec",
+    "JSONField",
+    "JSONStream",
+    "LazyJSON",
+    "MsgspecCodec",
+    "MutableJSONDict",
+    "NestedMutable",
+    "NestedMutableDict",
+    "NestedMutableList",
+    "OrjsonCodec",
+    "PartialJSON",
+    "StdlibCodec",
+    "StorageFormat",
+    "__version__",
+    "__version_tuple__",
+    "enable_bulk_encoding",
+    "freeze",
+    "get_codec",
+    "json_projection",
+    "load_json_paths",
+    "mutable_json_field",
+    "reencode_column",
+    "register_compressor",
+    "register_format",
+    "thaw",
+)
 
 __author__ = "Aleksei Stepanov <penguinolog@gmail.com>"
 __author_email__ = "penguinolog@gmail.com"
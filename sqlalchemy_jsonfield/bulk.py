@@ -0,0 +1,127 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Batch encoding of JSONField values for executemany and insertmanyvalues statements."""
+
+from __future__ import annotations
+
+import typing
+
+import sqlalchemy
+import sqlalchemy.event
+
+from .jsonfield import JSONField
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+    from concurrent.futures import Executor
+
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.engine import Engine
+
+__all__ = ("enable_bulk_encoding",)
+
+
+def _encode_parameters(
+    statement: sqlalchemy.Insert | sqlalchemy.Update,
+    parameters: Sequence[dict[str, typing.Any]],
+    connection: Connection,
+    executor: Executor | None,
+    chunk_size: int,
+) -> list[dict[str, typing.Any]] | None:
+    """Encode JSONField values of the parameters list.
+
+    :param statement: executed statement
+    :type statement: sqlalchemy.Insert | sqlalchemy.Update
+    :param parameters: parameters list
+    :type parameters: Sequence[dict[str, typing.Any]]
+    :param connection: connection used for execution
+    :type connection: Connection
+    :param executor: executor for parallel encoding
+    :type executor: concurrent.futures.Executor | None
+    :param chunk_size: values per executor task
+    :type chunk_size: int
+    :return: parameters list with encoded values or None if statement has no JSONField parameters
+    :rtype: list[dict[str, typing.Any]] | None
+    """
+    table = statement.table
+    columns = getattr(table, "columns", ())
+    fields = [
+        (column.key, column.type)
+        for column in columns
+        if isinstance(column.type, JSONField) and column.key in parameters[0]
+    ]
+    if not fields:
+        return None
+
+    result = [dict(row) for row in parameters]  # Parameters of the caller are not modified
+    for key, field in fields:
+        rows = [row for row in result if key in row]
+        encoded = field.encode_many(
+            (row[key] for row in rows),
+            connection.dialect,
+            executor=executor,
+            chunk_size=chunk_size,
+        )
+        for row, value in zip(rows, encoded):
+            row[key] = value
+    return result
+
+
+def enable_bulk_encoding(
+    bind: Engine | Connection,
+    *,
+    executor: Executor | None = None,
+    min_rows: int = 100,
+    chunk_size: int = 1000,
+) -> None:
+    """Encode JSONField values of INSERT and UPDATE parameters lists in one pass before execution.
+
+    Encoded values are passed by the bind processors as is, so per-row processing is reduced to the type check.
+    ORM bulk INSERT/UPDATE statements executed via `Session.execute(insert(Model), [...])` are handled too.
+
+    :param bind: engine or connection for the listener
+    :type bind: Engine | Connection
+    :param executor: executor for parallel encoding (useful for codecs releasing GIL)
+    :type executor: concurrent.futures.Executor | None
+    :param min_rows: minimal parameters list size for batch encoding
+    :type min_rows: int
+    :param chunk_size: values per executor task
+    :type chunk_size: int
+    """
+
+    def before_execute(
+        conn: Connection,
+        clauseelement: typing.Any,
+        multiparams: typing.Any,
+        params: typing.Any,
+        execution_options: typing.Any,
+    ) -> tuple[typing.Any, typing.Any, typing.Any]:
+        """Replace JSONField values by encoded ones.
+
+        :return: statement and parameters for execution
+        :rtype: tuple[typing.Any, typing.Any, typing.Any]
+        """
+        if (
+            isinstance(clauseelement, (sqlalchemy.Insert, sqlalchemy.Update))
+            and isinstance(multiparams, list)
+            and len(multiparams) >= min_rows
+            and isinstance(multiparams[0], dict)
+        ):
+            encoded = _encode_parameters(clauseelement, multiparams, conn, executor, chunk_size)
+            if encoded is not None:
+                return clauseelement, encoded, params
+        return clauseelement, multiparams, params
+
+    sqlalchemy.event.listen(bind, "before_execute", before_execute, retval=True)
@@ -0,0 +1,370 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Bounded caches: decoded values of repeated stored payloads and encoded values of unchanged documents."""
+
+from __future__ import annotations
+
+import collections
+import copy
+import itertools
+import marshal
+import threading
+import typing
+import weakref
+
+from .mutable import MutableJSONDict
+from .mutable import NestedMutable
+
+__all__ = ("CacheInfo", "DecodeCache", "EncodeCache")
+
+_MISSING = object()
+
+
+class CacheInfo(typing.NamedTuple):
+    """Decode cache statistics."""
+
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    currbytes: int
+
+
+class DecodeCache:
+    """LRU cache of decoded values keyed by the stored payload.
+
+    With copy-on-read callers receive independent copies: values are kept as marshal snapshots,
+    which are restored several times faster than JSON is parsed. Values not supported by marshal are deep copied.
+    Instance can be shared by the fields: entries of each wrapped decoder are separated, limits are common.
+    """
+
+    __slots__ = (
+        "__bytes",
+        "__copy",
+        "__entries",
+        "__evictions",
+        "__hits",
+        "__lock",
+        "__max_bytes",
+        "__max_item_size",
+        "__maxsize",
+        "__misses",
+        "__tokens",
+    )
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        *,
+        max_bytes: int | None = None,
+        max_item_size: int = 65536,
+        copy_on_read: bool = True,
+    ) -> None:
+        """LRU cache of decoded values.
+
+        :param maxsize: maximal cached values count
+        :type maxsize: int
+        :param max_bytes: maximal total size of cached payloads and snapshots
+        :type max_bytes: int | None
+        :param max_item_size: payloads larger than limit are decoded without caching
+        :type max_item_size: int
+        :param copy_on_read: return copies of cached values, disable only for immutable values
+        :type copy_on_read: bool
+        :raises ValueError: maxsize is not positive
+        """
+        if maxsize <= 0:
+            raise ValueError(f"maxsize should be positive, got {maxsize}")
+        self.__maxsize = maxsize
+        self.__max_bytes = max_bytes
+        self.__max_item_size = max_item_size
+        self.__copy = copy_on_read
+        self.__lock = threading.Lock()
+        # (decoder token, payload) -> (marshal snapshot, None) | (None, value)
+        self.__entries: collections.OrderedDict[tuple[int, str | bytes], tuple[bytes | None, typing.Any]] = (
+            collections.OrderedDict()
+        )
+        self.__tokens = itertools.count()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__bytes = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"maxsize={self.__maxsize!r}, "
+            f"max_bytes={self.__max_bytes!r}, "
+            f"max_item_size={self.__max_item_size!r}, "
+            f"copy_on_read={self.__copy!r})"
+        )
+
+    def info(self) -> CacheInfo:
+        """Cache statistics.
+
+        :return: hits, misses, evictions, current size and total size of cached payloads and snapshots
+        :rtype: CacheInfo
+        """
+        with self.__lock:
+            return CacheInfo(self.__hits, self.__misses, self.__evictions, len(self.__entries), self.__bytes)
+
+    def clear(self) -> None:
+        """Drop cached values and reset statistics."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = self.__misses = self.__evictions = self.__bytes = 0
+
+    def __get(self, key: tuple[int, str | bytes], shared: bool) -> typing.Any:
+        """Get cached value.
+
+        :param key: decoder token and stored payload
+        :type key: tuple[int, str | bytes]
+        :param shared: value is immutable and shared without copying
+        :type shared: bool
+        :return: cached value (copy if copy-on-read is enabled) or missing marker
+        :rtype: typing.Any
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return _MISSING
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+        snapshot, value = entry
+        if snapshot is not None:
+            return marshal.loads(snapshot)  # noqa: S302  # Snapshot is produced by the cache itself
+        if self.__copy and not shared:
+            return copy.deepcopy(value)
+        return value
+
+    def __put(self, key: tuple[int, str | bytes], value: typing.Any, shared: bool) -> None:
+        """Store decoded value and evict least recently used values over limits.
+
+        :param key: decoder token and stored payload
+        :type key: tuple[int, str | bytes]
+        :param value: decoded value
+        :type value: typing.Any
+        :param shared: value is immutable and shared without copying
+        :type shared: bool
+        """
+        entry: tuple[bytes | None, typing.Any] = (None, value)
+        if self.__copy and not shared:
+            try:
+                entry = (marshal.dumps(value), None)
+            except ValueError:  # Not only builtin types: caller owns the value, cache keeps a deep copy
+                entry = (None, copy.deepcopy(value))
+        size = len(key[1]) + (0 if entry[0] is None else len(entry[0]))
+        with self.__lock:
+            if key in self.__entries:
+                return
+            self.__entries[key] = entry
+            self.__bytes += size
+            while len(self.__entries) > self.__maxsize or (
+                self.__max_bytes is not None and self.__bytes > self.__max_bytes and len(self.__entries) > 1
+            ):
+                evicted_key, (evicted_snapshot, _) = self.__entries.popitem(last=False)
+                self.__bytes -= len(evicted_key[1]) + (0 if evicted_snapshot is None else len(evicted_snapshot))
+                self.__evictions += 1
+
+    def wrap(
+        self,
+        decode: typing.Callable[[typing.Any], typing.Any],
+        shared: bool = False,
+    ) -> typing.Callable[[typing.Any], typing.Any]:
+        """Make caching decoder.
+
+        :param decode: decoder
+        :type decode: typing.Callable[[typing.Any], typing.Any]
+        :param shared: decoder produces immutable values, which are shared without copying
+        :type shared: bool
+        :return: caching decoder
+        :rtype: typing.Callable[[typing.Any], typing.Any]
+        """
+        max_item_size = self.__max_item_size
+        get = self.__get
+        put = self.__put
+        token = next(self.__tokens)  # Decoders sharing the cache do not see values of each other
+
+        def decode_cached(data: str | bytes | bytearray | memoryview) -> typing.Any:
+            if len(data) > max_item_size:
+                return decode(data)
+            payload = data if isinstance(data, (str, bytes)) else bytes(data)
+            key = (token, payload)
+            value = get(key, shared)
+            if value is _MISSING:
+                value = decode(payload)
+                put(key, value, shared)
+            return value
+
+        return decode_cached
+
+
+def _version(value: typing.Any) -> int | None:
+    """Version of the document with exactly tracked changes.
+
+    :param value: bound value
+    :type value: typing.Any
+    :return: version incremented by each change event or None if changes are not tracked
+    :rtype: int | None
+    """
+    # pylint: disable=protected-access
+    if isinstance(value, NestedMutable):
+        return value._json_version if value._json_parent is None else None
+    if isinstance(value, MutableJSONDict):
+        # Only top-level changes emit events: documents with nested containers are not tracked exactly
+        for item in value.values():
+            if isinstance(item, (dict, list)):
+                return None
+        return value._json_version
+    return None
+
+
+class EncodeCache:
+    """LRU cache of encoded values keyed by the identity and version of the bound document.
+
+    Only documents with exactly tracked changes are cached: nested mutable containers
+    (`mutable_json_field(track_nested=True)`) and MutableJSONDict without nested containers.
+    Version of the document is incremented by each change event, so changed documents are encoded again.
+    Other values are encoded on every call.
+    Documents are referenced weakly: cache does not keep them alive.
+    """
+
+    __slots__ = (
+        "__bytes",
+        "__entries",
+        "__evictions",
+        "__hits",
+        "__lock",
+        "__max_bytes",
+        "__max_item_size",
+        "__misses",
+        "__tokens",
+    )
+
+    def __init__(self, max_bytes: int = 16 * 2**20, *, max_item_size: int | None = None) -> None:
+        """LRU cache of encoded values.
+
+        :param max_bytes: maximal total size of cached encoded values
+        :type max_bytes: int
+        :param max_item_size: encoded values larger than limit are not cached, max_bytes if not set
+        :type max_item_size: int | None
+        :raises ValueError: max_bytes is not positive
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes should be positive, got {max_bytes}")
+        self.__max_bytes = max_bytes
+        self.__max_item_size = max_bytes if max_item_size is None else max_item_size
+        self.__lock = threading.Lock()
+        # (encoder token, document id) -> (document reference, version, encoded value)
+        self.__entries: collections.OrderedDict[tuple[int, int], tuple[weakref.ref[typing.Any], int, typing.Any]] = (
+            collections.OrderedDict()
+        )
+        self.__tokens = itertools.count()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__bytes = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(max_bytes={self.__max_bytes!r}, max_item_size={self.__max_item_size!r})"
+
+    def info(self) -> CacheInfo:
+        """Cache statistics.
+
+        :return: hits, misses, evictions, current size and total size of cached encoded values
+        :rtype: CacheInfo
+        """
+        with self.__lock:
+            return CacheInfo(self.__hits, self.__misses, self.__evictions, len(self.__entries), self.__bytes)
+
+    def clear(self) -> None:
+        """Drop cached values and reset statistics."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = self.__misses = self.__evictions = self.__bytes = 0
+
+    def __get(self, key: tuple[int, int], value: typing.Any, version: int) -> typing.Any:
+        """Get cached encoded value.
+
+        :param key: encoder token and document id
+        :type key: tuple[int, int]
+        :param value: document
+        :type value: typing.Any
+        :param version: current document version
+        :type version: int
+        :return: encoded value or missing marker
+        :rtype: typing.Any
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            # Identity can be reused by the new object after the cached one is collected
+            if entry is None or entry[0]() is not value or entry[1] != version:
+                self.__misses += 1
+                return _MISSING
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            return entry[2]
+
+    def __put(self, key: tuple[int, int], value: typing.Any, version: int, encoded: typing.Any) -> None:
+        """Store encoded value and evict least recently used values over limit.
+
+        :param key: encoder token and document id
+        :type key: tuple[int, int]
+        :param value: document
+        :type value: typing.Any
+        :param version: document version
+        :type version: int
+        :param encoded: encoded value
+        :type encoded: typing.Any
+        """
+        size = len(encoded) if isinstance(encoded, (str, bytes)) else 0
+        if size > self.__max_item_size:
+            return
+        entry = (weakref.ref(value), version, encoded)
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__bytes -= len(previous[2]) if isinstance(previous[2], (str, bytes)) else 0
+            self.__entries[key] = entry
+            self.__bytes += size
+            while self.__bytes > self.__max_bytes and len(self.__entries) > 1:
+                _, (_, _, evicted) = self.__entries.popitem(last=False)
+                self.__bytes -= len(evicted) if isinstance(evicted, (str, bytes)) else 0
+                self.__evictions += 1
+
+    def wrap(self, encode: typing.Callable[[typing.Any], typing.Any]) -> typing.Callable[[typing.Any], typing.Any]:
+        """Make caching encoder.
+
+        :param encode: encoder
+        :type encode: typing.Callable[[typing.Any], typing.Any]
+        :return: caching encoder
+        :rtype: typing.Callable[[typing.Any], typing.Any]
+        """
+        token = next(self.__tokens)  # Encoders sharing the cache do not see values of each other
+        get = self.__get
+        put = self.__put
+
+        def encode_cached(value: typing.Any) -> typing.Any:
+            version = _version(value)
+            if version is None:
+                return encode(value)
+            key = (token, id(value))
+            encoded = get(key, value, version)
+            if encoded is _MISSING:
+                encoded = encode(value)
+                put(key, value, version, encoded)
+            return encoded
+
+        return encode_cached
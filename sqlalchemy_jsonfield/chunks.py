@@ -0,0 +1,411 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Chunked storage of oversized documents: parts are stored in the side table, column keeps the manifest.
+
+Documents with estimated encoded size over `threshold` characters are split: objects by groups of top-level members,
+arrays by slices. Chunks are stored in the content-addressed side table (see `content`), so unchanged chunks
+of the rewritten document are not written again. Column keeps the manifest: prefixed JSON with chunk references
+(and member keys of objects). Smaller documents are stored inline as is.
+
+Fetched manifests are `ChunkedJSON` proxies: top-level keys and length are known from the manifest,
+members and items are loaded by chunk on access, whole document is assembled in one query.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import json
+import typing
+import zlib
+
+from .content import ContentStore
+from .lazy import LazyJSON
+from .offload import estimate_size
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import KeysView
+
+    import sqlalchemy
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.engine import Engine
+
+__all__ = ("MANIFEST_PREFIX", "ChunkStore", "ChunkedJSON")
+
+# Not valid JSON text start: stored manifest is distinguished from inline documents
+MANIFEST_PREFIX = "@chunks:"
+
+# Object members: chunk boundary before keys with crc32 % _KEY_BOUNDARY == 0 (content-defined, ~16 members per chunk),
+# so changed member sizes do not shift the boundaries of other chunks unless chunk size limit is reached
+_KEY_BOUNDARY = 16
+
+
+def _boundary(key: str) -> bool:
+    """Content-defined chunk boundary before the object member.
+
+    :param key: member key
+    :type key: str
+    :return: member starts new chunk
+    :rtype: bool
+    """
+    return zlib.crc32(key.encode("utf-8", "surrogatepass")) % _KEY_BOUNDARY == 0
+
+
+class ChunkedJSON(LazyJSON):
+    """Chunked stored document loaded by chunks on access.
+
+    Top-level keys, `in` checks for keys and length are served by the manifest,
+    members of objects and items of arrays by index are loaded with their chunk only.
+    Other operations (including changes) assemble the whole document.
+    """
+
+    __slots__ = ("__chunks", "__counts", "__index", "__is_object", "__load_chunks", "__loaded")
+
+    def __init__(
+        self,
+        raw: str,
+        decoder: typing.Callable[[typing.Any], typing.Any],
+        load_chunks: typing.Callable[[list[str]], list[typing.Any]],
+    ) -> None:
+        """Chunked stored document.
+
+        :param raw: stored manifest
+        :type raw: str
+        :param decoder: decoder of the whole document from the manifest
+        :type decoder: typing.Callable[[typing.Any], typing.Any]
+        :param load_chunks: loader of the decoded chunks by references
+        :type load_chunks: typing.Callable[[list[str]], list[typing.Any]]
+        """
+        super().__init__(raw, decoder)
+        manifest = json.loads(raw[len(MANIFEST_PREFIX) :])
+        self.__is_object: bool = manifest["type"] == "object"
+        self.__chunks: list[str] = [ref for _, ref in manifest["chunks"]]
+        # Object: key -> chunk position, array: cumulative items count by chunk
+        self.__index: dict[str, int] = {}
+        self.__counts: list[int] = []
+        if self.__is_object:
+            for position, (keys, _) in enumerate(manifest["chunks"]):
+                self.__index.update(dict.fromkeys(keys, position))
+        else:
+            self.__counts = list(itertools.accumulate(count for count, _ in manifest["chunks"]))
+        self.__load_chunks = load_chunks
+        self.__loaded: dict[int, typing.Any] = {}
+
+    @property
+    def chunks(self) -> int:
+        """Chunks count.
+
+        :return: stored chunks count
+        :rtype: int
+        """
+        return len(self.__chunks)
+
+    @property
+    def loaded_chunks(self) -> int:
+        """Loaded chunks count.
+
+        :return: chunks loaded by partial reads or assembling
+        :rtype: int
+        """
+        return len(self.chunks_refs) if self.is_decoded else len(self.__loaded)
+
+    @property
+    def chunks_refs(self) -> tuple[str, ...]:
+        """Chunk references.
+
+        :return: content hashes of the chunks
+        :rtype: tuple[str, ...]
+        """
+        return tuple(self.__chunks)
+
+    def __chunk(self, position: int) -> typing.Any:
+        """Get decoded chunk.
+
+        :param position: chunk position
+        :type position: int
+        :return: decoded chunk
+        :rtype: typing.Any
+        """
+        chunk = self.__loaded.get(position)
+        if chunk is None:
+            chunk = self.__loaded[position] = self.__load_chunks([self.__chunks[position]])[0]
+        return chunk
+
+    def _load(self, raw: typing.Any) -> typing.Any:
+        """Assemble the whole document: loaded chunks are reused, missing chunks are loaded at once.
+
+        :param raw: stored manifest
+        :type raw: typing.Any
+        :return: decoded document
+        :rtype: typing.Any
+        """
+        missing = [position for position in range(len(self.__chunks)) if position not in self.__loaded]
+        if missing:
+            self.__loaded.update(zip(missing, self.__load_chunks([self.__chunks[position] for position in missing])))
+        chunks = [self.__loaded[position] for position in range(len(self.__chunks))]
+        self.__loaded = {}
+        if self.__is_object:
+            document: dict[str, typing.Any] = {}
+            for chunk in chunks:
+                document.update(chunk)
+            return document
+        return [item for chunk in chunks for item in chunk]
+
+    def __getitem__(self, key: typing.Any) -> typing.Any:
+        if self.is_decoded:
+            return self.value[key]
+        if self.__is_object:
+            position = self.__index.get(key)
+            if position is None:
+                raise KeyError(key)
+            return self.__chunk(position)[key]
+        if not isinstance(key, int):  # Slices are served by the whole document
+            return self.value[key]
+        size = self.__counts[-1] if self.__counts else 0
+        index = key + size if key < 0 else key
+        if not 0 <= index < size:
+            raise IndexError("list index out of range")
+        position = bisect.bisect_right(self.__counts, index)
+        return self.__chunk(position)[index - (self.__counts[position - 1] if position else 0)]
+
+    def get(self, key: typing.Any, default: typing.Any = None) -> typing.Any:
+        """Get member of the object.
+
+        :param key: member key
+        :type key: typing.Any
+        :param default: value for the missing member
+        :type default: typing.Any
+        :return: member value or default
+        :rtype: typing.Any
+        """
+        if self.is_decoded or not self.__is_object:
+            return self.value.get(key, default)
+        if key not in self.__index:
+            return default
+        return self[key]
+
+    def keys(self) -> KeysView[typing.Any]:
+        """Keys of the object.
+
+        :return: keys view
+        :rtype: KeysView[typing.Any]
+        """
+        if self.is_decoded or not self.__is_object:
+            return self.value.keys()  # type: ignore[no-any-return]
+        return self.__index.keys()
+
+    def __iter__(self) -> Iterator[typing.Any]:
+        if self.is_decoded or not self.__is_object:
+            return iter(self.value)
+        return iter(self.__index)
+
+    def __len__(self) -> int:
+        if self.is_decoded:
+            return len(self.value)
+        if self.__is_object:
+            return len(self.__index)
+        return self.__counts[-1] if self.__counts else 0
+
+    def __contains__(self, item: typing.Any) -> bool:
+        if self.is_decoded or not self.__is_object:
+            return item in self.value
+        return item in self.__index
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class ChunkStore:
+    """Side table with the chunks of oversized documents.
+
+    Usage: `store = ChunkStore(Base.metadata)`, `JSONField(chunk_store=store)` and `store.attach(engine)`.
+    Table is created with the metadata. Chunks without references are not removed automatically.
+    """
+
+    __slots__ = ("__chunk_size", "__content", "__threshold")
+
+    def __init__(
+        self,
+        metadata: sqlalchemy.MetaData,
+        table_name: str = "jsonfield_chunks",
+        *,
+        threshold: int = 2**20,
+        chunk_size: int = 2**18,
+        cache_size: int = 64,
+    ) -> None:
+        """Chunked documents storage.
+
+        :param metadata: metadata for the side table
+        :type metadata: sqlalchemy.MetaData
+        :param table_name: side table name
+        :type table_name: str
+        :param threshold: documents with greater estimated encoded size are chunked
+        :type threshold: int
+        :param chunk_size: approximate maximal chunk size (single member or item can be larger)
+        :type chunk_size: int
+        :param cache_size: maximal cached chunks count
+        :type cache_size: int
+        :raises ValueError: threshold or chunk size is not positive
+        """
+        if threshold <= 0 or chunk_size <= 0:
+            raise ValueError(f"threshold and chunk_size should be positive, got {threshold} and {chunk_size}")
+        self.__threshold = threshold
+        self.__chunk_size = chunk_size
+        self.__content = ContentStore(metadata, table_name, cache_size=cache_size)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"table={self.table.name!r}, "
+            f"threshold={self.__threshold!r}, "
+            f"chunk_size={self.__chunk_size!r})"
+        )
+
+    @property
+    def table(self) -> sqlalchemy.Table:
+        """Side table.
+
+        :rtype: sqlalchemy.Table
+        """
+        return self.__content.table
+
+    @property
+    def threshold(self) -> int:
+        """Minimal size of chunked documents.
+
+        :rtype: int
+        """
+        return self.__threshold
+
+    def attach(self, bind: Engine | Connection) -> None:
+        """Insert pending chunks before statements execution and use engine to load chunks.
+
+        :param bind: engine or connection for the listener
+        :type bind: Engine | Connection
+        """
+        self.__content.attach(bind)
+
+    def __groups(self, members: Iterable[tuple[typing.Any, typing.Any]], boundary: bool) -> list[list[typing.Any]]:
+        """Group members by chunks.
+
+        :param members: (key, value) pairs of object or (None, item) pairs of array
+        :type members: Iterable[tuple[typing.Any, typing.Any]]
+        :param boundary: use content-defined boundaries by keys
+        :type boundary: bool
+        :return: members by chunks
+        :rtype: list[list[typing.Any]]
+        """
+        limit = self.__chunk_size
+        groups: list[list[typing.Any]] = []
+        group: list[typing.Any] = []
+        size = 0
+        for key, value in members:
+            member_size = estimate_size(value, limit) + (len(str(key)) + 4 if boundary else 1)
+            if group and (size + member_size > limit or (boundary and _boundary(str(key)))):
+                groups.append(group)
+                group = []
+                size = 0
+            group.append((key, value))
+            size += member_size
+        if group:
+            groups.append(group)
+        return groups
+
+    def split(self, value: typing.Any, encode: typing.Callable[[typing.Any], str]) -> str:
+        """Store document by chunks.
+
+        :param value: document: not empty object or array
+        :type value: typing.Any
+        :param encode: encoder of the column codec producing text
+        :type encode: typing.Callable[[typing.Any], str]
+        :return: manifest inserting chunks with the statement using it
+        :rtype: str
+        """
+        digest = self.__content.digest
+        documents: dict[str, str] = {}
+
+        def put(chunk: typing.Any) -> str:
+            text = encode(chunk)
+            ref = digest(text)
+            documents[ref] = text
+            return ref
+
+        manifest: dict[str, typing.Any]
+        if isinstance(value, dict):
+            manifest = {
+                "type": "object",
+                "chunks": [
+                    [[key for key, _ in group], put(dict(group))]
+                    for group in self.__groups(value.items(), boundary=True)
+                ],
+            }
+        else:
+            manifest = {
+                "type": "array",
+                "chunks": [
+                    [len(group), put([item for _, item in group])]
+                    for group in self.__groups(((None, item) for item in value), boundary=False)
+                ],
+            }
+        # Chunks are inserted by the statement binding the manifest
+        return self.__content.reference(
+            MANIFEST_PREFIX + json.dumps(manifest, separators=(",", ":"), ensure_ascii=False), documents
+        )
+
+    def encoder(self, encode: typing.Callable[[typing.Any], str]) -> typing.Callable[[typing.Any], str]:
+        """Make encoder storing oversized documents by chunks.
+
+        Size is estimated without encoding, so oversized documents are encoded only by chunks.
+
+        :param encode: encoder of the column codec producing text
+        :type encode: typing.Callable[[typing.Any], str]
+        :return: encoder producing text or manifest
+        :rtype: typing.Callable[[typing.Any], str]
+        """
+        split = self.split
+        threshold = self.__threshold
+
+        def encode_chunked(value: typing.Any) -> str:
+            if isinstance(value, (dict, list, tuple)) and value and estimate_size(value, threshold + 1) > threshold:
+                return split(value, encode)
+            return encode(value)
+
+        return encode_chunked
+
+    def decoder(self, decode: typing.Callable[[typing.Any], typing.Any]) -> typing.Callable[[typing.Any], typing.Any]:
+        """Make decoder of inline documents and manifests.
+
+        :param decode: decoder of the document text
+        :type decode: typing.Callable[[typing.Any], typing.Any]
+        :return: decoder producing documents and ChunkedJSON proxies for manifests
+        :rtype: typing.Callable[[typing.Any], typing.Any]
+        """
+        get_many = self.__content.get_many
+
+        def load_chunks(refs: list[str]) -> list[typing.Any]:
+            texts = get_many(refs)
+            return [decode(texts[ref]) for ref in refs]
+
+        def assemble(raw: str) -> typing.Any:
+            return ChunkedJSON(raw, assemble, load_chunks).value
+
+        def decode_stored(data: typing.Any) -> typing.Any:
+            if isinstance(data, str) and data.startswith(MANIFEST_PREFIX):
+                return ChunkedJSON(data, assemble, load_chunks)
+            return decode(data)
+
+        return decode_stored
@@ -0,0 +1,725 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""JSON codec adapters.
+
+Codec adapter provides encoder and decoder functions with options bound in advance,
+so stdlib-compatible modules (json, ujson, simplejson) and bytes-oriented codecs (orjson, msgspec)
+can be used by JSONField in the same way.
+"""
+
+from __future__ import annotations
+
+import abc
+import collections.abc
+import functools
+import json
+import json.encoder
+import re
+import types
+import typing
+import unicodedata
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec.json
+except ImportError:
+    msgspec = None
+
+__all__ = ("CallableCodec", "JSONCodec", "MsgspecCodec", "OrjsonCodec", "StdlibCodec", "get_codec")
+
+Encoder = typing.Callable[[typing.Any], typing.Union[str, bytes]]
+Decoder = typing.Callable[[typing.Union[str, bytes, bytearray, memoryview]], typing.Any]
+BatchEncoder = typing.Callable[[typing.Sequence[typing.Any]], list[typing.Union[str, bytes]]]
+
+_T = typing.TypeVar("_T")
+
+
+def _hash_item(item: typing.Any) -> int:
+    """Hash configuration item consistently with equality.
+
+    Unhashable containers are hashed by content, other unhashable objects by type:
+    equal values have equal hashes, different values are told apart by equality.
+
+    :param item: configuration item
+    :type item: typing.Any
+    :return: hash value
+    :rtype: int
+    """
+    try:
+        return hash(item)
+    except TypeError:
+        pass
+    if isinstance(item, collections.abc.Mapping):
+        return hash(frozenset((_hash_item(key), _hash_item(value)) for key, value in item.items()))
+    if isinstance(item, (list, tuple)):
+        return hash(tuple(map(_hash_item, item)))
+    if isinstance(item, collections.abc.Set):
+        return hash(frozenset(map(_hash_item, item)))
+    return hash(type(item))
+
+
+class JSONCodec(abc.ABC):
+    """Base class for JSON codec adapters.
+
+    Subclasses implement abstract `encoder` and `decoder` factories.
+    Produced functions are used directly by bind and result processors.
+    """
+
+    __slots__ = ()
+
+    returns_bytes: typing.ClassVar[bool] = False
+
+    @property
+    def _key(self) -> tuple[typing.Any, ...]:
+        """Hashable configuration used for equality and SQLAlchemy cache key.
+
+        :return: codec configuration
+        :rtype: tuple[typing.Any, ...]
+        """
+        return ()
+
+    @abc.abstractmethod
+    def encoder(self, ensure_ascii: bool = True, binary: bool = False, canonical: bool = False) -> Encoder:
+        """Make encoder function.
+
+        :param ensure_ascii: escape non-ascii symbols
+        :type ensure_ascii: bool
+        :param binary: encoder should return bytes instead of str
+        :type binary: bool
+        :param canonical: produce canonical form: sorted keys, compact separators, NFC strings, python float repr
+        :type canonical: bool
+        :return: function for value encoding
+        :rtype: typing.Callable[[typing.Any], typing.Union[str, bytes]]
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def decoder(self) -> Decoder:
+        """Make decoder function accepting str, bytes, bytearray and memoryview.
+
+        :return: function for value decoding
+        :rtype: typing.Callable[[typing.Union[str, bytes, bytearray, memoryview]], typing.Any]
+        """
+        raise NotImplementedError()
+
+    def typed_decoder(self, type_: type) -> Decoder | None:
+        """Make decoder function producing instances of the type without intermediate builtins.
+
+        :param type_: dataclass, msgspec Struct or TypedDict
+        :type type_: type
+        :return: function for value decoding or None if codec decodes to builtins only
+        :rtype: typing.Callable[[typing.Union[str, bytes, bytearray, memoryview]], typing.Any] | None
+        """
+        return None
+
+    def batch_encoder(self, ensure_ascii: bool = True, binary: bool = False, canonical: bool = False) -> BatchEncoder:
+        """Make encoder function for the sequence of values.
+
+        :param ensure_ascii: escape non-ascii symbols
+        :type ensure_ascii: bool
+        :param binary: encoder should return bytes instead of str
+        :type binary: bool
+        :param canonical: produce canonical form: sorted keys, compact separators, NFC strings, python float repr
+        :type canonical: bool
+        :return: function for values encoding
+        :rtype: typing.Callable[[typing.Sequence[typing.Any]], list[typing.Union[str, bytes]]]
+        """
+        encode = self.encoder(ensure_ascii=ensure_ascii, binary=binary, canonical=canonical)
+
+        def encode_batch(values: typing.Sequence[typing.Any]) -> list[str | bytes]:
+            return [encode(value) for value in values]
+
+        return encode_batch
+
+    def dumps(self, value: typing.Any, ensure_ascii: bool = True) -> str:
+        """Encode value to string (stdlib compatible API).
+
+        :param value: value to encode
+        :type value: typing.Any
+        :param ensure_ascii: escape non-ascii symbols
+        :type ensure_ascii: bool
+        :return: encoded value
+        :rtype: str
+        """
+        return self.encoder(ensure_ascii=ensure_ascii)(value)  # type: ignore[return-value]
+
+    def loads(self, data: str | bytes | bytearray | memoryview) -> typing.Any:
+        """Decode value (stdlib compatible API).
+
+        :param data: encoded value
+        :type data: typing.Union[str, bytes, bytearray, memoryview]
+        :return: decoded value
+        :rtype: typing.Any
+        """
+        return self.decoder()(data)
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and self._key == other._key  # type: ignore[attr-defined,unused-ignore]
+
+    def __hash__(self) -> int:
+        return hash((type(self), *map(_hash_item, self._key)))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}{self._key!r}"
+
+
+# Non-ascii symbols of JSON text: possible only inside strings, escaped in place
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+# Default of the stdlib encoder: TypeError for unsupported types
+_DEFAULT = json.JSONEncoder().default
+
+
+def _escape_non_ascii(match: re.Match[str]) -> str:
+    """Escape non-ascii symbol as stdlib json does.
+
+    :param match: matched symbol
+    :type match: re.Match[str]
+    :return: escape sequence (surrogate pair for symbols outside of BMP)
+    :rtype: str
+    """
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def _ensure_ascii(encode: typing.Callable[[typing.Any], bytes]) -> typing.Callable[[typing.Any], bytes]:
+    """Wrap UTF-8 only encoder to produce ascii-only output.
+
+    Non-ascii output is rare for the most payloads, so it is escaped only when required.
+    Encoded text is escaped in place, so output options of the encoder (indentation, sorting) are kept.
+
+    :param encode: encoder producing UTF-8 bytes
+    :type encode: typing.Callable[[typing.Any], bytes]
+    :return: encoder producing ascii-only bytes
+    :rtype: typing.Callable[[typing.Any], bytes]
+    """
+
+    def wrapper(value: typing.Any) -> bytes:
+        encoded = encode(value)
+        if encoded.isascii():
+            return encoded
+        return _NON_ASCII.sub(_escape_non_ascii, encoded.decode("utf-8")).encode("ascii")
+
+    return wrapper
+
+
+# JSON string (skipped) or float number: floats are rewritten to the stdlib json (python repr) form
+_FLOAT_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|(-?\d+(?:\.\d+)?[eE][-+]?\d+|-?0\.0000\d*)')
+# Float forms differing from the python repr: exponent without sign or padding (encoders write lowercase "e"),
+# small numbers are checked by "0.0000" substring. Literal first symbol keeps the search fast.
+_FLOAT_EXPONENT = re.compile(rb"e[-0-9]")
+
+
+def _float_repr(match: re.Match[bytes]) -> bytes:
+    """Rewrite float number to the python representation.
+
+    :param match: matched string or float token
+    :type match: re.Match[bytes]
+    :return: string token as is or float in python representation
+    :rtype: bytes
+    """
+    number = match.group(1)
+    if number is None:
+        return match.group()
+    return repr(float(number)).encode("ascii")
+
+
+def _nfc(value: typing.Any) -> typing.Any:
+    """Normalize strings and keys of the document to the NFC form.
+
+    :param value: document
+    :type value: typing.Any
+    :return: document with normalized strings (containers are copied)
+    :rtype: typing.Any
+    """
+    if isinstance(value, str):
+        return value if value.isascii() else unicodedata.normalize("NFC", value)
+    if isinstance(value, dict):
+        return {_nfc(key): _nfc(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_nfc(item) for item in value]
+    return value
+
+
+def _is_nfc(encoded: str | bytes) -> bool:
+    """Check that strings of the encoded document are in NFC form.
+
+    ASCII-only text without escapes is normalized already, escaped text is not checked.
+
+    :param encoded: encoded document
+    :type encoded: str | bytes
+    :return: strings are known to be normalized
+    :rtype: bool
+    """
+    if isinstance(encoded, bytes):
+        if encoded.isascii():
+            return b"\\u" not in encoded
+        return b"\\u" not in encoded and unicodedata.is_normalized("NFC", encoded.decode("utf-8"))
+    if encoded.isascii():
+        return "\\u" not in encoded
+    return "\\u" not in encoded and unicodedata.is_normalized("NFC", encoded)
+
+
+def _normalized(encode: typing.Callable[[typing.Any], _T]) -> typing.Callable[[typing.Any], _T]:
+    """Wrap encoder to normalize strings and keys to NFC.
+
+    Document is encoded as is first: it is normalized and encoded again only if it has not normalized strings.
+
+    :param encode: encoder producing str or bytes
+    :type encode: typing.Callable[[typing.Any], _T]
+    :return: encoder of the normalized documents
+    :rtype: typing.Callable[[typing.Any], _T]
+    """
+
+    def wrapper(value: typing.Any) -> _T:
+        encoded = encode(value)
+        if _is_nfc(encoded):  # type: ignore[arg-type]
+            return encoded
+        return encode(_nfc(value))
+
+    return wrapper
+
+
+def _canonical(encode: typing.Callable[[typing.Any], bytes]) -> typing.Callable[[typing.Any], bytes]:
+    """Wrap sorting UTF-8 encoder to produce canonical form, same as canonical stdlib json output.
+
+    Strings and keys are normalized to NFC, floats are rewritten to the python representation.
+
+    :param encode: encoder producing UTF-8 bytes with sorted keys and compact separators
+    :type encode: typing.Callable[[typing.Any], bytes]
+    :return: canonical encoder producing UTF-8 bytes
+    :rtype: typing.Callable[[typing.Any], bytes]
+    """
+    normalized = _normalized(encode)
+
+    def wrapper(value: typing.Any) -> bytes:
+        encoded = normalized(value)
+        if _FLOAT_EXPONENT.search(encoded) is None and b"0.0000" not in encoded:
+            return encoded
+        return _FLOAT_TOKEN.sub(_float_repr, encoded)
+
+    return wrapper
+
+
+def _as_str(encode: typing.Callable[[typing.Any], bytes]) -> typing.Callable[[typing.Any], str]:
+    """Wrap bytes encoder to produce str for text storage.
+
+    :param encode: encoder producing UTF-8 bytes
+    :type encode: typing.Callable[[typing.Any], bytes]
+    :return: encoder producing str
+    :rtype: typing.Callable[[typing.Any], str]
+    """
+
+    def wrapper(value: typing.Any) -> str:
+        return encode(value).decode("utf-8")
+
+    return wrapper
+
+
+class StdlibCodec(JSONCodec):
+    """Adapter for stdlib compatible modules: json, ujson, simplejson, rapidjson.
+
+    Module should provide `dumps(value, ensure_ascii=...) -> str` and `loads(data)`.
+    """
+
+    __slots__ = ("__module",)
+
+    def __init__(self, module: types.ModuleType | typing.Any = json) -> None:
+        """Stdlib compatible codec.
+
+        :param module: json encoding/decoding module
+        :type module: types.ModuleType | typing.Any
+        """
+        self.__module = module
+
+    @property
+    def _key(self) -> tuple[typing.Any, ...]:
+        """Hashable configuration used for equality and SQLAlchemy cache key.
+
+        :return: codec configuration
+        :rtype: tuple[typing.Any, ...]
+        """
+        return (self.__module,)
+
+    @property
+    def module(self) -> types.ModuleType | typing.Any:
+        """Wrapped module.
+
+        :return: json encoding/decoding module
+        :rtype: types.ModuleType | typing.Any
+        """
+        return self.__module
+
+    def encoder(self, ensure_ascii: bool = True, binary: bool = False, canonical: bool = False) -> Encoder:
+        """Make encoder function.
+
+        :param ensure_ascii: escape non-ascii symbols
+        :type ensure_ascii: bool
+        :param binary: encoder should return bytes instead of str
+        :type binary: bool
+        :param canonical: produce canonical form: sorted keys, compact separators, NFC strings, python float repr
+        :type canonical: bool
+        :return: function for value encoding
+        :rtype: typing.Callable[[typing.Any], typing.Union[str, bytes]]
+        """
+        options: dict[str, typing.Any] = {"ensure_ascii": ensure_ascii}
+        if canonical:
+            options["sort_keys"] = True
+            if hasattr(self.__module, "JSONEncoder"):  # json and simplejson: default separators contain spaces
+                options.update(separators=(",", ":"), allow_nan=False)
+        dumps: typing.Callable[[typing.Any], str] = functools.partial(self.__module.dumps, **options)
+        if canonical:
+            dumps = _normalized(dumps)
+
+        if binary:
+
+            def encode_bytes(value: typing.Any) -> bytes:
+                return dumps(value).encode("utf-8")
+
+            return encode_bytes
+
+        return dumps
+
+    def batch_encoder(self, ensure_ascii: bool = True, binary: bool = False, canonical: bool = False) -> BatchEncoder:
+        """Make encoder function for the sequence of values.
+
+        For the stdlib json C encoder is created once per batch instead of each `dumps` call.
+
+        :param ensure_ascii: escape non-ascii symbols
+        :type ensure_ascii: bool
+        :param binary: encoder should return bytes instead of str
+        :type binary: bool
+        :param canonical: produce canonical form: sorted keys, compact separators, NFC strings, python float repr
+        :type canonical: bool
+        :return: function for values encoding
+        :rtype: typing.Callable[[typing.Sequence[typing.Any]], list[typing.Union[str, bytes]]]
+        """
+        make_encoder = getattr(json.encoder, "c_make_encoder", None)
+        if self.__module is not json or make_encoder is None:
+            return super().batch_encoder(ensure_ascii=ensure_ascii, binary=binary, canonical=canonical)
+
+        encode_string = json.encoder.encode_basestring_ascii if ensure_ascii else json.encoder.encode_basestring
+
+        def encode_batch(values: typing.Sequence[typing.Any]) -> list[str | bytes]:
+            # Same arguments as json.dumps defaults, encoder is not shared between batches due to circular check markers
+            iterencode = (
+                make_encoder({}, _DEFAULT, encode_string, None, ":", ",", True, False, False)
+                if canonical
+                else make_encoder({}, _DEFAULT, encode_string, None, ": ", ", ", False, False, True)
+            )
+
+            def encode(value: typing.Any) -> str:
+                return "".join(iterencode(value, 0))
+
+            encode_value = _normalized(encode) if canonical else encode
+            if binary:
+                return [encode_value(value).encode("utf-8") for value in values]
+            return [encode_value(value) for value in values]
+
+        return encode_batch
+
+    def decoder(self) -> Decoder:
+        """Make decoder function accepting str, bytes, bytearray and memoryview.
+
+        :return: function for value decoding
+        :rtype: typing.Callable[[typing.Union[str, bytes, bytearray, memoryview]], typing.Any]
+        """
+        loads = self.__module.loads
+
+        def decode(data: str | bytes | bytearray | memoryview) -> typing.Any:
+            if isinstance(data, memoryview):
+                data = data.tobytes()
+            return loads(data)
+
+        return decode
+
+    def typed_decoder(self, type_: type) -> Decoder | None:
+        """Make decoder function producing instances of the type without intermediate builtins.
+
+        Only stdlib json is replaced by the typed msgspec decoder, other modules keep their own behavior.
+
+        :param type_: dataclass, msgspec Struct or TypedDict
+        :type type_: type
+        :return: function for value decoding or None if codec decodes to builtins only
+        :rtype: typing.Callable[[typing.Union[str, bytes, bytearray, memoryview]], typing.Any] | None
+        """
+        if msgspec is None or self.__module is not json:
+            return None
+        return msgspec.json.Decoder(type=type_).decode  # type: ignore[no-any-return]
+
+
+class OrjsonCodec(JSONCodec):
+    """Adapter for orjson: encoder produces UTF-8 bytes, decoder accepts any buffer without copy."""
+
+    __slots__ = ("__module", "__option")
+
+    returns_bytes = True
+
+    def __init__(self, module: types.ModuleType | None = None, option: int | None = None) -> None:
+        """Orjson codec.
+
+        :param module: orjson module. By default: imported on demand.
+        :type module: types.ModuleType | None
+        :param option: orjson `option` flags for dumps
+        :type option: int | None
+        """
+        if module is None:
+            if orjson is None:
+                raise ImportError("orjson is not installed")
+            module = orjson
+
+        self.__module: types.ModuleType = module
+        self.__option = option
+
+    @property
+    def _key(self) -> tuple[typing.Any, ...]:
+        """Hashable configuration used for equality and SQLAlchemy cache key.
+
+        :return: codec configuration
+        :rtype: tuple[typing.Any, ...]
+        """
+        return (self.__module, self.__option)
+
+    def encoder(self, ensure_ascii: bool = True, binary: bool = False, canonical: bool = False) -> Encoder:
+        """Make encoder function.
+
+        :param ensure_ascii: escape non-ascii symbols
+        :type ensure_ascii: bool
+        :param binary: encoder should return bytes instead of str
+        :type binary: bool
+        :param canonical: produce canonical form: sorted keys, compact separators, NFC strings, python float repr
+        :type canonical: bool
+        :return: function for value encoding
+        :rtype: typing.Callable[[typing.Any], typing.Union[str, bytes]]
+        """
+        dumps = self.__module.dumps
+        option = self.__option
+        if canonical:
+            option = (option or 0) | self.__module.OPT_SORT_KEYS
+
+        def encode_value(value: typing.Any) -> bytes:
+            return dumps(value, option=option)  # type: ignore[no-any-return]
+
+        encode = _canonical(encode_value) if canonical else encode_value
+        encode_bytes = _ensure_ascii(encode) if ensure_ascii else encode
+        if binary:
+            return encode_bytes
+        return _as_str(encode_bytes)
+
+    def decoder(self) -> Decoder:
+        """Make decoder function accepting str, bytes, bytearray and memoryview.
+
+        :return: function for value decoding
+        :rtype: typing.Callable[[typing.Union[str, bytes, bytearray, memoryview]], typing.Any]
+        """
+        return self.__module.loads  # type: ignore[no-any-return]
+
+
+class MsgspecCodec(JSONCodec):
+    """Adapter for msgspec JSON Encoder and Decoder objects."""
+
+    __slots__ = ("__decoder", "__encoder")
+
+    returns_bytes = True
+
+    def __init__(self, encoder: typing.Any = None, decoder: typing.Any = None) -> None:
+        """Msgspec codec.
+
+        :param encoder: object with `encode(value) -> bytes` method. By default: `msgspec.json.Encoder()`
+        :type encoder: typing.Any
+        :param decoder: object with `decode(data)` method. By default: `msgspec.json.Decoder()`
+        :type decoder: typing.Any
+        """
+        if encoder is None or decoder is None:
+            if msgspec is None:
+                raise ImportError("msgspec is not installed")
+
+            if encoder is None:
+                encoder = msgspec.json.Encoder()
+            if decoder is None:
+                decoder = msgspec.json.Decoder()
+
+        self.__encoder = encoder
+        self.__decoder = decoder
+
+    @property
+    def _key(self) -> tuple[typing.Any, ...]:
+        """Hashable configuration used for equality and SQLAlchemy cache key.
+
+        :return: codec configuration
+        :rtype: tuple[typing.Any, ...]
+        """
+        return (self.__encoder, self.__decoder)
+
+    def encoder(self, ensure_ascii: bool = True, binary: bool = False, canonical: bool = False) -> Encoder:
+        """Make encoder function.
+
+        :param ensure_ascii: escape non-ascii symbols
+        :type ensure_ascii: bool
+        :param binary: encoder should return bytes instead of str
+        :type binary: bool
+        :param canonical: produce canonical form: sorted keys, compact separators, NFC strings, python float repr
+        :type canonical: bool
+        :return: function for value encoding
+        :rtype: typing.Callable[[typing.Any], typing.Union[str, bytes]]
+        """
+        encode: typing.Callable[[typing.Any], bytes] = self.__encoder.encode
+        if canonical:
+            if msgspec is None:
+                raise ValueError("Canonical encoding requires msgspec Encoder with sorted keys support")
+            encode = msgspec.json.Encoder(
+                enc_hook=getattr(self.__encoder, "enc_hook", None),
+                decimal_format=getattr(self.__encoder, "decimal_format", "string"),
+                uuid_format=getattr(self.__encoder, "uuid_format", "canonical"),
+                order="sorted",
+            ).encode
+            encode = _canonical(encode)
+        encode_bytes = _ensure_ascii(encode) if ensure_ascii else encode
+        if binary:
+            return encode_bytes
+        return _as_str(encode_bytes)
+
+    def decoder(self) -> Decoder:
+        """Make decoder function accepting str, bytes, bytearray and memoryview.
+
+        :return: function for value decoding
+        :rtype: typing.Callable[[typing.Union[str, bytes, bytearray, memoryview]], typing.Any]
+        """
+        return self.__decoder.decode  # type: ignore[no-any-return]
+
+    def typed_decoder(self, type_: type) -> Decoder | None:
+        """Make decoder function producing instances of the type without intermediate builtins.
+
+        Decoder options (strict mode and hooks) are kept, decoders bound to a type are not replaced.
+
+        :param type_: dataclass, msgspec Struct or TypedDict
+        :type type_: type
+        :return: function for value decoding or None if codec decodes to builtins only
+        :rtype: typing.Callable[[typing.Union[str, bytes, bytearray, memoryview]], typing.Any] | None
+        """
+        decoder = self.__decoder
+        if msgspec is None or not isinstance(decoder, msgspec.json.Decoder) or decoder.type is not typing.Any:
+            return None
+        return msgspec.json.Decoder(  # type: ignore[no-any-return]
+            type=type_,
+            strict=getattr(decoder, "strict", True),
+            dec_hook=decoder.dec_hook,
+            float_hook=getattr(decoder, "float_hook", None),
+        ).decode
+
+
+class CallableCodec(JSONCodec):
+    """Adapter for arbitrary dumps/loads functions pair.
+
+    `dumps` may return str or bytes, `ensure_ascii` is not passed to it.
+    """
+
+    __slots__ = ("__dumps", "__loads")
+
+    def __init__(
+        self,
+        dumps: typing.Callable[[typing.Any], str | bytes],
+        loads: typing.Callable[[typing.Any], typing.Any],
+    ) -> None:
+        """Callable codec.
+
+        :param dumps: encoding function
+        :type dumps: typing.Callable[[typing.Any], str | bytes]
+        :param loads: decoding function, should accept str and bytes
+        :type loads: typing.Callable[[typing.Any], typing.Any]
+        """
+        self.__dumps = dumps
+        self.__loads = loads
+
+    @property
+    def _key(self) -> tuple[typing.Any, ...]:
+        """Hashable configuration used for equality and SQLAlchemy cache key.
+
+        :return: codec configuration
+        :rtype: tuple[typing.Any, ...]
+        """
+        return (self.__dumps, self.__loads)
+
+    def encoder(self, ensure_ascii: bool = True, binary: bool = False, canonical: bool = False) -> Encoder:
+        """Make encoder function.
+
+        :param ensure_ascii: ignored, encoding function is used as is
+        :type ensure_ascii: bool
+        :param binary: encoder should return bytes instead of str
+        :type binary: bool
+        :param canonical: not supported: output form is defined by the encoding function
+        :type canonical: bool
+        :return: function for value encoding
+        :rtype: typing.Callable[[typing.Any], typing.Union[str, bytes]]
+        :raises ValueError: canonical form requested
+        """
+        if canonical:
+            raise ValueError("Canonical form is not supported by the arbitrary encoding function")
+        dumps = self.__dumps
+
+        if binary:
+
+            def encode_bytes(value: typing.Any) -> bytes:
+                encoded = dumps(value)
+                return encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+
+            return encode_bytes
+
+        def encode(value: typing.Any) -> str:
+            encoded = dumps(value)
+            return encoded if isinstance(encoded, str) else encoded.decode("utf-8")
+
+        return encode
+
+    def decoder(self) -> Decoder:
+        """Make decoder function accepting str, bytes, bytearray and memoryview.
+
+        :return: function for value decoding
+        :rtype: typing.Callable[[typing.Union[str, bytes, bytearray, memoryview]], typing.Any]
+        """
+        loads = self.__loads
+
+        def decode(data: str | bytes | bytearray | memoryview) -> typing.Any:
+            if isinstance(data, memoryview):
+                data = data.tobytes()
+            return loads(data)
+
+        return decode
+
+
+def get_codec(json_codec: JSONCodec | types.ModuleType | typing.Any) -> JSONCodec:  # pylint: disable=redefined-outer-name
+    """Get codec adapter for the json library.
+
+    :param json_codec: codec adapter, json library module or object with stdlib compatible dumps/loads
+    :type json_codec: JSONCodec | types.ModuleType | typing.Any
+    :return: codec adapter
+    :rtype: JSONCodec
+    """
+    if isinstance(json_codec, JSONCodec):
+        return json_codec
+
+    module_name = getattr(json_codec, "__name__", None) if isinstance(json_codec, types.ModuleType) else None
+    if module_name == "orjson":
+        return OrjsonCodec(json_codec)
+    if module_name in {"msgspec", "msgspec.json"}:
+        return MsgspecCodec()
+    return StdlibCodec(json_codec)
@@ -0,0 +1,394 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Content-addressed storage: documents are stored once in the side table and referenced by hash.
+
+JSONField column keeps SHA-256 hex digest of the canonical document text produced by the column codec.
+Bound reference carries the text, so it is inserted into the side table by the connection executing the statement
+right before the execution (if it is not stored yet), regardless of the thread encoding the value.
+Texts are cached in-process by hash, `ContentStore.resolve` loads missing texts of a result set in one query.
+Documents without references are not removed automatically.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import threading
+import typing
+
+import sqlalchemy
+import sqlalchemy.event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
+
+from .lazy import LazyJSON
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Session
+
+__all__ = ("HASH_LENGTH", "ContentStore")
+
+# Length of the stored reference: SHA-256 hex digest
+HASH_LENGTH = 64
+
+# References per select in batch loading
+_RESOLVE_CHUNK = 500
+
+
+class _Reference(str):
+    """Bound reference carrying the side table documents to insert before the statement execution."""
+
+    __slots__ = ("documents", "store")
+
+    store: ContentStore
+    documents: dict[str, str]
+
+
+class ContentStore:
+    """Side table with the documents stored by the content hash.
+
+    Usage: `store = ContentStore(Base.metadata)`, `JSONField(content_store=store)` and `store.attach(engine)`.
+    Table is created with the metadata.
+    """
+
+    __slots__ = ("__cache", "__cache_size", "__engine", "__lock", "__table")
+
+    def __init__(
+        self,
+        metadata: sqlalchemy.MetaData,
+        table_name: str = "jsonfield_content",
+        *,
+        cache_size: int = 1024,
+    ) -> None:
+        """Content-addressed documents storage.
+
+        :param metadata: metadata for the side table
+        :type metadata: sqlalchemy.MetaData
+        :param table_name: side table name
+        :type table_name: str
+        :param cache_size: maximal cached documents count
+        :type cache_size: int
+        :raises ValueError: cache_size is not positive
+        """
+        if cache_size <= 0:
+            raise ValueError(f"cache_size should be positive, got {cache_size}")
+        self.__table = sqlalchemy.Table(
+            table_name,
+            metadata,
+            sqlalchemy.Column("hash", sqlalchemy.String(HASH_LENGTH), primary_key=True),
+            sqlalchemy.Column("document", sqlalchemy.UnicodeText, nullable=False),
+        )
+        self.__cache_size = cache_size
+        self.__lock = threading.Lock()
+        # hash -> text
+        self.__cache: collections.OrderedDict[str, str] = collections.OrderedDict()
+        self.__engine: Engine | None = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(table={self.__table.name!r}, cache_size={self.__cache_size!r})"
+
+    @property
+    def table(self) -> sqlalchemy.Table:
+        """Side table.
+
+        :rtype: sqlalchemy.Table
+        """
+        return self.__table
+
+    def attach(self, bind: Engine | Connection) -> None:
+        """Insert pending documents before statements execution and use engine to load not cached documents.
+
+        :param bind: engine or connection for the listener
+        :type bind: Engine | Connection
+        """
+        self.__engine = bind if isinstance(bind, sqlalchemy.Engine) else bind.engine
+        sqlalchemy.event.listen(bind, "before_cursor_execute", self.__before_cursor_execute, retval=True)
+
+    def __cached(self, ref: str) -> str | None:
+        """Get cached text.
+
+        :param ref: document hash
+        :type ref: str
+        :return: text or None
+        :rtype: str | None
+        """
+        with self.__lock:
+            entry = self.__cache.get(ref)
+            if entry is not None:
+                self.__cache.move_to_end(ref)
+            return entry
+
+    def __remember(self, ref: str, text: str) -> None:
+        """Cache text and evict least recently used texts over limit.
+
+        :param ref: document hash
+        :type ref: str
+        :param text: document text
+        :type text: str
+        """
+        with self.__lock:
+            self.__cache[ref] = text
+            self.__cache.move_to_end(ref)
+            while len(self.__cache) > self.__cache_size:
+                self.__cache.popitem(last=False)
+
+    def digest(self, text: str) -> str:
+        """Get reference of the document text and cache the text.
+
+        :param text: document text
+        :type text: str
+        :return: document hash
+        :rtype: str
+        """
+        ref = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if self.__cached(ref) is None:
+            self.__remember(ref, text)
+        return ref
+
+    def reference(self, value: str, documents: dict[str, str]) -> str:
+        """Make bound value carrying documents, inserted by the statement execution listener.
+
+        :param value: stored value (document hash or value containing hashes)
+        :type value: str
+        :param documents: texts by hash
+        :type documents: dict[str, str]
+        :return: stored value inserting documents when bound
+        :rtype: str
+        :raises RuntimeError: store is not attached to the engine
+        """
+        if self.__engine is None:
+            raise RuntimeError("ContentStore is not attached to the engine")
+        reference = _Reference(value)
+        reference.store = self
+        reference.documents = documents
+        return reference
+
+    def put(self, text: str) -> str:
+        """Make reference inserting the document with the statement using it.
+
+        :param text: canonical document text
+        :type text: str
+        :return: document hash
+        :rtype: str
+        :raises RuntimeError: store is not attached to the engine
+        """
+        ref = self.digest(text)
+        return self.reference(ref, {ref: text})
+
+    def encoder(self, encode: typing.Callable[[typing.Any], str]) -> typing.Callable[[typing.Any], str]:
+        """Make encoder of the documents to references.
+
+        :param encode: canonical encoder of the column codec producing text
+        :type encode: typing.Callable[[typing.Any], str]
+        :return: encoder producing references
+        :rtype: typing.Callable[[typing.Any], str]
+        """
+        put = self.put
+
+        def encode_ref(value: typing.Any) -> str:
+            return put(encode(value))
+
+        return encode_ref
+
+    def get(self, ref: str) -> str:
+        """Get document text: from cache or from the database.
+
+        :param ref: document hash
+        :type ref: str
+        :return: document text
+        :rtype: str
+        :raises RuntimeError: store is not attached to the engine
+        :raises LookupError: document is not found
+        """
+        text = self.__cached(ref)
+        if text is not None:
+            return text
+        if self.__engine is None:
+            raise RuntimeError("ContentStore is not attached to the engine")
+        with self.__engine.connect() as connection:
+            text = connection.scalar(
+                sqlalchemy.select(self.__table.c.document).where(self.__table.c.hash == ref),
+            )
+        if text is None:
+            raise LookupError(f"Document {ref} is not found in {self.__table.name}")
+        self.__remember(ref, text)
+        return text  # type: ignore[no-any-return]
+
+    def get_many(self, refs: Iterable[str]) -> dict[str, str]:
+        """Get document texts: from cache, missing texts are loaded in batches.
+
+        :param refs: document hashes
+        :type refs: Iterable[str]
+        :return: texts by hash
+        :rtype: dict[str, str]
+        :raises RuntimeError: store is not attached to the engine
+        :raises LookupError: document is not found
+        """
+        texts: dict[str, str] = {}
+        missing: list[str] = []
+        for ref in dict.fromkeys(refs):
+            text = self.__cached(ref)
+            if text is None:
+                missing.append(ref)
+            else:
+                texts[ref] = text
+        if not missing:
+            return texts
+        if self.__engine is None:
+            raise RuntimeError("ContentStore is not attached to the engine")
+        with self.__engine.connect() as connection:
+            for start in range(0, len(missing), _RESOLVE_CHUNK):
+                statement = sqlalchemy.select(self.__table.c.hash, self.__table.c.document).where(
+                    self.__table.c.hash.in_(missing[start : start + _RESOLVE_CHUNK])
+                )
+                for ref, loaded in connection.execute(statement):
+                    self.__remember(ref, loaded)
+                    texts[ref] = loaded
+        for ref in missing:
+            if ref not in texts:
+                raise LookupError(f"Document {ref} is not found in {self.__table.name}")
+        return texts
+
+    def decoder(self, decode: typing.Callable[[typing.Any], typing.Any]) -> typing.Callable[[typing.Any], typing.Any]:
+        """Make decoder of the references.
+
+        :param decode: decoder of the document text
+        :type decode: typing.Callable[[typing.Any], typing.Any]
+        :return: decoder of the stored reference
+        :rtype: typing.Callable[[typing.Any], typing.Any]
+        """
+        get = self.get
+
+        def decode_ref(ref: str) -> typing.Any:
+            return decode(get(ref))
+
+        return decode_ref
+
+    def resolve(self, bind: Session | Connection, values: Iterable[typing.Any]) -> int:
+        """Load not cached documents of the fetched values in batches.
+
+        :param bind: session or connection for the select
+        :type bind: Session | Connection
+        :param values: fetched JSONField values (not accessed values are LazyJSON with reference as raw value)
+        :type values: Iterable[typing.Any]
+        :return: loaded documents count
+        :rtype: int
+        """
+        refs = sorted(
+            {
+                value.raw
+                for value in values
+                if isinstance(value, LazyJSON)
+                and not value.is_decoded
+                and isinstance(value.raw, str)
+                and self.__cached(value.raw) is None
+            }
+        )
+        loaded = 0
+        for start in range(0, len(refs), _RESOLVE_CHUNK):
+            statement = sqlalchemy.select(self.__table.c.hash, self.__table.c.document).where(
+                self.__table.c.hash.in_(refs[start : start + _RESOLVE_CHUNK])
+            )
+            for ref, text in bind.execute(statement):
+                self.__remember(ref, text)
+                loaded += 1
+        return loaded
+
+    def __before_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: typing.Any,
+        statement: str,
+        parameters: typing.Any,
+        context: typing.Any,
+        executemany: bool,
+    ) -> tuple[str, typing.Any]:
+        """Insert documents carried by the bound references of the statement.
+
+        References are replaced by plain strings, so documents are inserted once and the driver gets exact types.
+        """
+        documents: dict[str, str] = {}
+        if executemany:
+            parameters = [self.__unwrap(item, documents) for item in parameters]
+        else:
+            parameters = self.__unwrap(parameters, documents)
+        if documents:
+            self.__insert(conn, documents)
+        return statement, parameters
+
+    def __unwrap(self, parameters: typing.Any, documents: dict[str, str]) -> typing.Any:
+        """Collect documents of the references from the parameters set.
+
+        :param parameters: parameters set: mapping or sequence
+        :type parameters: typing.Any
+        :param documents: collected texts by hash
+        :type documents: dict[str, str]
+        :return: parameters set with plain strings instead of references
+        :rtype: typing.Any
+        """
+        values = parameters.values() if isinstance(parameters, dict) else parameters
+        if not isinstance(values, typing.Iterable) or not any(
+            type(value) is _Reference and value.store is self for value in values
+        ):
+            return parameters
+
+        def unwrap(value: typing.Any) -> typing.Any:
+            if type(value) is not _Reference or value.store is not self:
+                return value
+            documents.update(value.documents)
+            return str(value)
+
+        if isinstance(parameters, dict):
+            return {key: unwrap(value) for key, value in parameters.items()}
+        return type(parameters)(map(unwrap, parameters))
+
+    def __insert(self, conn: Connection, documents: dict[str, str]) -> None:
+        """Insert documents missing in the table.
+
+        Existing documents are checked in the transaction of the statement: rolled back documents are inserted again.
+
+        :param conn: connection executing the statement
+        :type conn: Connection
+        :param documents: texts by hash
+        :type documents: dict[str, str]
+        """
+        table = self.__table
+        refs = list(documents)
+        existing: set[str] = set()
+        for start in range(0, len(refs), _RESOLVE_CHUNK):
+            existing.update(
+                conn.scalars(
+                    sqlalchemy.select(table.c.hash).where(table.c.hash.in_(refs[start : start + _RESOLVE_CHUNK]))
+                )
+            )
+        rows = [{"hash": ref, "document": text} for ref, text in documents.items() if ref not in existing]
+        if not rows:
+            return
+
+        dialect = conn.dialect.name
+        insert: typing.Any
+        if dialect == "sqlite":
+            insert = sqlite.insert(table).on_conflict_do_nothing()
+        elif dialect == "postgresql":
+            insert = postgresql.insert(table).on_conflict_do_nothing()
+        elif dialect in {"mysql", "mariadb"}:
+            insert = table.insert().prefix_with("IGNORE")
+        else:  # Concurrent insertion of the same document fails with IntegrityError
+            insert = table.insert()
+        conn.execute(insert, rows)
@@ -0,0 +1,318 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Binary storage formats for JSON-compatible documents.
+
+Documents in binary format are always stored with the framing header (see `storage`),
+so the format id marks every row and tables with mixed formats are decoded row by row.
+
+Built-in formats:
+
+* "compact": dependency-free tagged binary encoding (id 2)
+* "msgpack": MessagePack, if `msgpack` is installed (id 3)
+* "cbor": CBOR, if `cbor2` is installed (id 4)
+"""
+
+from __future__ import annotations
+
+import struct
+import typing
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+__all__ = ("StorageFormat", "compact_decode", "compact_encode", "get_format", "get_format_by_id", "register_format")
+
+# Id 1 is JSON text (storage.FORMAT_JSON), encoded by the field codec
+_RESERVED_IDS = frozenset((0, 1))
+
+
+class StorageFormat(typing.NamedTuple):
+    """Binary format description."""
+
+    name: str
+    ident: int
+    encode: typing.Callable[[typing.Any], bytes]
+    decode: typing.Callable[[bytes | bytearray | memoryview], typing.Any]
+
+
+_FORMATS: dict[str, StorageFormat] = {}
+_FORMATS_BY_ID: dict[int, StorageFormat] = {}
+
+
+def register_format(storage_format: StorageFormat) -> None:
+    """Register binary format.
+
+    :param storage_format: format description
+    :type storage_format: StorageFormat
+    :raises ValueError: format id is reserved or already used by another format
+    """
+    if storage_format.ident in _RESERVED_IDS or not 0 < storage_format.ident < 256:
+        raise ValueError(f"Format id should be in range 2..255, got {storage_format.ident}")
+    registered = _FORMATS_BY_ID.get(storage_format.ident)
+    if registered is not None and registered.name != storage_format.name:
+        raise ValueError(f"Format id {storage_format.ident} is already used by {registered.name}")
+    _FORMATS[storage_format.name] = storage_format
+    _FORMATS_BY_ID[storage_format.ident] = storage_format
+
+
+def get_format(storage_format: str | StorageFormat) -> StorageFormat:
+    """Get registered binary format.
+
+    :param storage_format: format name or description
+    :type storage_format: str | StorageFormat
+    :return: format description
+    :rtype: StorageFormat
+    :raises ValueError: format is not available
+    """
+    if isinstance(storage_format, StorageFormat):
+        return storage_format
+    try:
+        return _FORMATS[storage_format]
+    except KeyError:
+        raise ValueError(
+            f"Storage format {storage_format!r} is not available, registered: json, {', '.join(sorted(_FORMATS))}"
+        ) from None
+
+
+def get_format_by_id(ident: int) -> StorageFormat:
+    """Get registered binary format by the stored id.
+
+    :param ident: format id
+    :type ident: int
+    :return: format description
+    :rtype: StorageFormat
+    :raises ValueError: format is not available
+    """
+    try:
+        return _FORMATS_BY_ID[ident]
+    except KeyError:
+        raise ValueError(f"Unsupported stored data format id: {ident}") from None
+
+
+# Compact format tags
+_NULL = 0x00
+_FALSE = 0x01
+_TRUE = 0x02
+_INT = 0x03  # 8 bytes signed
+_BIGINT = 0x04  # varint length + decimal text
+_FLOAT = 0x05  # 8 bytes IEEE 754
+_STR = 0x06  # varint length + UTF-8
+_LIST = 0x07  # varint count + items
+_DICT = 0x08  # varint count + (key string, value) pairs
+
+_INT64 = struct.Struct("<q")
+_FLOAT64 = struct.Struct("<d")
+_INT64_RANGE = range(-(2**63), 2**63)
+
+
+def _put_varint(out: bytearray, value: int) -> None:
+    """Append unsigned LEB128 integer.
+
+    :param out: output buffer
+    :type out: bytearray
+    :param value: non-negative integer
+    :type value: int
+    """
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _put_str(out: bytearray, value: str) -> None:
+    """Append length-prefixed UTF-8 string without tag.
+
+    :param out: output buffer
+    :type out: bytearray
+    :param value: string
+    :type value: str
+    """
+    data = value.encode("utf-8")
+    _put_varint(out, len(data))
+    out += data
+
+
+def _put(out: bytearray, value: typing.Any) -> None:
+    """Append tagged value.
+
+    :param out: output buffer
+    :type out: bytearray
+    :param value: JSON-compatible value
+    :type value: typing.Any
+    :raises TypeError: value is not JSON-compatible
+    """
+    if value is None:
+        out.append(_NULL)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        if value in _INT64_RANGE:
+            out.append(_INT)
+            out += _INT64.pack(value)
+        else:
+            out.append(_BIGINT)
+            _put_str(out, str(value))
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _FLOAT64.pack(value)
+    elif isinstance(value, str):
+        out.append(_STR)
+        _put_str(out, value)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        _put_varint(out, len(value))
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Keys should be strings, got {type(key).__name__}")
+            _put_str(out, key)
+            _put(out, item)
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST)
+        _put_varint(out, len(value))
+        for item in value:
+            _put(out, item)
+    else:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def compact_encode(value: typing.Any) -> bytes:
+    """Encode JSON-compatible value to the compact binary format.
+
+    :param value: JSON-compatible value
+    :type value: typing.Any
+    :return: encoded value
+    :rtype: bytes
+    """
+    out = bytearray()
+    _put(out, value)
+    return bytes(out)
+
+
+class _Reader:
+    """Compact format decoder state."""
+
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        """Decoder state.
+
+        :param data: encoded value
+        :type data: bytes | bytearray | memoryview
+        """
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def varint(self) -> int:
+        """Read unsigned LEB128 integer.
+
+        :return: integer
+        :rtype: int
+        """
+        result = shift = 0
+        while True:
+            byte = self.data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def string(self) -> str:
+        """Read length-prefixed UTF-8 string.
+
+        :return: string
+        :rtype: str
+        """
+        size = self.varint()
+        start = self.pos
+        self.pos += size
+        return str(self.data[start : self.pos], "utf-8")
+
+    def value(self) -> typing.Any:
+        """Read tagged value.
+
+        :return: decoded value
+        :rtype: typing.Any
+        :raises ValueError: unknown tag
+        """
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _NULL:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _INT:
+            start = self.pos
+            self.pos += 8
+            return _INT64.unpack_from(self.data, start)[0]
+        if tag == _FLOAT:
+            start = self.pos
+            self.pos += 8
+            return _FLOAT64.unpack_from(self.data, start)[0]
+        if tag == _STR:
+            return self.string()
+        if tag == _DICT:
+            return {self.string(): self.value() for _ in range(self.varint())}
+        if tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == _BIGINT:
+            return int(self.string())
+        raise ValueError(f"Unknown compact format tag {tag:#x} at {self.pos - 1}")
+
+
+def compact_decode(data: bytes | bytearray | memoryview) -> typing.Any:
+    """Decode compact binary format.
+
+    :param data: encoded value
+    :type data: bytes | bytearray | memoryview
+    :return: decoded value
+    :rtype: typing.Any
+    :raises ValueError: malformed data
+    """
+    reader = _Reader(data)
+    try:
+        value = reader.value()
+    except (IndexError, struct.error):
+        raise ValueError("Truncated compact format data") from None
+    if reader.pos != len(reader.data):
+        raise ValueError(f"Extra data at {reader.pos}")
+    return value
+
+
+register_format(StorageFormat("compact", 2, compact_encode, compact_decode))
+
+if msgpack is not None:
+    register_format(
+        StorageFormat(
+            "msgpack",
+            3,
+            lambda value: msgpack.packb(value, use_bin_type=True),
+            lambda data: msgpack.unpackb(data, raw=False),
+        )
+    )
+
+if cbor2 is not None:
+    register_format(StorageFormat("cbor", 4, cbor2.dumps, lambda data: cbor2.loads(bytes(data))))
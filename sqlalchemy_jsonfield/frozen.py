@@ -0,0 +1,150 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Immutable decoded values: frozen dicts and tuples."""
+
+from __future__ import annotations
+
+import collections.abc
+import typing
+import weakref
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from typing_extensions import Self
+
+__all__ = ("FrozenDict", "PartialJSON", "freeze", "thaw")
+
+_CONTAINERS = (dict, list)
+
+
+def _readonly(*args: typing.Any, **kwargs: typing.Any) -> typing.NoReturn:
+    """Mutation method replacement.
+
+    :raises TypeError: FrozenDict does not support mutation
+    """
+    raise TypeError("FrozenDict does not support mutation, use thaw() to get a mutable copy")
+
+
+class FrozenDict(dict):  # type: ignore[type-arg]
+    """Immutable and hashable dict.
+
+    Subclass of dict, so it is accepted by JSON encoders and compares equal to plain dicts.
+    """
+
+    __slots__ = ("__hash",)
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        try:
+            return self.__hash
+        except AttributeError:
+            self.__hash: int = hash(frozenset(self.items()))
+            return self.__hash
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict.__repr__(self)})"
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        return self.__class__, (dict(self),)
+
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, typing.Any]) -> Self:
+        return self
+
+
+def freeze(value: typing.Any) -> typing.Any:
+    """Convert decoded value to immutable: dicts to FrozenDict and lists to tuples.
+
+    :param value: decoded value
+    :type value: typing.Any
+    :return: immutable value
+    :rtype: typing.Any
+    """
+    cls = type(value)
+    if cls is dict:
+        result = FrozenDict(value)
+        for key, item in value.items():
+            if type(item) in _CONTAINERS:
+                dict.__setitem__(result, key, freeze(item))
+        return result
+    if cls is list:
+        return tuple([freeze(item) if type(item) in _CONTAINERS else item for item in value])
+    return value
+
+
+class PartialJSON(collections.abc.Mapping[str, typing.Any]):
+    """Read-only part of the document containing only the selected paths.
+
+    Not a dict: JSON encoders reject it, so the partial document can not be stored over the full one.
+    Missing paths are present with None values. `thaw()` makes a mutable dict copy.
+    """
+
+    __slots__ = ("__data", "__paths", "_parents")
+
+    def __init__(self, value: dict[str, typing.Any], paths: tuple[tuple[str, ...], ...]) -> None:
+        """Partial document.
+
+        :param value: decoded partial document
+        :type value: dict[str, typing.Any]
+        :param paths: selected paths
+        :type paths: tuple[tuple[str, ...], ...]
+        """
+        self.__data: FrozenDict = freeze(value)
+        self.__paths = paths
+        # Mutable attributes register owners of the loaded values, changes are never reported
+        self._parents: weakref.WeakKeyDictionary[typing.Any, str] = weakref.WeakKeyDictionary()
+
+    def __getitem__(self, key: str) -> typing.Any:
+        return self.__data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__data)
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict.__repr__(self.__data)}, paths={self.__paths!r})"
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        return self.__class__, (thaw(self.__data), self.__paths)
+
+    @property
+    def paths(self) -> tuple[tuple[str, ...], ...]:
+        """Selected paths.
+
+        :rtype: tuple[tuple[str, ...], ...]
+        """
+        return self.__paths
+
+
+def thaw(value: typing.Any) -> typing.Any:
+    """Make mutable copy of frozen value: FrozenDict and PartialJSON to dict and tuples to lists.
+
+    :param value: frozen value
+    :type value: typing.Any
+    :return: mutable copy
+    :rtype: typing.Any
+    """
+    if isinstance(value, (dict, PartialJSON)):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (tuple, list)):
+        return [thaw(item) for item in value]
+    return value
@@ -0,0 +1,197 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Indexes for the JSON paths used in filters.
+
+DDL is emitted after the table creation:
+
+* SQLite, MySQL/MariaDB: virtual generated column over the extracted value and index on it
+* PostgreSQL: expression index on the extracted value
+
+Path expressions with matching conversion are compiled to the generated column or to the indexed expression.
+"""
+
+from __future__ import annotations
+
+import typing
+
+import sqlalchemy
+import sqlalchemy.event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.ddl import ExecutableDDLElement
+
+from .query import JSONPathElement
+from .query import generated_column_name
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from sqlalchemy.sql.compiler import DDLCompiler
+    from sqlalchemy.sql.type_api import TypeEngine
+
+    from .jsonfield import JSONField
+    from .mutable import JSONPath
+
+__all__ = ("IndexedPath", "attach_indexed_paths", "normalize_indexed_paths")
+
+_GENERATED_COLUMN_DIALECTS = ("sqlite", "mysql", "mariadb")
+_INDEX_DIALECTS = (*_GENERATED_COLUMN_DIALECTS, "postgresql")
+
+
+class IndexedPath(typing.NamedTuple):
+    """Indexed path declaration."""
+
+    path: JSONPath
+    type: TypeEngine[typing.Any]
+    as_type: str
+
+
+def _conversion(type_: TypeEngine[typing.Any]) -> str:
+    """Path element conversion for the indexed value type.
+
+    :param type_: indexed value type
+    :type type_: TypeEngine[typing.Any]
+    :return: conversion name
+    :rtype: str
+    :raises TypeError: type is not supported
+    """
+    if isinstance(type_, sqlalchemy.Boolean):
+        return "boolean"
+    if isinstance(type_, sqlalchemy.Integer):
+        return "integer"
+    if isinstance(type_, sqlalchemy.Numeric):
+        return "float"
+    if isinstance(type_, sqlalchemy.String):
+        return "string"
+    raise TypeError(f"Indexed value type should be string, integer, numeric or boolean, got {type_!r}")
+
+
+def normalize_indexed_paths(
+    indexed_paths: Mapping[str | JSONPath, TypeEngine[typing.Any] | type[TypeEngine[typing.Any]]],
+) -> dict[JSONPath, IndexedPath]:
+    """Validate indexed paths declaration.
+
+    :param indexed_paths: indexed value types by top-level key or path
+    :type indexed_paths: Mapping[str | JSONPath, TypeEngine[typing.Any] | type[TypeEngine[typing.Any]]]
+    :return: indexed paths by path
+    :rtype: dict[JSONPath, IndexedPath]
+    """
+    result: dict[JSONPath, IndexedPath] = {}
+    for key, type_ in indexed_paths.items():
+        path: JSONPath = (key,) if isinstance(key, str) else tuple(key)
+        instance = sqlalchemy.types.to_instance(type_)
+        result[path] = IndexedPath(path, instance, _conversion(instance))
+    return result
+
+
+class _IndexedPathDDL(ExecutableDDLElement):
+    """Base DDL element for the indexed path of the column."""
+
+    def __init__(self, column: sqlalchemy.Column[typing.Any], indexed: IndexedPath) -> None:
+        """DDL element for the indexed path.
+
+        :param column: JSONField column
+        :type column: sqlalchemy.Column[typing.Any]
+        :param indexed: indexed path declaration
+        :type indexed: IndexedPath
+        """
+        self.column = column
+        self.indexed = indexed
+
+    @property
+    def name(self) -> str:
+        """Generated column name.
+
+        :rtype: str
+        """
+        return generated_column_name(self.column.name, self.indexed.path)
+
+    def expression(self, compiler: DDLCompiler) -> str:
+        """Indexed expression SQL.
+
+        :param compiler: DDL compiler
+        :type compiler: DDLCompiler
+        :return: expression with inlined path and without table name
+        :rtype: str
+        """
+        element = JSONPathElement(self.column, self.indexed.path, self.indexed.as_type)
+        return compiler.sql_compiler.process(element, include_table=False, literal_binds=True, jsonfield_unrouted=True)
+
+
+class AddGeneratedColumn(_IndexedPathDDL):
+    """ALTER TABLE ... ADD COLUMN ... GENERATED ALWAYS AS (...) VIRTUAL."""
+
+    __visit_name__ = "jsonfield_add_generated_column"
+
+
+class CreatePathIndex(_IndexedPathDDL):
+    """CREATE INDEX on the generated column or on the expression."""
+
+    __visit_name__ = "jsonfield_create_path_index"
+
+
+@compiles(AddGeneratedColumn)
+def _compile_add_generated_column(element: AddGeneratedColumn, compiler: DDLCompiler, **kw: typing.Any) -> str:
+    """SQLite, MySQL/MariaDB: virtual generated column is added without table rebuild."""
+    preparer = compiler.preparer
+    return (
+        f"ALTER TABLE {preparer.format_table(element.column.table)} "
+        f"ADD COLUMN {preparer.quote(element.name)} "
+        f"{compiler.dialect.type_compiler_instance.process(element.indexed.type)} "
+        f"GENERATED ALWAYS AS ({element.expression(compiler)}) VIRTUAL"
+    )
+
+
+@compiles(CreatePathIndex)
+def _compile_create_path_index(element: CreatePathIndex, compiler: DDLCompiler, **kw: typing.Any) -> str:
+    """Index on the generated column."""
+    preparer = compiler.preparer
+    table = element.column.table
+    return (
+        f"CREATE INDEX {preparer.quote(f'ix_{table.name}_{element.name}')} "
+        f"ON {preparer.format_table(table)} ({preparer.quote(element.name)})"
+    )
+
+
+@compiles(CreatePathIndex, "postgresql")
+def _compile_create_path_index_postgresql(element: CreatePathIndex, compiler: DDLCompiler, **kw: typing.Any) -> str:
+    """PostgreSQL: expression index, queries render the same expression."""
+    preparer = compiler.preparer
+    table = element.column.table
+    return (
+        f"CREATE INDEX {preparer.quote(f'ix_{table.name}_{element.name}')} "
+        f"ON {preparer.format_table(table)} (({element.expression(compiler)}))"
+    )
+
+
+def attach_indexed_paths(column: sqlalchemy.Column[typing.Any], table: sqlalchemy.Table) -> None:
+    """Register DDL of the indexed paths of the JSONField column.
+
+    :param column: JSONField column
+    :type column: sqlalchemy.Column[typing.Any]
+    :param table: column table
+    :type table: sqlalchemy.Table
+    """
+    field = typing.cast("JSONField", column.type)
+    for indexed in field.indexed_paths.values():
+        sqlalchemy.event.listen(
+            table,
+            "after_create",
+            AddGeneratedColumn(column, indexed).execute_if(dialect=_GENERATED_COLUMN_DIALECTS),  # type: ignore[arg-type]
+        )
+        sqlalchemy.event.listen(
+            table,
+            "after_create",
+            CreatePathIndex(column, indexed).execute_if(dialect=_INDEX_DIALECTS),  # type: ignore[arg-type]
+        )
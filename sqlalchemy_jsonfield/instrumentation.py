@@ -0,0 +1,303 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Encode/decode cost metrics of instrumented JSONField columns.
+
+Instrumentation is enabled per field: `JSONField(instrument=True)`.
+Not instrumented fields use processors without wrappers, so disabled instrumentation costs nothing.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+import typing
+
+__all__ = (
+    "HISTOGRAM_BOUNDS_US",
+    "ColumnMetrics",
+    "MetricEvent",
+    "add_listener",
+    "get_metrics",
+    "log_snapshot",
+    "remove_listener",
+    "reset",
+    "snapshot",
+)
+
+# Upper bounds of the duration histogram buckets in microseconds, the last bucket is unbounded
+HISTOGRAM_BOUNDS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 50000)
+_HISTOGRAM_BOUNDS_NS = tuple(bound * 1000 for bound in HISTOGRAM_BOUNDS_US)
+
+_OPERATIONS = ("encode", "decode")
+
+LOGGER = logging.getLogger(__name__)
+
+
+class MetricEvent(typing.NamedTuple):
+    """Single encode or decode operation."""
+
+    column: str
+    operation: str
+    duration_ns: int
+    size: int
+
+
+Listener = typing.Callable[[MetricEvent], typing.Any]
+
+_LISTENERS: list[Listener] = []
+_REGISTRY: dict[str, ColumnMetrics] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _size(value: typing.Any) -> int:
+    """Payload size: length of str, bytes and buffers, 0 for driver-level values.
+
+    :param value: encoded value
+    :type value: typing.Any
+    :return: payload size
+    :rtype: int
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    return 0
+
+
+class _OperationMetrics:
+    """Counters of the single operation."""
+
+    __slots__ = ("calls", "histogram", "max_size", "total_ns", "total_size")
+
+    def __init__(self) -> None:
+        """Counters of the single operation."""
+        self.calls = 0
+        self.total_size = 0
+        self.total_ns = 0
+        self.max_size = 0
+        self.histogram = [0] * (len(_HISTOGRAM_BOUNDS_NS) + 1)
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """Counters as dict.
+
+        :return: counters
+        :rtype: dict[str, typing.Any]
+        """
+        return {
+            "calls": self.calls,
+            "bytes": self.total_size,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns // self.calls if self.calls else 0,
+            "max_size": self.max_size,
+            "histogram_us": dict(zip((*HISTOGRAM_BOUNDS_US, "inf"), self.histogram)),
+        }
+
+
+class ColumnMetrics:
+    """Encode and decode metrics of the column.
+
+    Encoded size is counted for encode (bytes out) and stored size for decode (bytes in).
+    Lazy and streamed values are measured at fetch: decoding on access is not included.
+    """
+
+    __slots__ = ("__lock", "__name", "__operations")
+
+    def __init__(self, name: str) -> None:
+        """Metrics of the column.
+
+        :param name: column name
+        :type name: str
+        """
+        self.__name = name
+        self.__lock = threading.Lock()
+        self.__operations = {operation: _OperationMetrics() for operation in _OPERATIONS}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__name!r})"
+
+    @property
+    def name(self) -> str:
+        """Column name.
+
+        :rtype: str
+        """
+        return self.__name
+
+    def record(self, operation: str, duration_ns: int, size: int) -> None:
+        """Record operation.
+
+        :param operation: "encode" or "decode"
+        :type operation: str
+        :param duration_ns: operation duration in nanoseconds
+        :type duration_ns: int
+        :param size: payload size
+        :type size: int
+        """
+        bucket = bisect.bisect_left(_HISTOGRAM_BOUNDS_NS, duration_ns)
+        with self.__lock:
+            metrics = self.__operations[operation]
+            metrics.calls += 1
+            metrics.total_size += size
+            metrics.total_ns += duration_ns
+            metrics.histogram[bucket] += 1
+            metrics.max_size = max(metrics.max_size, size)
+        if _LISTENERS:
+            event = MetricEvent(self.__name, operation, duration_ns, size)
+            for listener in tuple(_LISTENERS):
+                listener(event)
+
+    def add_duration(self, operation: str, duration_ns: int) -> None:
+        """Add duration of the work done out of the processors (batch encoding) without counting calls.
+
+        :param operation: "encode" or "decode"
+        :type operation: str
+        :param duration_ns: duration in nanoseconds
+        :type duration_ns: int
+        """
+        with self.__lock:
+            self.__operations[operation].total_ns += duration_ns
+
+    def snapshot(self) -> dict[str, dict[str, typing.Any]]:
+        """Metrics snapshot.
+
+        :return: counters by operation
+        :rtype: dict[str, dict[str, typing.Any]]
+        """
+        with self.__lock:
+            return {operation: metrics.as_dict() for operation, metrics in self.__operations.items()}
+
+    def reset(self) -> None:
+        """Reset counters."""
+        with self.__lock:
+            self.__operations = {operation: _OperationMetrics() for operation in _OPERATIONS}
+
+    def wrap(
+        self,
+        processor: typing.Callable[[typing.Any], typing.Any],
+        operation: str,
+    ) -> typing.Callable[[typing.Any], typing.Any]:
+        """Make measuring processor.
+
+        :param processor: bind (encode) or result (decode) processor
+        :type processor: typing.Callable[[typing.Any], typing.Any]
+        :param operation: "encode" or "decode"
+        :type operation: str
+        :return: processor recording metrics of not None values
+        :rtype: typing.Callable[[typing.Any], typing.Any]
+        """
+        record = self.record
+        clock = time.perf_counter_ns
+
+        if operation == "encode":
+
+            def encode_instrumented(value: typing.Any) -> typing.Any:
+                if value is None:
+                    return processor(value)
+                started = clock()
+                result = processor(value)
+                record("encode", clock() - started, _size(result))
+                return result
+
+            return encode_instrumented
+
+        def decode_instrumented(value: typing.Any) -> typing.Any:
+            if value is None:
+                return processor(value)
+            started = clock()
+            result = processor(value)
+            record("decode", clock() - started, _size(value))
+            return result
+
+        return decode_instrumented
+
+
+def get_metrics(name: str) -> ColumnMetrics:
+    """Get or create column metrics.
+
+    :param name: column name
+    :type name: str
+    :return: column metrics
+    :rtype: ColumnMetrics
+    """
+    with _REGISTRY_LOCK:
+        metrics = _REGISTRY.get(name)
+        if metrics is None:
+            metrics = _REGISTRY[name] = ColumnMetrics(name)
+        return metrics
+
+
+def snapshot() -> dict[str, dict[str, dict[str, typing.Any]]]:
+    """Metrics of all instrumented columns.
+
+    :return: counters by column and operation
+    :rtype: dict[str, dict[str, dict[str, typing.Any]]]
+    """
+    with _REGISTRY_LOCK:
+        columns = list(_REGISTRY.values())
+    return {metrics.name: metrics.snapshot() for metrics in columns}
+
+
+def reset() -> None:
+    """Reset counters of all instrumented columns."""
+    with _REGISTRY_LOCK:
+        columns = list(_REGISTRY.values())
+    for metrics in columns:
+        metrics.reset()
+
+
+def add_listener(listener: Listener) -> None:
+    """Register callback called with MetricEvent for each measured operation.
+
+    :param listener: callback
+    :type listener: typing.Callable[[MetricEvent], typing.Any]
+    """
+    _LISTENERS.append(listener)
+
+
+def remove_listener(listener: Listener) -> None:
+    """Unregister callback.
+
+    :param listener: callback
+    :type listener: typing.Callable[[MetricEvent], typing.Any]
+    """
+    _LISTENERS.remove(listener)
+
+
+def log_snapshot(logger: logging.Logger = LOGGER, level: int = logging.INFO) -> None:
+    """Log metrics of all instrumented columns: one record per column and operation.
+
+    :param logger: target logger
+    :type logger: logging.Logger
+    :param level: log level
+    :type level: int
+    """
+    for column, operations in snapshot().items():
+        for operation, counters in operations.items():
+            if not counters["calls"]:
+                continue
+            logger.log(
+                level,
+                "%s %s: calls=%d bytes=%d total=%.3fms mean=%.1fus max_size=%d",
+                column,
+                operation,
+                counters["calls"],
+                counters["bytes"],
+                counters["total_ns"] / 1e6,
+                counters["mean_ns"] / 1e3,
+                counters["max_size"],
+                extra={"jsonfield_metrics": {"column": column, "operation": operation, **counters}},
+            )
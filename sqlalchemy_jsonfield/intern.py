@@ -0,0 +1,246 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Interning of object keys of decoded documents.
+
+Large result sets of same-shaped documents hold the same keys many times: each decoded dict
+owns key string objects. With interning decoded documents share key strings (and optionally short string values)
+from the bounded table, so only one copy of each is kept in memory.
+"""
+
+from __future__ import annotations
+
+import functools
+import sys
+import threading
+import typing
+
+from .codec import OrjsonCodec
+from .codec import StdlibCodec
+
+if typing.TYPE_CHECKING:
+    from .codec import Decoder
+    from .codec import JSONCodec
+
+__all__ = ("InternInfo", "InternTable", "get_intern_table")
+
+
+class InternInfo(typing.NamedTuple):
+    """Intern table statistics."""
+
+    hits: int
+    misses: int
+    currsize: int
+    currbytes: int
+    saved_bytes: int
+
+
+class InternTable:
+    """Bounded table of shared strings for decoded documents.
+
+    Object keys are interned always, object member values are interned if they are strings
+    not longer than `max_value_length`. When table is full, new strings are used as is.
+    Table can be shared by the fields: documents of different tables often have the same keys.
+    Statistics are collected without locking and are approximate under concurrent decoding.
+    """
+
+    __slots__ = ("__bytes", "__lock", "__lookups", "__max_value_length", "__maxsize", "__misses", "__strings")
+
+    def __init__(self, maxsize: int = 65536, *, max_value_length: int = 0) -> None:
+        """Bounded table of shared strings.
+
+        :param maxsize: maximal interned strings count
+        :type maxsize: int
+        :param max_value_length: intern string values up to the length, 0 to intern keys only
+        :type max_value_length: int
+        :raises ValueError: maxsize is not positive or max_value_length is negative
+        """
+        if maxsize <= 0:
+            raise ValueError(f"maxsize should be positive, got {maxsize}")
+        if max_value_length < 0:
+            raise ValueError(f"max_value_length should not be negative, got {max_value_length}")
+        self.__maxsize = maxsize
+        self.__max_value_length = max_value_length
+        self.__lock = threading.Lock()
+        self.__strings: dict[str, str] = {}
+        self.__lookups = 0
+        self.__misses = 0
+        self.__bytes = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(maxsize={self.__maxsize!r}, max_value_length={self.__max_value_length!r})"
+
+    @property
+    def max_value_length(self) -> int:
+        """Maximal length of interned string values.
+
+        :return: maximal length, 0 if only keys are interned
+        :rtype: int
+        """
+        return self.__max_value_length
+
+    def info(self) -> InternInfo:
+        """Table statistics.
+
+        Saved memory is estimated by the average size of interned strings.
+
+        :return: hits, misses, interned strings count and size, estimated size of the strings replaced by shared ones
+        :rtype: InternInfo
+        """
+        with self.__lock:
+            size = len(self.__strings)
+            hits = max(self.__lookups - self.__misses, 0)
+            return InternInfo(hits, self.__misses, size, self.__bytes, hits * self.__bytes // size if size else 0)
+
+    def clear(self) -> None:
+        """Drop interned strings and reset statistics."""
+        with self.__lock:
+            self.__strings.clear()
+            self.__lookups = self.__misses = self.__bytes = 0
+
+    def intern(self, value: str) -> str:
+        """Get shared string equal to the value.
+
+        :param value: string
+        :type value: str
+        :return: shared string or value itself
+        :rtype: str
+        """
+        self.__lookups += 1
+        return self.__strings.get(value) or self.__add(value)
+
+    def __add(self, value: str) -> str:
+        """Add string missing in the table (lookup is counted by the caller).
+
+        :param value: string
+        :type value: str
+        :return: shared string or value itself if table is full
+        :rtype: str
+        """
+        with self.__lock:
+            shared = self.__strings.get(value)
+            if shared is not None:  # Empty string or added concurrently
+                return shared
+            self.__misses += 1
+            if len(self.__strings) >= self.__maxsize:
+                return value
+            self.__strings[value] = value
+            self.__bytes += sys.getsizeof(value)
+            return value
+
+    def __pairs_hook(self) -> typing.Callable[[list[tuple[str, typing.Any]]], dict[str, typing.Any]]:
+        """Make `object_pairs_hook` for stdlib compatible decoders.
+
+        :return: hook building dicts with interned keys and short string values
+        :rtype: typing.Callable[[list[tuple[str, typing.Any]]], dict[str, typing.Any]]
+        """
+        get = self.__strings.get
+        add = self.__add
+        intern = self.intern
+        max_value_length = self.__max_value_length
+
+        if not max_value_length:
+
+            def keys_hook(pairs: list[tuple[str, typing.Any]]) -> dict[str, typing.Any]:
+                self.__lookups += len(pairs)
+                return {get(key) or add(key): value for key, value in pairs}
+
+            return keys_hook
+
+        def hook(pairs: list[tuple[str, typing.Any]]) -> dict[str, typing.Any]:
+            self.__lookups += len(pairs)
+            return {
+                get(key) or add(key): intern(value) if type(value) is str and len(value) <= max_value_length else value
+                for key, value in pairs
+            }
+
+        return hook
+
+    def intern_value(self, value: typing.Any) -> typing.Any:
+        """Rebuild decoded document with interned keys and short string values.
+
+        :param value: decoded document
+        :type value: typing.Any
+        :return: document with shared strings, dicts and lists are new objects
+        :rtype: typing.Any
+        """
+        intern = self.intern
+        max_value_length = self.__max_value_length
+
+        def walk(item: typing.Any) -> typing.Any:
+            if type(item) is dict:
+                return {
+                    intern(key): (
+                        intern(member)
+                        if max_value_length and type(member) is str and len(member) <= max_value_length
+                        else walk(member)
+                        if type(member) in _CONTAINERS
+                        else member
+                    )
+                    for key, member in item.items()
+                }
+            if type(item) is list:
+                return [walk(member) if type(member) in _CONTAINERS else member for member in item]
+            return item
+
+        return walk(value)
+
+    def decoder(self, codec: JSONCodec) -> Decoder:
+        """Make codec decoder producing documents with interned strings.
+
+        Stdlib compatible modules with `object_pairs_hook` support build dicts with interned keys directly.
+        orjson interns short keys by its own key cache, so only values are interned after decoding, if enabled.
+        Other codecs are followed by the document rebuild.
+
+        :param codec: codec adapter
+        :type codec: JSONCodec
+        :return: function for value decoding
+        :rtype: typing.Callable[[typing.Union[str, bytes, bytearray, memoryview]], typing.Any]
+        """
+        if isinstance(codec, StdlibCodec) and hasattr(codec.module, "JSONDecoder"):  # json, simplejson
+            loads = functools.partial(codec.module.loads, object_pairs_hook=self.__pairs_hook())
+
+            def decode_hooked(data: str | bytes | bytearray | memoryview) -> typing.Any:
+                if isinstance(data, memoryview):
+                    data = data.tobytes()
+                return loads(data)
+
+            return decode_hooked
+
+        decode = codec.decoder()
+        if isinstance(codec, OrjsonCodec) and not self.__max_value_length:
+            return decode
+        intern_value = self.intern_value
+
+        def decode_interned(data: str | bytes | bytearray | memoryview) -> typing.Any:
+            return intern_value(decode(data))
+
+        return decode_interned
+
+
+_CONTAINERS = frozenset((dict, list))
+_SHARED = InternTable()
+
+
+def get_intern_table(intern_table: bool | InternTable | None) -> InternTable | None:
+    """Get intern table by the field argument.
+
+    :param intern_table: True for the shared table, table instance or None/False to disable interning
+    :type intern_table: bool | InternTable | None
+    :return: intern table if enabled
+    :rtype: InternTable | None
+    """
+    if intern_table is True:
+        return _SHARED
+    return intern_table or None
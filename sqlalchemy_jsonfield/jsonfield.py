@@ -16,20 +16,246 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import time
 import typing
 
-import sqlalchemy.ext.mutable
 import sqlalchemy.types
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm.base import LoaderCallableStatus
+from sqlalchemy.sql import operators
+
+from .cache import DecodeCache
+from .cache import EncodeCache
+from .codec import get_codec
+from .content import HASH_LENGTH
+from .formats import get_format
+from .formats import get_format_by_id
+from .frozen import PartialJSON
+from .frozen import freeze
+from .indexing import attach_indexed_paths
+from .indexing import normalize_indexed_paths
+from .instrumentation import get_metrics
+from .intern import get_intern_table
+from .lazy import LazyJSON
+from .lazy import materialize
+from .mutable import MutableJSONDict
+from .mutable import NestedMutable
+from .offload import check_executor
+from .offload import estimate_size
+from .offload import offloaded
+from .query import JSONContains
+from .query import JSONHasKey
+from .query import JSONPathElement
+from .schema import get_schema
+from .storage import FORMAT_JSON
+from .storage import Compressor
+from .storage import get_compressor
+from .storage import pack
+from .storage import unpack
+from .stream import JSONStream
+from .stream import get_parser
 
 if typing.TYPE_CHECKING:
     import types
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+    from concurrent.futures import Executor
 
     from sqlalchemy.engine import Dialect
     from sqlalchemy.sql.type_api import TypeEngine
 
+    from .chunks import ChunkStore
+    from .codec import JSONCodec
+    from .content import ContentStore
+    from .formats import StorageFormat
+    from .indexing import IndexedPath
+    from .intern import InternTable
+    from .mutable import JSONPath
+    from .schema import Schema
+    from .stream import IncrementalParser
+
 __all__ = ("JSONField", "mutable_json_field")
 
+_NOT_COMPARABLE = (LoaderCallableStatus, PartialJSON)
+_DEFAULT_JSON = json
+
+
+class _IdentityKey:
+    """Hashable wrapper for unhashable objects, compared by identity.
+
+    Reference to the object is kept, so identity can not be reused while the cache key is alive.
+    """
+
+    __slots__ = ("__obj",)
+
+    def __init__(self, obj: typing.Any) -> None:
+        self.__obj = obj
+
+    def __hash__(self) -> int:
+        return id(self.__obj)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _IdentityKey) and other.__obj is self.__obj
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__obj!r})"
+
+
+def _framed_encoder(
+    encode: typing.Callable[[typing.Any], bytes],
+    compressor: Compressor | None,
+    threshold: int,
+    data_format: int = FORMAT_JSON,
+) -> typing.Callable[[typing.Any], bytes]:
+    """Make encoder for binary storage.
+
+    :param encode: codec or binary format encoder producing bytes
+    :type encode: typing.Callable[[typing.Any], bytes]
+    :param compressor: compression method
+    :type compressor: Compressor | None
+    :param threshold: minimal encoded size for compression
+    :type threshold: int
+    :param data_format: encoded data format id
+    :type data_format: int
+    :return: encoder producing stored value
+    :rtype: typing.Callable[[typing.Any], bytes]
+    """
+    if compressor is None and data_format == FORMAT_JSON:
+        return encode
+
+    def encoder(value: typing.Any) -> bytes:
+        return pack(encode(value), compressor, threshold, data_format)
+
+    return encoder
+
+
+def _framed_decoder(decode: typing.Callable[[typing.Any], typing.Any]) -> typing.Callable[[typing.Any], typing.Any]:
+    """Make decoder for binary storage.
+
+    Values in binary formats are decoded by the format registered for the stored format id,
+    so rows written with different formats are decoded by the same column.
+
+    :param decode: codec decoder of JSON values
+    :type decode: typing.Callable[[typing.Any], typing.Any]
+    :return: decoder accepting stored value
+    :rtype: typing.Callable[[typing.Any], typing.Any]
+    :raises ValueError: unsupported data format
+    """
+
+    def decoder(data: bytes | bytearray | memoryview | str) -> typing.Any:
+        data_format, encoded = unpack(data)
+        if data_format != FORMAT_JSON:
+            return get_format_by_id(data_format).decode(encoded)  # type: ignore[arg-type]
+        return decode(encoded)
+
+    return decoder
+
+
+def _framed_text(data: bytes | bytearray | memoryview | str) -> str | bytes:
+    """Extract JSON text from the stored value of binary storage.
+
+    :param data: stored value
+    :type data: bytes | bytearray | memoryview | str
+    :return: JSON text
+    :rtype: str | bytes
+    :raises ValueError: unsupported data format
+    """
+    data_format, encoded = unpack(data)
+    if data_format != FORMAT_JSON:
+        raise ValueError(f"Unsupported stored data format id: {data_format}")
+    return encoded if isinstance(encoded, (str, bytes)) else bytes(encoded)
+
+
+def _encode_lazy(
+    value: LazyJSON,
+    encode: typing.Callable[[typing.Any], typing.Any],
+    decode: typing.Callable[[typing.Any], typing.Any],
+) -> typing.Any:
+    """Encode lazy decoded value.
+
+    Not accessed value loaded by the same field is stored as is without decoding and encoding.
+
+    :param value: lazy decoded value
+    :type value: LazyJSON
+    :param encode: field encoder
+    :type encode: typing.Callable[[typing.Any], typing.Any]
+    :param decode: field decoder
+    :type decode: typing.Callable[[typing.Any], typing.Any]
+    :return: stored value
+    :rtype: typing.Any
+    """
+    if value.decoder is decode and not value.is_decoded:
+        return value.raw
+    return encode(value.value)
+
+
+class _PreEncoded(tuple):  # type: ignore[type-arg]
+    """Value encoded in advance: passed by the bind processor as is.
+
+    Tuple subclass is created without python-level constructor call, which matters for large batches.
+    """
+
+    __slots__ = ()
+
+
+def _frozen_decoder(decode: typing.Callable[[typing.Any], typing.Any]) -> typing.Callable[[typing.Any], typing.Any]:
+    """Make decoder producing immutable values.
+
+    :param decode: decoder
+    :type decode: typing.Callable[[typing.Any], typing.Any]
+    :return: decoder producing FrozenDict and tuples instead of dicts and lists
+    :rtype: typing.Callable[[typing.Any], typing.Any]
+    """
+
+    def decoder(data: typing.Any) -> typing.Any:
+        return freeze(decode(data))
+
+    return decoder
+
+
+def _codec_result_processor(
+    string_process: typing.Callable[[typing.Any], typing.Any] | None,
+    decode: typing.Callable[[typing.Any], typing.Any],
+) -> typing.Callable[[typing.Any], typing.Any]:
+    """Make native JSON result processor decoding strings by the column codec.
+
+    :param string_process: dialect string result processor
+    :type string_process: typing.Callable[[typing.Any], typing.Any] | None
+    :param decode: column codec decoder
+    :type decode: typing.Callable[[typing.Any], typing.Any]
+    :return: result processor
+    :rtype: typing.Callable[[typing.Any], typing.Any]
+    """
+
+    def process(value: typing.Any) -> typing.Any:
+        if value is None:
+            return None
+        if string_process is not None:
+            value = string_process(value)
+        return decode(value)
+
+    return process
+
+
+def _cache_key_item(obj: typing.Any) -> typing.Any:
+    """Make a hashable cache key component from configuration object.
+
+    :param obj: configuration object (codec, type or type class)
+    :type obj: typing.Any
+    :return: hashable representation
+    :rtype: typing.Any
+    """
+    if isinstance(obj, sqlalchemy.types.TypeEngine):
+        return obj._static_cache_key  # pylint: disable=protected-access
+    try:
+        hash(obj)
+    except TypeError:
+        return _IdentityKey(obj)
+    return obj
+
 
 # noinspection PyAbstractClass
 class JSONField(sqlalchemy.types.TypeDecorator):  # type: ignore[type-arg]  # pylint: disable=abstract-method
@@ -50,15 +276,60 @@ class JSONField(sqlalchemy.types.TypeDecorator):  # type: ignore[type-arg]  # py
         return self.process_bind_param(value, dialect)
 
     impl = sqlalchemy.types.TypeEngine  # Special placeholder
-    cache_ok = False  # Cache complexity due to requirement of value re-serialization and mutability
+    cache_ok = True  # Configuration is exposed via _static_cache_key
+
+    class Comparator(sqlalchemy.types.TypeDecorator.Comparator):  # type: ignore[type-arg]
+        """Server-side JSON path querying: `col["a"]["b"].as_string()`, `col.contains(...)`, `col.has_key(...)`."""
+
+        def operate(self, op: typing.Any, *other: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            """Handle JSON element access and containment.
+
+            :return: SQL expression
+            :rtype: typing.Any
+            """
+            if op is operators.getitem:
+                return JSONPathElement(self.expr, (other[0],))
+            if op is operators.contains_op:
+                return JSONContains(self.expr, (), other[0])
+            return super().operate(op, *other, **kwargs)
+
+        def has_key(self, key: str) -> JSONHasKey:
+            """Document is an object with the key.
+
+            :param key: object key
+            :type key: str
+            :return: boolean expression
+            :rtype: JSONHasKey
+            """
+            return JSONHasKey(self.expr, (), key)
+
+    comparator_factory = Comparator
 
     def __init__(  # pylint: disable=keyword-arg-before-vararg
         self,
         enforce_string: bool = False,
         enforce_unicode: bool = False,
-        json: types.ModuleType | typing.Any = json,  # pylint: disable=redefined-outer-name
+        json: JSONCodec | types.ModuleType | typing.Any = json,  # pylint: disable=redefined-outer-name
         json_type: TypeEngine[typing.Any] | type[TypeEngine[typing.Any]] = sqlalchemy.JSON,
         *args: typing.Any,
+        enforce_binary: bool = False,
+        compression: str | Compressor | None = None,
+        compression_threshold: int = 1024,
+        lazy: bool = False,
+        decode_cache: int | DecodeCache | None = None,
+        frozen: bool = False,
+        indexed_paths: Mapping[str | JSONPath, TypeEngine[typing.Any] | type[TypeEngine[typing.Any]]] | None = None,
+        stream: bool | str | IncrementalParser = False,
+        schema: type | None = None,
+        instrument: bool | str = False,
+        offload_threshold: int | None = None,
+        offload_executor: Executor | None = None,
+        content_store: ContentStore | None = None,
+        canonical: bool = False,
+        storage_format: str | StorageFormat = "json",
+        encode_cache: int | EncodeCache | None = None,
+        intern_table: bool | InternTable | None = None,
+        chunk_store: ChunkStore | None = None,
         **kwargs: typing.Any,
     ) -> None:
         """JSONField.
@@ -67,27 +338,436 @@ class JSONField(sqlalchemy.types.TypeDecorator):  # type: ignore[type-arg]  # py
         :type enforce_string: bool
         :param enforce_unicode: do not encode non-ascii data
         :type enforce_unicode: bool
-        :param json: JSON encoding/decoding library. By default: standard json package.
+        :param json: JSON encoding/decoding library or codec adapter. By default: standard json package.
+                     orjson and msgspec modules are detected and used via bytes-oriented adapters.
+                     Codec other than default replaces the engine-wide serializer in native JSON mode too,
+                     if dialect serializes values on the SQLAlchemy side (psycopg 3: Json/Jsonb wrappers).
         :param json_type: the sqlalchemy/dialect class that will be used to render the DB JSON type.
                           By default: sqlalchemy.JSON
         :param args: extra baseclass arguments
         :type args: typing.Any
+        :param enforce_binary: enforce LargeBinary type usage: encoded bytes are passed to the driver as is
+        :type enforce_binary: bool
+        :param compression: compress stored documents (implies LargeBinary type usage):
+                            "zlib", "lzma", "zstd" and "lz4" (if installed) or custom compressor.
+                            Rows without compression header (including legacy text rows) are decoded as is.
+        :type compression: str | Compressor | None
+        :param compression_threshold: minimal encoded document size in bytes for compression
+        :type compression_threshold: int
+        :param lazy: return LazyJSON proxies decoding stored value on first access.
+                     In native JSON mode laziness is possible only if decoding is not done by the database driver.
+        :type lazy: bool
+        :param decode_cache: cache decoded values of repeated stored payloads: cache size or DecodeCache instance.
+                             Cached values are returned as copies.
+        :type decode_cache: int | DecodeCache | None
+        :param frozen: decode to immutable hashable values: FrozenDict instead of dicts and tuples instead of lists.
+                       Frozen values are shared by the decode cache without copying.
+        :type frozen: bool
+        :param indexed_paths: value types of the keys (or paths) used in filters, for example
+                              `{"tenant": Integer, ("owner", "name"): String(64)}`.
+                              Generated columns (SQLite, MySQL/MariaDB) or expression indexes (PostgreSQL)
+                              are created with the table, matching path expressions are compiled to them.
+        :type indexed_paths: Mapping[str | JSONPath, TypeEngine[typing.Any] | type[TypeEngine[typing.Any]]] | None
+        :param stream: return JSONStream values with incremental access to the top-level members.
+                       True selects parser automatically (ijson if installed, stdlib otherwise),
+                       parser name ("ijson", "stdlib") or parser object can be used.
+                       Like lazy mode, in native JSON mode is possible only if decoding is not done by the driver.
+        :type stream: bool | str | IncrementalParser
+        :param schema: decode documents to the dataclass, msgspec Struct or TypedDict and encode them back.
+                       With msgspec installed typed decoder is used (values are validated),
+                       otherwise converters generated once per schema are applied to the decoded value.
+        :type schema: type | None
+        :param instrument: collect encode/decode metrics (see `sqlalchemy_jsonfield.instrumentation`).
+                           True uses "table.column" name of the column, string sets metrics name explicitly.
+        :type instrument: bool | str
+        :param offload_threshold: minimal document size (stored size for decoding, estimated for encoding)
+                                  for encoding/decoding in the executor when used by the asyncio engine.
+                                  Smaller documents and sync engine usage are processed inline.
+        :type offload_threshold: int | None
+        :param offload_executor: thread executor for offloaded work, event loop default executor if not set.
+                                 Process pools are not supported: column functions are not picklable.
+        :type offload_executor: concurrent.futures.Executor | None
+        :param content_store: store documents once in the side table and keep hash references in the column.
+                              Fetched values are LazyJSON proxies: documents are loaded on access
+                              (see `ContentStore.resolve` for batch loading).
+        :type content_store: ContentStore | None
+        :param canonical: encode to the canonical form (sorted keys, compact separators, NFC normalized strings,
+                          python float representation), so equal documents are stored byte to byte equal.
+                          Assigned values equal to the current ones by canonical form are not written,
+                          mutable columns skip UPDATE if the document is changed back.
+        :type canonical: bool
+        :param storage_format: stored documents format: "json" (codec is used) or binary format (implies
+                               LargeBinary type usage): "compact", "msgpack" and "cbor" (if installed)
+                               or custom format (see `sqlalchemy_jsonfield.formats`).
+                               Stored values are marked with the format id: rows in other formats are readable.
+        :type storage_format: str | StorageFormat
+        :param encode_cache: reuse encoded values of mutable documents bound again without changes:
+                             cache size in bytes or EncodeCache instance. Cached values are invalidated
+                             by change events of the mutable containers.
+        :type encode_cache: int | EncodeCache | None
+        :param intern_table: share object keys (and short string values, if configured) of decoded documents:
+                             True for the shared table or InternTable instance.
+                             Reduces memory of large result sets with same-shaped documents.
+        :type intern_table: bool | InternTable | None
+        :param chunk_store: store oversized documents by chunks in the side table, column keeps the manifest.
+                            Fetched chunked documents are loaded by chunks on access.
+        :type chunk_store: ChunkStore | None
         :param kwargs: extra baseclass keyworded arguments
         :type kwargs: typing.Any
+        :raises ValueError: indexed paths are declared for binary storage, stream is combined with
+                            lazy, frozen or decode_cache, schema is combined with frozen or stream,
+                            or content store is combined with binary storage, indexed paths, stream, schema
+                            or canonical (content store documents are canonical already),
+                            content store is used with codec without canonical form support,
+                            binary format is combined with stream, schema or canonical,
+                            encode cache is combined with content store,
+                            intern table is combined with stream or binary format,
+                            chunk store is combined with binary storage, content store, indexed paths,
+                            stream, schema, frozen, decode_cache or encode_cache
+        :raises TypeError: offload executor is a process or interpreter pool
         """
         self.__enforce_string = enforce_string
         self.__enforce_unicode = enforce_unicode
-        self.__json_codec = json
+        self.__compressor = None if compression is None else get_compressor(compression)
+        self.__format = None if storage_format == "json" else get_format(storage_format)
+        self.__binary = enforce_binary or self.__compressor is not None or self.__format is not None
+        self.__json_codec = get_codec(json)
+        # Native JSON mode: explicitly configured codec replaces the engine-wide serializer
+        self.__native_codec = json is not _DEFAULT_JSON or canonical
         self.__json_type = json_type
+        self.__compression_threshold = compression_threshold
+        self.__lazy = lazy
+        if indexed_paths and self.__binary:
+            raise ValueError("Indexed paths are not available for binary and compressed storage")
+        self.__indexed_paths = normalize_indexed_paths(indexed_paths or {})
+        if stream is not False and (lazy or frozen or decode_cache is not None):
+            raise ValueError("stream can not be combined with lazy, frozen and decode_cache")
+        self.__stream_parser = None if stream is False else get_parser("auto" if stream is True else stream)
+        self.__instrument = bool(instrument)
+        self.__metrics_name = instrument if isinstance(instrument, str) else None
+        if schema is not None and (frozen or stream is not False):
+            raise ValueError("schema can not be combined with frozen and stream")
+        self.__schema: Schema | None = None if schema is None else get_schema(schema)
+        if self.__format is not None and (stream is not False or schema is not None or canonical):
+            raise ValueError(
+                f"{self.__format.name} storage format can not be combined with stream, schema and canonical"
+            )
+        if content_store is not None and (
+            self.__binary or indexed_paths or stream is not False or self.__schema is not None or canonical
+        ):
+            raise ValueError(
+                "content_store can not be combined with binary storage, indexed_paths, stream, schema and canonical"
+            )
+        if content_store is not None and encode_cache is not None:
+            raise ValueError("content_store can not be combined with encode_cache")
+        if chunk_store is not None and (
+            self.__binary
+            or content_store is not None
+            or indexed_paths
+            or stream is not False
+            or self.__schema is not None
+            or frozen
+            or decode_cache is not None
+            or encode_cache is not None
+        ):
+            raise ValueError(
+                "chunk_store can not be combined with binary storage, content_store, indexed_paths, stream, schema, "
+                "frozen, decode_cache and encode_cache"
+            )
+        self.__chunk_store = chunk_store
+        self.__content_store = content_store
+        self.__canonical = canonical
+        self.__intern_table = get_intern_table(intern_table)
+        if self.__intern_table is not None and (stream is not False or self.__format is not None):
+            raise ValueError("intern_table can not be combined with stream and binary format")
+        self.__encode = self.__json_codec.encoder(
+            ensure_ascii=not enforce_unicode, binary=self.__binary, canonical=canonical
+        )
+        self.__decode = (  # Binary formats keep it for rows stored as JSON
+            self.__json_codec.decoder()
+            if self.__intern_table is None
+            else self.__intern_table.decoder(self.__json_codec)
+        )
+        if self.__format is not None:
+            self.__encode = self.__format.encode
+        if self.__schema is not None:
+            self.__encode = self.__schema.encoder(self.__encode, self.__json_codec)
+            self.__decode = self.__schema.decoder(
+                self.__decode, self.__json_codec if self.__intern_table is None else None
+            )
+        if content_store is not None:
+            self.__encode = content_store.encoder(
+                self.__json_codec.encoder(ensure_ascii=not enforce_unicode, canonical=True)  # type: ignore[arg-type]
+            )
+            self.__decode = content_store.decoder(self.__decode)
+            self.__lazy = True
+        if chunk_store is not None:
+            self.__encode = chunk_store.encoder(self.__encode)  # type: ignore[arg-type]
+            self.__decode = chunk_store.decoder(self.__decode)
+        if self.__binary:
+            self.__encode = _framed_encoder(
+                self.__encode,  # type: ignore[arg-type]
+                self.__compressor,
+                compression_threshold,
+                FORMAT_JSON if self.__format is None else self.__format.ident,
+            )
+            self.__decode = _framed_decoder(self.__decode)
+        check_executor(offload_executor)
+        self.__offload_threshold = offload_threshold
+        self.__offload_executor = offload_executor
+        self.__encode = self.__offloaded(self.__encode, estimate_size)
+        self.__decode = self.__offloaded(self.__decode)  # Before caching: cache hits are not offloaded
+        self.__frozen = frozen
+        if frozen:
+            self.__decode = _frozen_decoder(self.__decode)
+        if isinstance(decode_cache, int):
+            decode_cache = DecodeCache(decode_cache, copy_on_read=not frozen)
+        self.__decode_cache = decode_cache
+        if decode_cache is not None:
+            self.__decode = decode_cache.wrap(self.__decode, shared=frozen)
+        if isinstance(encode_cache, int):
+            encode_cache = EncodeCache(encode_cache)
+        self.__encode_cache = encode_cache
+        if encode_cache is not None:  # After offloading: cache hits are not offloaded
+            self.__encode = encode_cache.wrap(self.__encode)
+        self.__cache_key = (
+            ("enforce_string", enforce_string),
+            ("enforce_unicode", enforce_unicode),
+            ("enforce_binary", enforce_binary),
+            ("compression", self.__compressor),
+            ("compression_threshold", compression_threshold),
+            ("json", _cache_key_item(self.__json_codec)),
+            ("json_type", _cache_key_item(json_type)),
+            ("lazy", lazy),
+            ("decode_cache", decode_cache),
+            ("frozen", frozen),
+            ("indexed_paths", tuple((path, item.as_type) for path, item in self.__indexed_paths.items())),
+            ("stream", _cache_key_item(self.__stream_parser)),
+            ("schema", schema),
+            ("instrument", instrument),
+            ("offload_threshold", offload_threshold),
+            ("offload_executor", _cache_key_item(offload_executor)),
+            ("content_store", content_store),
+            ("canonical", canonical),
+            ("storage_format", self.__format),
+            ("encode_cache", encode_cache),
+            ("intern_table", self.__intern_table),
+            ("chunk_store", chunk_store),
+        )
         super().__init__(*args, **kwargs)
 
+    @property
+    def _static_cache_key(self) -> typing.Any:
+        """Cache key for the SQLAlchemy compiled statements cache.
+
+        Configuration is stored in private attributes, so the default attribute lookup by argument names
+        is extended with the explicit configuration.
+
+        :return: hashable cache key or NO_CACHE symbol
+        :rtype: typing.Any
+        """
+        base_key = super()._static_cache_key
+        if not isinstance(base_key, tuple):  # NO_CACHE
+            return base_key
+        return (*base_key, *self.__cache_key)
+
+    def __offloaded(
+        self,
+        func: typing.Callable[[typing.Any], typing.Any],
+        measure: typing.Callable[[typing.Any, int], int] | None = None,
+    ) -> typing.Callable[[typing.Any], typing.Any]:
+        """Offload encoding/decoding of large documents from the event loop, if configured.
+
+        :param func: encoding or decoding function
+        :type func: typing.Callable[[typing.Any], typing.Any]
+        :param measure: value size function, stored payload size by default
+        :type measure: typing.Callable[[typing.Any, int], int] | None
+        :return: function itself or offloading wrapper
+        :rtype: typing.Callable[[typing.Any], typing.Any]
+        """
+        if self.__offload_threshold is None:
+            return func
+        if measure is None:
+            return offloaded(func, self.__offload_threshold, self.__offload_executor)
+        return offloaded(func, self.__offload_threshold, self.__offload_executor, measure)
+
     def __use_json(self, dialect: Dialect) -> bool:
         """Helper to determine which encoder to use.
 
         :return: use engine-based json encoder
         :rtype: bool
         """
-        return hasattr(dialect, "_json_serializer") and not self.__enforce_string
+        return hasattr(dialect, "_json_serializer") and not (
+            self.__enforce_string or self.__binary or self.__content_store is not None or self.__chunk_store is not None
+        )
+
+    @property
+    def is_binary(self) -> bool:
+        """Documents are stored in binary form (LargeBinary type).
+
+        :return: binary or compressed storage is used
+        :rtype: bool
+        """
+        return self.__binary
+
+    @property
+    def storage_format(self) -> str:
+        """Stored documents format name.
+
+        :return: "json" or binary format name
+        :rtype: str
+        """
+        return "json" if self.__format is None else self.__format.name
+
+    @property
+    def canonical(self) -> bool:
+        """Documents are encoded to the canonical form.
+
+        :rtype: bool
+        """
+        return self.__canonical
+
+    def fingerprint(self, value: typing.Any) -> bytes:
+        """Digest of the encoded document for the change detection.
+
+        Not accessed lazy values are digested by the stored value without decoding.
+
+        :param value: document
+        :type value: typing.Any
+        :return: BLAKE2b digest of the encoded document
+        :rtype: bytes
+        """
+        if isinstance(value, LazyJSON) and not value.is_decoded and isinstance(value.raw, (str, bytes, memoryview)):
+            encoded = value.raw
+        else:
+            encoded = self.__encode(materialize(value))
+        if isinstance(encoded, str):
+            encoded = encoded.encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).digest()
+
+    def compare_values(self, x: typing.Any, y: typing.Any) -> bool:
+        """Compare values for the ORM change detection.
+
+        In canonical mode values are equal if canonical forms are equal: `{"a": 1}` and `{"a": True}` are different.
+
+        :return: values are equal
+        :rtype: bool
+        """
+        if not self.__canonical:
+            return super().compare_values(x, y)
+        if x is y:
+            return True
+        if x is None or y is None or isinstance(x, _NOT_COMPARABLE) or isinstance(y, _NOT_COMPARABLE):
+            return False  # ORM markers (value is not loaded) and projections are not equal to documents
+        return self.fingerprint(x) == self.fingerprint(y)
+
+    @property
+    def indexed_paths(self) -> Mapping[JSONPath, IndexedPath]:
+        """Indexed paths declarations.
+
+        :rtype: Mapping[JSONPath, IndexedPath]
+        """
+        return self.__indexed_paths
+
+    def _set_parent(self, parent: typing.Any, outer: bool = False, **kw: typing.Any) -> None:
+        """Register DDL of the indexed paths and metrics name when the column is attached to the table.
+
+        :param parent: column
+        :type parent: typing.Any
+        :param outer: called for the outer type
+        :type outer: bool
+        :param kw: extra arguments
+        :type kw: typing.Any
+        """
+        super()._set_parent(parent, outer=outer, **kw)
+        if self.__indexed_paths:
+            parent._on_table_attach(attach_indexed_paths)  # pylint: disable=protected-access
+        if self.__instrument and self.__metrics_name is None:
+            parent._on_table_attach(self.__set_metrics_name)  # pylint: disable=protected-access
+
+    def __set_metrics_name(self, column: sqlalchemy.Column[typing.Any], table: sqlalchemy.Table) -> None:
+        """Use column name for metrics, if not set.
+
+        :param column: column
+        :type column: sqlalchemy.Column[typing.Any]
+        :param table: column table
+        :type table: sqlalchemy.Table
+        """
+        if self.__metrics_name is None:
+            self.__metrics_name = f"{table.fullname}.{column.name}"
+
+    @property
+    def metrics_name(self) -> str | None:
+        """Name of the encode/decode metrics, None if instrumentation is disabled.
+
+        :rtype: str | None
+        """
+        if not self.__instrument:
+            return None
+        return self.__metrics_name or f"{self.__class__.__name__}@{id(self):x}"
+
+    @property
+    def schema(self) -> type | None:
+        """Schema type of the documents.
+
+        :rtype: type | None
+        """
+        return None if self.__schema is None else self.__schema.schema
+
+    @property
+    def decode_cache(self) -> DecodeCache | None:
+        """Cache of decoded values.
+
+        :return: decode cache if enabled
+        :rtype: DecodeCache | None
+        """
+        return self.__decode_cache
+
+    @property
+    def encode_cache(self) -> EncodeCache | None:
+        """Cache of encoded values.
+
+        :return: encode cache if enabled
+        :rtype: EncodeCache | None
+        """
+        return self.__encode_cache
+
+    @property
+    def content_store(self) -> ContentStore | None:
+        """Side table storage of the documents by content hash.
+
+        :return: content store if enabled
+        :rtype: ContentStore | None
+        """
+        return self.__content_store
+
+    @property
+    def chunk_store(self) -> ChunkStore | None:
+        """Side table storage of oversized documents.
+
+        :return: chunk store if enabled
+        :rtype: ChunkStore | None
+        """
+        return self.__chunk_store
+
+    @property
+    def intern_table(self) -> InternTable | None:
+        """Table of shared strings of decoded documents.
+
+        :return: intern table if enabled
+        :rtype: InternTable | None
+        """
+        return self.__intern_table
+
+    def use_native_json(self, dialect: Dialect) -> bool:
+        """Check whether native JSON type is used for the dialect.
+
+        :param dialect: database dialect
+        :type dialect: Dialect
+        :return: native JSON type is used
+        :rtype: bool
+        """
+        return self.__use_json(dialect)
 
     def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[typing.Any]:
         """Select impl by dialect.
@@ -96,38 +776,409 @@ class JSONField(sqlalchemy.types.TypeDecorator):  # type: ignore[type-arg]  # py
         :rtype: TypeEngine
         """
         # types are handled by DefaultDialect, Dialect class is abstract
+        if self.__binary:
+            return dialect.type_descriptor(sqlalchemy.LargeBinary)  # type: ignore[arg-type]
         if self.__use_json(dialect):
             return dialect.type_descriptor(self.__json_type)  # type: ignore[arg-type]
+        if self.__content_store is not None:
+            return dialect.type_descriptor(sqlalchemy.String(HASH_LENGTH))
         return dialect.type_descriptor(sqlalchemy.UnicodeText)  # type: ignore[arg-type]
 
-    def process_bind_param(self, value: typing.Any, dialect: Dialect) -> str | typing.Any:
+    def process_bind_param(self, value: typing.Any, dialect: Dialect) -> str | bytes | typing.Any:
         """Encode data, if required.
 
         :return: encoded value if required
-        :rtype: typing.Union[str, typing.Any]
+        :rtype: typing.Union[str, bytes, typing.Any]
         """
-        if self.__use_json(dialect) or value is None:
+        if value is None:
             return value
+        if self.__use_json(dialect):
+            value = materialize(value)
+            return value if self.__schema is None else self.__schema.prepare()(value)
+        if type(value) is _PreEncoded:
+            return value[0]
+        if isinstance(value, LazyJSON):
+            return _encode_lazy(value, self.__encode, self.__decode)
 
-        return self.__json_codec.dumps(value, ensure_ascii=not self.__enforce_unicode)
+        return self.__encode(value)
 
-    def process_result_value(self, value: str | typing.Any, dialect: Dialect) -> typing.Any:
+    def process_result_value(self, value: str | bytes | typing.Any, dialect: Dialect) -> typing.Any:
         """Decode data, if required.
 
         :return: decoded result value if required
         :rtype: typing.Any
         """
-        if self.__use_json(dialect) or value is None:
+        if value is None:
             return value
+        if self.__use_json(dialect):
+            return value if self.__schema is None else self.__schema.from_builtins(value)
+        if self.__lazy or self.__stream_parser is not None:
+            return self.__lazy_factory(self.__decode)(value)
+
+        return self.__decode(value)
+
+    def bind_processor(self, dialect: Dialect) -> typing.Callable[[typing.Any], typing.Any] | None:
+        """Build bind processor for dialect.
+
+        Encoding method is selected once per dialect instead of each value processing.
+
+        :return: bind value processor
+        :rtype: typing.Optional[typing.Callable[[typing.Any], typing.Any]]
+        """
+        processor = self.__bind_processor(dialect)
+        name = self.metrics_name
+        if processor is None or name is None:
+            return processor
+        return get_metrics(name).wrap(processor, "encode")
+
+    def __bind_processor(self, dialect: Dialect) -> typing.Callable[[typing.Any], typing.Any] | None:
+        """Build bind processor without instrumentation.
+
+        :return: bind value processor
+        :rtype: typing.Optional[typing.Callable[[typing.Any], typing.Any]]
+        """
+        impl_processor: typing.Callable[[typing.Any], typing.Any] | None = self.impl_instance.bind_processor(dialect)
+        if self.__use_json(dialect):
+            if impl_processor is not None:
+                impl_processor = self.__native_bind_processor(dialect, impl_processor)
+            if not (self.__lazy or self.__stream_parser or self.__schema):
+                return impl_processor
+            prepare = None if self.__schema is None else self.__schema.prepare()
+
+            def process_native(value: typing.Any) -> typing.Any:
+                value = materialize(value)
+                if prepare is not None:
+                    value = prepare(value)
+                if impl_processor is None:
+                    return value
+                return impl_processor(value)
+
+            return process_native
+
+        dumps = self.__encode
+        loads = self.__decode
+
+        if impl_processor is None:
+
+            def process(value: typing.Any) -> str | bytes | None:
+                if value is None:
+                    return None
+                if type(value) is _PreEncoded:
+                    return value[0]  # type: ignore[no-any-return]
+                if isinstance(value, LazyJSON):
+                    return _encode_lazy(value, dumps, loads)  # type: ignore[no-any-return]
+                return dumps(value)
+
+            return process
+
+        def process_chained(value: typing.Any) -> typing.Any:
+            if value is None:
+                return impl_processor(None)
+            if type(value) is _PreEncoded:
+                return impl_processor(value[0])
+            if isinstance(value, LazyJSON):
+                return impl_processor(_encode_lazy(value, dumps, loads))
+            return impl_processor(dumps(value))
+
+        return process_chained
+
+    def __native_bind_processor(
+        self, dialect: Dialect, impl_processor: typing.Callable[[typing.Any], typing.Any]
+    ) -> typing.Callable[[typing.Any], typing.Any]:
+        """Build native JSON bind processor serializing values by the column codec, if configured.
+
+        Dialect NULL handling is kept. On psycopg 3 values are passed in Json/Jsonb wrappers with the column codec,
+        so driver selects dumper (including binary jsonb) itself.
+
+        :param dialect: database dialect
+        :type dialect: Dialect
+        :param impl_processor: impl bind processor serializing values by the engine-wide serializer
+        :type impl_processor: typing.Callable[[typing.Any], typing.Any]
+        :return: bind value processor
+        :rtype: typing.Callable[[typing.Any], typing.Any]
+        """
+        impl = self.impl_instance
+        if not (self.__native_codec and isinstance(impl, sqlalchemy.JSON)):
+            impl_processor = self.__offloaded(impl_processor, estimate_size)
+            if self.__encode_cache is not None:
+                impl_processor = self.__encode_cache.wrap(impl_processor)
+            return impl_processor
+
+        psycopg = dialect.driver == "psycopg"
+        encode = self.__json_codec.encoder(
+            ensure_ascii=not self.__enforce_unicode, binary=psycopg, canonical=self.__canonical
+        )
+        encode = self.__offloaded(encode, estimate_size)
+        if self.__encode_cache is not None:
+            encode = self.__encode_cache.wrap(encode)
+        if not psycopg:
+            return impl._make_bind_processor(impl._str_impl.bind_processor(dialect), encode)  # type: ignore[no-any-return,no-untyped-call]
+
+        wrapper = dialect._psycopg_Jsonb if isinstance(impl, postgresql.JSONB) else dialect._psycopg_Json  # type: ignore[attr-defined]
+
+        def serialize(value: typing.Any) -> typing.Any:
+            return wrapper(value, encode)
+
+        return impl._make_bind_processor(None, serialize)  # type: ignore[no-any-return,no-untyped-call]
+
+    def result_processor(
+        self, dialect: Dialect, coltype: typing.Any
+    ) -> typing.Callable[[typing.Any], typing.Any] | None:
+        """Build result processor for dialect.
+
+        Decoding method is selected once per dialect instead of each value processing.
+
+        :return: result value processor
+        :rtype: typing.Optional[typing.Callable[[typing.Any], typing.Any]]
+        """
+        processor = self.__result_processor(dialect, coltype)
+        name = self.metrics_name
+        if processor is None or name is None:
+            return processor
+        return get_metrics(name).wrap(processor, "decode")
+
+    def __result_processor(
+        self, dialect: Dialect, coltype: typing.Any
+    ) -> typing.Callable[[typing.Any], typing.Any] | None:
+        """Build result processor without instrumentation.
+
+        :return: result value processor
+        :rtype: typing.Optional[typing.Callable[[typing.Any], typing.Any]]
+        """
+        impl_processor: typing.Callable[[typing.Any], typing.Any] | None = self.impl_instance.result_processor(
+            dialect, coltype
+        )
+        if self.__use_json(dialect):
+            if impl_processor is None:  # Driver decodes value itself: interning, freezing and schema conversion only
+                convert: list[typing.Callable[[typing.Any], typing.Any]] = []
+                if self.__intern_table is not None:
+                    convert.append(self.__intern_table.intern_value)
+                if self.__schema is not None:
+                    convert.append(self.__schema.from_builtins)
+                elif self.__frozen:
+                    convert.append(freeze)
+                if not convert:
+                    return None
+
+                def process_native_decoded(value: typing.Any) -> typing.Any:
+                    if value is None:
+                        return None
+                    for step in convert:
+                        value = step(value)
+                    return value
+
+                return process_native_decoded
+            if (self.__native_codec or self.__intern_table is not None) and isinstance(
+                self.impl_instance, sqlalchemy.JSON
+            ):
+                # Driver returns strings: decoded by the column codec instead of the engine-wide deserializer
+                impl_processor = _codec_result_processor(
+                    self.impl_instance._str_impl.result_processor(dialect, coltype),
+                    self.__json_codec.decoder()
+                    if self.__intern_table is None
+                    else self.__intern_table.decoder(self.__json_codec),
+                )
+            impl_processor = self.__offloaded(impl_processor)
+            if (
+                not (self.__lazy or self.__frozen or self.__stream_parser or self.__schema)
+                and self.__decode_cache is None
+            ):
+                return impl_processor
+
+            native_loads = _frozen_decoder(impl_processor) if self.__frozen else impl_processor
+            if self.__schema is not None:
+                native_loads = self.__schema.decoder(native_loads)
+            if self.__decode_cache is not None:
+                native_loads = self.__decode_cache.wrap(native_loads, shared=self.__frozen)
+
+            if self.__lazy or self.__stream_parser is not None:
+                make_lazy = self.__lazy_factory(native_loads)
+
+                def process_native_lazy(value: typing.Any) -> typing.Any:
+                    if value is None:
+                        return None
+                    return make_lazy(value)
+
+                return process_native_lazy
+
+            def process_native(value: typing.Any) -> typing.Any:
+                if value is None:
+                    return None
+                return native_loads(value)
+
+            return process_native
+
+        loads = self.__decode
+
+        if self.__lazy or self.__stream_parser is not None:
+            return self.__lazy_result_processor(None if self.__binary else impl_processor)
+
+        if impl_processor is None or self.__binary:  # decoder accepts buffers without bytes copy
+
+            def process(value: str | bytes | memoryview | None) -> typing.Any:
+                if value is None:
+                    return None
+                return loads(value)
+
+            return process
+
+        def process_chained(value: typing.Any) -> typing.Any:
+            value = impl_processor(value)
+            if value is None:
+                return None
+            return loads(value)
+
+        return process_chained
+
+    def encode_many(
+        self,
+        values: Iterable[typing.Any],
+        dialect: Dialect,
+        executor: Executor | None = None,
+        chunk_size: int = 1000,
+    ) -> list[typing.Any]:
+        """Encode values of the executemany parameters list in one pass.
+
+        Encoded values are returned wrapped into the marker type, so bind processor passes them to the driver as is.
+        In native JSON mode encoding is done by the dialect and values are returned unchanged.
+
+        :param values: values to encode
+        :type values: Iterable[typing.Any]
+        :param dialect: database dialect
+        :type dialect: Dialect
+        :param executor: executor for parallel encoding of chunks (useful for codecs releasing GIL)
+        :type executor: concurrent.futures.Executor | None
+        :param chunk_size: values per executor task
+        :type chunk_size: int
+        :return: encoded values in the same order
+        :rtype: list[typing.Any]
+        """
+        values = list(values)
+        if self.__use_json(dialect):
+            return values
+
+        name = self.metrics_name
+        started = time.perf_counter_ns()
+        encode_batch = self.__batch_encoder()
+        if executor is None or len(values) <= chunk_size:
+            result = encode_batch(values)
+        else:
+            result = []
+            for encoded in executor.map(
+                encode_batch, (values[start : start + chunk_size] for start in range(0, len(values), chunk_size))
+            ):
+                result.extend(encoded)
+        if name is not None:  # Encoded values are counted by the bind processor
+            get_metrics(name).add_duration("encode", time.perf_counter_ns() - started)
+        return result
+
+    def __batch_encoder(self) -> typing.Callable[[list[typing.Any]], list[typing.Any]]:
+        """Make batch encoder producing values passed by the bind processor as is.
+
+        :return: batch encoder
+        :rtype: typing.Callable[[list[typing.Any]], list[typing.Any]]
+        """
+        data_format = FORMAT_JSON
+        encode_plain: typing.Callable[[Sequence[typing.Any]], list[str | bytes]]
+        if self.__format is not None:
+            data_format = self.__format.ident
+            encode_value = self.__format.encode
+
+            def encode_plain(values: Sequence[typing.Any]) -> list[str | bytes]:
+                return [encode_value(value) for value in values]
+
+        else:
+            encode_plain = self.__json_codec.batch_encoder(
+                ensure_ascii=not self.__enforce_unicode, binary=self.__binary, canonical=self.__canonical
+            )
+        if self.__schema is not None:
+            encode_plain = self.__schema.batch_encoder(encode_plain, self.__json_codec)
+        if self.__content_store is not None or self.__chunk_store is not None:
+            # Store encoders produce references carrying the side table documents
+            encode_stored = self.__encode
+
+            def encode_plain(values: Sequence[typing.Any]) -> list[str | bytes]:
+                return [encode_stored(value) for value in values]
+
+        dumps = self.__encode
+        loads = self.__decode
+        compressor = self.__compressor
+        threshold = self.__compression_threshold
+        framed = compressor is not None or data_format != FORMAT_JSON
+
+        def encode_batch(values: list[typing.Any]) -> list[typing.Any]:
+            plain = [value for value in values if not (value is None or isinstance(value, LazyJSON))]
+            if len(plain) == len(values) and not framed:  # Fast path: no per-value python code
+                return list(map(_PreEncoded, zip(encode_plain(plain))))
+
+            encoded = iter(encode_plain(plain))
+            result: list[typing.Any] = []
+            for value in values:
+                if value is None:
+                    result.append(None)
+                elif isinstance(value, LazyJSON):
+                    result.append(_PreEncoded((_encode_lazy(value, dumps, loads),)))
+                elif not framed:
+                    result.append(_PreEncoded((next(encoded),)))
+                else:
+                    result.append(_PreEncoded((pack(next(encoded), compressor, threshold, data_format),)))  # type: ignore[arg-type]
+            return result
+
+        return encode_batch
+
+    def __lazy_factory(
+        self, loads: typing.Callable[[typing.Any], typing.Any]
+    ) -> typing.Callable[[typing.Any], LazyJSON]:
+        """Make constructor of lazy decoded values: LazyJSON or JSONStream in stream mode.
+
+        :param loads: decoder of the full document
+        :type loads: typing.Callable[[typing.Any], typing.Any]
+        :return: lazy value constructor
+        :rtype: typing.Callable[[typing.Any], LazyJSON]
+        """
+        parser = self.__stream_parser
+        if parser is None:
+            return lambda raw: LazyJSON(raw, loads)
+        text = _framed_text if self.__binary else None
+        return lambda raw: JSONStream(raw, loads, parser, text)
+
+    def __lazy_result_processor(
+        self,
+        impl_processor: typing.Callable[[typing.Any], typing.Any] | None,
+    ) -> typing.Callable[[typing.Any], typing.Any]:
+        """Build result processor producing lazy decoded values.
+
+        :param impl_processor: impl result processor
+        :type impl_processor: typing.Optional[typing.Callable[[typing.Any], typing.Any]]
+        :return: result value processor
+        :rtype: typing.Callable[[typing.Any], typing.Any]
+        """
+        make_lazy = self.__lazy_factory(self.__decode)
+
+        if impl_processor is None:
+
+            def process(value: typing.Any) -> LazyJSON | None:
+                if value is None:
+                    return None
+                return make_lazy(value)
+
+            return process
+
+        def process_chained(value: typing.Any) -> LazyJSON | None:
+            value = impl_processor(value)
+            if value is None:
+                return None
+            return make_lazy(value)
 
-        return self.__json_codec.loads(value)
+        return process_chained
 
 
 def mutable_json_field(  # pylint: disable=keyword-arg-before-vararg, redefined-outer-name
     enforce_string: bool = False,
     enforce_unicode: bool = False,
-    json: types.ModuleType | typing.Any = json,
+    json: JSONCodec | types.ModuleType | typing.Any = json,
     *args: typing.Any,
+    track_nested: bool = False,
     **kwargs: typing.Any,
 ) -> JSONField:
     """Mutable JSONField creator.
@@ -136,16 +1187,25 @@ def mutable_json_field(  # pylint: disable=keyword-arg-before-vararg, redefined-
     :type enforce_string: bool
     :param enforce_unicode: do not encode non-ascii data
     :type enforce_unicode: bool
-    :param json: JSON encoding/decoding library.
+    :param json: JSON encoding/decoding library or codec adapter.
                  By default: standard json package.
     :param args: extra baseclass arguments
     :type args: typing.Any
+    :param track_nested: track changes of nested dicts and lists (dict and list documents are supported).
+                         Native JSON columns are updated partially by changed paths.
+    :type track_nested: bool
     :param kwargs: extra baseclass keyworded arguments
     :type kwargs: typing.Any
-    :return: Mutable JSONField via MutableDict.as_mutable
+    :return: Mutable JSONField via MutableJSONDict.as_mutable or NestedMutable.as_mutable
     :rtype: JSONField
+    :raises ValueError: frozen values or schema instances requested
     """
-    return sqlalchemy.ext.mutable.MutableDict.as_mutable(  # type: ignore[return-value]
+    if kwargs.get("frozen"):
+        raise ValueError("Mutable JSONField can not produce frozen values")
+    if kwargs.get("schema") is not None:
+        raise ValueError("Mutable JSONField can not produce schema instances")
+    mutable_type = NestedMutable if track_nested else MutableJSONDict
+    return mutable_type.as_mutable(  # type: ignore[return-value]
         JSONField(  # type: ignore[misc]
             enforce_string=enforce_string,
             enforce_unicode=enforce_unicode,
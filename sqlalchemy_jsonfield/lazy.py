@@ -0,0 +1,159 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Lazy decoded JSON values."""
+
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = ("LazyJSON", "materialize")
+
+_NOT_DECODED = object()
+
+
+class LazyJSON:
+    """Stored JSON value decoded on first access.
+
+    Proxy holds the raw stored value and forwards container protocol and attribute access to the decoded value.
+    Values compare equal to the decoded value.
+    """
+
+    __slots__ = ("__decoder", "__raw", "__value")
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self, raw: typing.Any, decoder: typing.Callable[[typing.Any], typing.Any]) -> None:
+        """Lazy decoded JSON value.
+
+        :param raw: stored value (str, bytes or buffer, depends on storage)
+        :type raw: typing.Any
+        :param decoder: decoding function
+        :type decoder: typing.Callable[[typing.Any], typing.Any]
+        """
+        self.__raw = raw
+        self.__decoder = decoder
+        self.__value: typing.Any = _NOT_DECODED
+
+    @property
+    def raw(self) -> typing.Any:
+        """Stored value.
+
+        :return: raw stored value
+        :rtype: typing.Any
+        """
+        return self.__raw
+
+    @property
+    def decoder(self) -> typing.Callable[[typing.Any], typing.Any]:
+        """Decoding function.
+
+        :return: decoding function
+        :rtype: typing.Callable[[typing.Any], typing.Any]
+        """
+        return self.__decoder
+
+    @property
+    def is_decoded(self) -> bool:
+        """Value has been decoded.
+
+        :return: value has been decoded
+        :rtype: bool
+        """
+        return self.__value is not _NOT_DECODED
+
+    @property
+    def value(self) -> typing.Any:
+        """Decoded value.
+
+        :return: decoded value
+        :rtype: typing.Any
+        """
+        if self.__value is _NOT_DECODED:
+            self.__value = self._load(self.__raw)
+        return self.__value
+
+    def _load(self, raw: typing.Any) -> typing.Any:
+        """Decode stored value.
+
+        :param raw: stored value
+        :type raw: typing.Any
+        :return: decoded value
+        :rtype: typing.Any
+        """
+        return self.__decoder(raw)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyJSON):
+            if (
+                not (self.is_decoded or other.is_decoded)
+                and self.__decoder is other.decoder
+                and self.__raw == other.raw
+            ):
+                return True
+            other = other.value
+        return self.value == other  # type: ignore[no-any-return]
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __getitem__(self, key: typing.Any) -> typing.Any:
+        return self.value[key]
+
+    def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+        self.value[key] = value
+
+    def __delitem__(self, key: typing.Any) -> None:
+        del self.value[key]
+
+    def __iter__(self) -> Iterator[typing.Any]:
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __contains__(self, item: typing.Any) -> bool:
+        return item in self.value
+
+    def __bool__(self) -> bool:
+        return bool(self.value)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name.startswith("_"):  # Private names and not initialized slots are not forwarded
+            raise AttributeError(name)
+        return getattr(self.value, name)
+
+    def __repr__(self) -> str:
+        if self.is_decoded:
+            return f"{self.__class__.__name__}({self.__value!r})"
+        return f"{self.__class__.__name__}(<not decoded: {self.__raw!r:.64}>)"
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        return materialize, (self.value,)
+
+
+def materialize(value: typing.Any) -> typing.Any:
+    """Get decoded value from lazy proxy, other values are returned as is.
+
+    :param value: lazy proxy or any value
+    :type value: typing.Any
+    :return: decoded value
+    :rtype: typing.Any
+    """
+    if isinstance(value, LazyJSON):
+        return value.value
+    return value
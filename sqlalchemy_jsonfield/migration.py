@@ -0,0 +1,223 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Re-encoding of stored documents to the current JSONField configuration.
+
+Column type is changed in the model (storage mode, storage format, compression, codec), migration rewrites
+stored rows in batches online: previous configuration decodes stored values, the new one encodes them.
+"""
+
+from __future__ import annotations
+
+import time
+import typing
+
+import sqlalchemy
+from sqlalchemy.types import NullType
+
+from .jsonfield import JSONField
+from .lazy import materialize
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+    from concurrent.futures import Executor
+
+    from sqlalchemy.engine import Engine
+
+__all__ = ("MigrationProgress", "reencode_column")
+
+
+class MigrationProgress(typing.NamedTuple):
+    """Re-encoding progress after the committed batch."""
+
+    batches: int
+    scanned: int
+    updated: int
+    last_key: tuple[typing.Any, ...]
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Scanned rows rate.
+
+        :return: scanned rows per second
+        :rtype: float
+        """
+        return self.scanned / self.elapsed if self.elapsed else 0.0
+
+
+# Stored values in the serialized form: compared with the encoded values as is
+_SERIALIZED = (str, bytes, bytearray, memoryview)
+
+
+def _converter(
+    decode: typing.Callable[[typing.Any], typing.Any] | None,
+    encode: typing.Callable[[typing.Any], typing.Any] | None,
+    target_decode: typing.Callable[[typing.Any], typing.Any] | None,
+) -> typing.Callable[[Sequence[typing.Any]], list[typing.Any]]:
+    """Make converter of the stored values chunk.
+
+    Values decoded by the driver (native JSON) are bound as documents or driver wrappers (psycopg Json/Jsonb),
+    which are not comparable with the fetched values: such rows are compared by the documents decoded by the target.
+
+    :param decode: source result processor
+    :type decode: typing.Callable[[typing.Any], typing.Any] | None
+    :param encode: target bind processor
+    :type encode: typing.Callable[[typing.Any], typing.Any] | None
+    :param target_decode: target result processor
+    :type target_decode: typing.Callable[[typing.Any], typing.Any] | None
+    :return: function producing new stored values, None for values already stored in the target form
+    :rtype: typing.Callable[[Sequence[typing.Any]], list[typing.Any]]
+    """
+
+    def convert(chunk: Sequence[typing.Any]) -> list[typing.Any]:
+        result: list[typing.Any] = []
+        for raw in chunk:
+            value = materialize(raw if decode is None else decode(raw))
+            encoded = value if encode is None else encode(value)
+            if isinstance(raw, _SERIALIZED) or isinstance(encoded, _SERIALIZED):
+                unchanged = encoded == raw
+            else:
+                unchanged = materialize(raw if target_decode is None else target_decode(raw)) == value
+            result.append(None if unchanged else encoded)
+        return result
+
+    return convert
+
+
+def reencode_column(
+    engine: Engine,
+    column: sqlalchemy.Column[typing.Any],
+    *,
+    batch_size: int = 1000,
+    source: JSONField | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = 100,
+    pause: float = 0.0,
+    start_after: Sequence[typing.Any] | None = None,
+    progress: typing.Callable[[MigrationProgress], typing.Any] | None = None,
+) -> int:
+    """Re-encode stored documents of the column by the column type.
+
+    Rows are read in primary key order by keyset pagination: each page is limited by the batch size,
+    so memory does not depend on the table size. Each batch is updated by executemany in own transaction
+    (short locks, migration works online and can be interrupted). Rows already stored in the target
+    form and NULL values are not updated. Values decoded by the driver (native JSON) are rewritten
+    only if the document decoded by the column type differs.
+
+    Migration between storage modes (string and native JSON, codecs, binary formats and compression)
+    uses `source` type to decode stored values: previous configuration of the column.
+    Column DDL (for example TEXT to JSONB) should be changed separately, if required by the database.
+
+    Interrupted migration is continued by `start_after` with `last_key` of the last reported progress.
+
+    :param engine: database engine
+    :type engine: Engine
+    :param column: table column with JSONField type
+    :type column: sqlalchemy.Column[typing.Any]
+    :param batch_size: rows per batch
+    :type batch_size: int
+    :param source: type decoding stored values, column type by default
+    :type source: JSONField | None
+    :param executor: executor for parallel decoding and encoding of batch chunks (useful for codecs releasing GIL)
+    :type executor: concurrent.futures.Executor | None
+    :param chunk_size: rows per executor task
+    :type chunk_size: int
+    :param pause: pause between batches in seconds to limit database load
+    :type pause: float
+    :param start_after: primary key of the last processed row (checkpoint) to resume migration
+    :type start_after: Sequence[typing.Any] | None
+    :param progress: callback receiving progress after each committed batch
+    :type progress: typing.Callable[[MigrationProgress], typing.Any] | None
+    :return: updated rows count
+    :rtype: int
+    :raises TypeError: column or source type is not JSONField
+    :raises ValueError: table has no primary key, checkpoint does not match it, batch or chunk size is not positive
+    """
+    field = column.type
+    if not isinstance(field, JSONField):
+        raise TypeError(f"Column {column} type is not JSONField: {field!r}")
+    if source is not None and not isinstance(source, JSONField):
+        raise TypeError(f"Source type is not JSONField: {source!r}")
+    if batch_size <= 0 or chunk_size <= 0:
+        raise ValueError(f"batch_size and chunk_size should be positive, got {batch_size} and {chunk_size}")
+    table = column.table
+    keys = list(table.primary_key.columns)
+    if not keys:
+        raise ValueError(f"Table {table.name} has no primary key")
+    last: tuple[typing.Any, ...] | None = None if start_after is None else tuple(start_after)
+    if last is not None and len(last) != len(keys):
+        raise ValueError(f"Checkpoint {last!r} does not match primary key of {table.name}")
+
+    dialect = engine.dialect
+    target = field.dialect_impl(dialect)
+    convert = _converter(
+        (target if source is None else source.dialect_impl(dialect)).result_processor(dialect, None),
+        target.bind_processor(dialect),
+        target.result_processor(dialect, None),
+    )
+    # Stored values are selected and written as is: processors are applied explicitly
+    raw_column = sqlalchemy.type_coerce(column, NullType())
+    key_names = [f"jsonfield_key_{idx}" for idx in range(len(keys))]
+    select = (
+        sqlalchemy.select(*keys, raw_column.label("raw"))
+        .where(raw_column.is_not(None))
+        .order_by(*keys)
+        .limit(batch_size)
+    )
+    update = (
+        table.update()
+        .where(*(key == sqlalchemy.bindparam(name) for key, name in zip(keys, key_names)))
+        .values({column.key: sqlalchemy.type_coerce(sqlalchemy.bindparam("jsonfield_value"), NullType())})
+    )
+    key_expression: typing.Any = keys[0] if len(keys) == 1 else sqlalchemy.tuple_(*keys)
+
+    started = time.perf_counter()
+    batches = scanned = updated = 0
+    while True:
+        statement = select
+        if last is not None:
+            statement = statement.where(key_expression > (last[0] if len(keys) == 1 else sqlalchemy.tuple_(*last)))
+        with engine.begin() as connection:
+            rows = connection.execute(statement).all()
+            if not rows:
+                return updated
+            stored = [row[-1] for row in rows]
+            if executor is None or len(stored) <= chunk_size:
+                encoded = convert(stored)
+            else:
+                encoded = [
+                    item
+                    for chunk in executor.map(
+                        convert, [stored[idx : idx + chunk_size] for idx in range(0, len(stored), chunk_size)]
+                    )
+                    for item in chunk
+                ]
+            changes = [
+                {**dict(zip(key_names, row[:-1])), "jsonfield_value": value}
+                for row, value in zip(rows, encoded)
+                if value is not None
+            ]
+            if changes:
+                connection.execute(update, changes)
+        batches += 1
+        scanned += len(rows)
+        updated += len(changes)
+        last = tuple(rows[-1][:-1])
+        if progress is not None:
+            progress(MigrationProgress(batches, scanned, updated, last, time.perf_counter() - started))
+        if len(rows) < batch_size:
+            return updated
+        if pause:
+            time.sleep(pause)
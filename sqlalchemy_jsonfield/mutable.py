@@ -0,0 +1,820 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Nested mutation tracking for JSON documents.
+
+Nested dicts and lists are wrapped lazily on access, changes are recorded as JSON paths on the document root.
+On flush, recorded paths are written with partial update functions for native JSON storage:
+`json_set`/`json_remove` (SQLite), `JSON_SET`/`JSON_REMOVE` (MySQL/MariaDB), `jsonb_set`/`#-` (PostgreSQL).
+Replaced documents and string storage are written completely.
+"""
+
+from __future__ import annotations
+
+import re
+import typing
+import weakref
+
+import sqlalchemy
+import sqlalchemy.event
+import sqlalchemy.ext.mutable
+import sqlalchemy.orm
+from sqlalchemy.dialects import postgresql
+
+from .frozen import PartialJSON
+from .lazy import LazyJSON
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.engine import Dialect
+    from sqlalchemy.orm import Mapper
+    from sqlalchemy.orm.attributes import InstrumentedAttribute
+    from sqlalchemy.sql.elements import ColumnElement
+    from typing_extensions import Self
+
+__all__ = ("LazyMutable", "MutableJSONDict", "NestedMutable", "NestedMutableDict", "NestedMutableList")
+
+JSONPath = tuple[typing.Union[str, int], ...]
+
+_MISSING = object()
+
+# Keys usable in SQLite JSON path: printable ASCII except double quote
+_SQLITE_KEY = re.compile(r"[ !#-~]*")
+
+# InstanceState.info key: attribute name -> (field, digest of the loaded document)
+_CANONICAL_SNAPSHOTS = "_jsonfield_canonical"
+
+
+class LazyMutable(LazyJSON):
+    """Lazy decoded value of mutable attribute.
+
+    Decoded value is coerced to the mutable type on first access and inherits parents of the proxy.
+    """
+
+    __slots__ = ("__key", "__mutable_type", "_parents")
+
+    def __init__(
+        self,
+        raw: typing.Any,
+        decoder: typing.Callable[[typing.Any], typing.Any],
+        mutable_type: type[sqlalchemy.ext.mutable.Mutable],
+        key: str,
+    ) -> None:
+        """Lazy decoded value of mutable attribute.
+
+        :param raw: stored value
+        :type raw: typing.Any
+        :param decoder: decoding function
+        :type decoder: typing.Callable[[typing.Any], typing.Any]
+        :param mutable_type: mutable type for decoded value coercion
+        :type mutable_type: type[sqlalchemy.ext.mutable.Mutable]
+        :param key: attribute name
+        :type key: str
+        """
+        super().__init__(raw, decoder)
+        self.__mutable_type = mutable_type
+        self.__key = key
+        self._parents: weakref.WeakKeyDictionary[typing.Any, str] = weakref.WeakKeyDictionary()
+
+    def _load(self, raw: typing.Any) -> typing.Any:
+        """Decode stored value and coerce it to the mutable type.
+
+        :param raw: stored value
+        :type raw: typing.Any
+        :return: mutable value
+        :rtype: typing.Any
+        """
+        value = self.__mutable_type.coerce(self.__key, super()._load(raw))
+        if value is not None:
+            value._parents.update(self._parents)
+        return value
+
+
+def _coerce_lazy(mutable_type: type[sqlalchemy.ext.mutable.Mutable], key: str, value: LazyJSON) -> typing.Any:
+    """Keep loaded value lazy: decoding is postponed until the first access.
+
+    :param mutable_type: mutable type for decoded value coercion
+    :type mutable_type: type[sqlalchemy.ext.mutable.Mutable]
+    :param key: attribute name
+    :type key: str
+    :param value: lazy value
+    :type value: LazyJSON
+    :return: lazy mutable value or coerced decoded value
+    :rtype: typing.Any
+    """
+    if value.is_decoded:
+        return mutable_type.coerce(key, value.value)
+    return LazyMutable(value.raw, value.decoder, mutable_type, key)
+
+
+class MutableJSONDict(sqlalchemy.ext.mutable.MutableDict[str, typing.Any]):
+    """MutableDict accepting lazy decoded values."""
+
+    _json_version: int = 0  # incremented by each change event
+
+    @classmethod
+    def coerce(cls, key: str, value: typing.Any) -> typing.Any:
+        """Convert plain dicts to MutableJSONDict, lazy values are kept lazy.
+
+        :param key: attribute name
+        :type key: str
+        :param value: incoming value
+        :type value: typing.Any
+        :return: mutable dict or lazy mutable value
+        :rtype: typing.Any
+        """
+        if isinstance(value, LazyJSON):
+            return _coerce_lazy(cls, key, value)
+        if isinstance(value, PartialJSON):  # Read-only projection is not tracked
+            return value
+        return super().coerce(key, value)
+
+    def changed(self) -> None:
+        """Increment version and emit change event."""
+        self._json_version += 1
+        super().changed()
+
+    @classmethod
+    def associate_with_attribute(cls, attribute: InstrumentedAttribute[typing.Any]) -> None:
+        """Establish this type as a mutation listener for the mapped attribute.
+
+        :param attribute: mapped attribute
+        :type attribute: InstrumentedAttribute[typing.Any]
+        """
+        super().associate_with_attribute(attribute)
+        _listen_canonical(attribute)
+
+
+class NestedMutable(sqlalchemy.ext.mutable.Mutable):
+    """Base class for nested mutable JSON containers.
+
+    Use `NestedMutable.as_mutable(JSONField(...))` or `mutable_json_field(track_nested=True)`.
+    """
+
+    _json_parent: NestedMutable | None = None
+    _json_key: typing.Any = None
+    _json_dirty: set[JSONPath] | None = None  # document root only
+    _json_replaced: bool = False  # document root only
+    _json_version: int = 0  # document root only: incremented by each change event
+
+    @classmethod
+    def coerce(cls, key: str, value: typing.Any) -> NestedMutable | LazyMutable | PartialJSON | None:
+        """Convert plain dicts and lists to nested mutable containers, lazy values are kept lazy.
+
+        :param key: attribute name
+        :type key: str
+        :param value: incoming value
+        :type value: typing.Any
+        :return: nested mutable container, lazy mutable value or read-only projection
+        :rtype: NestedMutable | LazyMutable | PartialJSON | None
+        """
+        if isinstance(value, LazyJSON):
+            return _coerce_lazy(cls, key, value)  # type: ignore[no-any-return]
+        if isinstance(value, PartialJSON):  # Read-only projection is not tracked
+            return value
+        if isinstance(value, NestedMutable):
+            if value._json_parent is not None:
+                return _wrap(_unwrap(value))
+            return value
+        if isinstance(value, dict):
+            return NestedMutableDict(value)
+        if isinstance(value, list):
+            return NestedMutableList(value)
+        return super().coerce(key, value)  # raises ValueError
+
+    @property
+    def _json_root(self) -> NestedMutable:
+        """Document root container.
+
+        :return: root container
+        :rtype: NestedMutable
+        """
+        node = self
+        while node._json_parent is not None:
+            node = node._json_parent
+        return node
+
+    def _json_path(self) -> JSONPath | None:
+        """Path of the container inside the document.
+
+        :return: path from the document root or None if container was detached
+        :rtype: JSONPath | None
+        """
+        path: list[str | int] = []
+        node: NestedMutable = self
+        while node._json_parent is not None:
+            parent = node._json_parent
+            if isinstance(parent, dict):
+                if dict.get(parent, node._json_key, _MISSING) is not node:
+                    return None
+                path.append(node._json_key)
+            else:
+                for index, item in enumerate(typing.cast("list[typing.Any]", parent)):
+                    if item is node:
+                        path.append(index)
+                        break
+                else:
+                    return None
+            node = parent
+        path.reverse()
+        return tuple(path)
+
+    def _json_changed(self, *key: str | int) -> None:
+        """Record changed path and emit change event.
+
+        :param key: changed key inside the container. Without key: container itself is changed.
+        :type key: str | int
+        """
+        path = self._json_path()
+        if path is None:  # Detached from the document
+            return
+        root = self._json_root
+        if root._json_dirty is None:
+            root._json_dirty = set()
+        root._json_dirty.add(path + key)
+        root.changed()
+
+    def _json_adopt(self, key: typing.Any, value: typing.Any) -> typing.Any:
+        """Prepare incoming value for storage in the container.
+
+        Containers attached to another document or place are copied to plain structures.
+
+        :param key: key in the container
+        :type key: typing.Any
+        :param value: incoming value
+        :type value: typing.Any
+        :return: value for storage
+        :rtype: typing.Any
+        """
+        if isinstance(value, NestedMutable):
+            if value._json_parent is not None or value._parents:
+                return _unwrap(value)
+            value._json_parent = self
+            value._json_key = key
+        return value
+
+    def _json_child(self, key: typing.Any, value: typing.Any) -> typing.Any:
+        """Wrap plain nested container on access.
+
+        :param key: key in the container
+        :type key: typing.Any
+        :param value: stored value
+        :type value: typing.Any
+        :return: value for the caller
+        :rtype: typing.Any
+        """
+        value_type = type(value)
+        if value_type is dict or value_type is list:
+            value = _wrap(value)
+            value._json_parent = self
+            value._json_key = key
+        return value
+
+    def changed(self) -> None:
+        """Emit change event for the document root."""
+        if self._json_parent is None:
+            self._json_version += 1
+            super().changed()
+        else:
+            self._json_root.changed()
+
+    @classmethod
+    def associate_with_attribute(cls, attribute: InstrumentedAttribute[typing.Any]) -> None:
+        """Establish this type as a mutation listener and partial update writer for the mapped attribute.
+
+        :param attribute: mapped attribute
+        :type attribute: InstrumentedAttribute[typing.Any]
+        """
+        super().associate_with_attribute(attribute)
+        _listen_partial_update(attribute)
+        _listen_canonical(attribute)
+
+
+class NestedMutableDict(NestedMutable, dict[str, typing.Any]):
+    """Dict with nested mutation tracking."""
+
+    def __getitem__(self, key: str) -> typing.Any:
+        value = dict.__getitem__(self, key)
+        child = self._json_child(key, value)
+        if child is not value:
+            dict.__setitem__(self, key, child)
+        return child
+
+    def get(self, key: str, default: typing.Any = None) -> typing.Any:
+        """Get value with nested mutation tracking.
+
+        :return: stored value or default
+        :rtype: typing.Any
+        """
+        if key in self:
+            return self[key]
+        return default
+
+    def values(self) -> Iterator[typing.Any]:  # type: ignore[override]
+        """Iterate over values with nested mutation tracking.
+
+        :return: values iterator
+        :rtype: Iterator[typing.Any]
+        """
+        return (self[key] for key in list(self))
+
+    def items(self) -> Iterator[tuple[str, typing.Any]]:  # type: ignore[override]
+        """Iterate over items with nested mutation tracking.
+
+        :return: items iterator
+        :rtype: Iterator[tuple[str, typing.Any]]
+        """
+        return ((key, self[key]) for key in list(self))
+
+    def __setitem__(self, key: str, value: typing.Any) -> None:
+        dict.__setitem__(self, key, self._json_adopt(key, value))
+        self._json_changed(key)
+
+    def __delitem__(self, key: str) -> None:
+        dict.__delitem__(self, key)
+        self._json_changed(key)
+
+    def setdefault(self, key: str, default: typing.Any = None) -> typing.Any:
+        """Insert key with a value of default if key is not in the dictionary.
+
+        :return: value for key
+        :rtype: typing.Any
+        """
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        """Update dict with change tracking for each key."""
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other: typing.Any) -> Self:  # type: ignore[override,misc]
+        self.update(other)
+        return self
+
+    def pop(self, key: str, *default: typing.Any) -> typing.Any:
+        """Remove key and return the value.
+
+        :return: removed value or default
+        :rtype: typing.Any
+        """
+        if key not in self:
+            return dict.pop(self, key, *default)
+        value = _detach(dict.pop(self, key))
+        self._json_changed(key)
+        return value
+
+    def popitem(self) -> tuple[str, typing.Any]:
+        """Remove and return last inserted item.
+
+        :return: removed item
+        :rtype: tuple[str, typing.Any]
+        """
+        key, value = dict.popitem(self)
+        self._json_changed(key)
+        return key, _detach(value)
+
+    def clear(self) -> None:
+        """Remove all items."""
+        dict.clear(self)
+        self._json_changed()
+
+    def __getstate__(self) -> dict[str, typing.Any]:
+        return _unwrap(self)  # type: ignore[no-any-return]
+
+    def __setstate__(self, state: dict[str, typing.Any]) -> None:
+        dict.update(self, state)
+
+
+class NestedMutableList(NestedMutable, list[typing.Any]):
+    """List with nested mutation tracking.
+
+    Structural changes (insert, remove, sort) record the whole list as changed.
+    """
+
+    def __getitem__(self, index: typing.SupportsIndex | slice) -> typing.Any:
+        value = list.__getitem__(self, index)
+        if isinstance(index, slice):
+            return value
+        child = self._json_child(None, value)
+        if child is not value:
+            list.__setitem__(self, index, child)
+        return child
+
+    def __iter__(self) -> Iterator[typing.Any]:
+        return (self[index] for index in range(len(self)))
+
+    def __setitem__(self, index: typing.SupportsIndex | slice, value: typing.Any) -> None:
+        if isinstance(index, slice):
+            list.__setitem__(self, index, [self._json_adopt(None, item) for item in value])
+            self._json_changed()
+            return
+        position = range(len(self))[index]  # normalize and check
+        list.__setitem__(self, position, self._json_adopt(None, value))
+        self._json_changed(position)
+
+    def __delitem__(self, index: typing.SupportsIndex | slice) -> None:
+        list.__delitem__(self, index)
+        self._json_changed()
+
+    def append(self, value: typing.Any) -> None:
+        """Append value to the end of the list."""
+        list.append(self, self._json_adopt(None, value))
+        self._json_changed()
+
+    def extend(self, values: Iterable[typing.Any]) -> None:
+        """Extend list by appending values."""
+        list.extend(self, (self._json_adopt(None, value) for value in values))
+        self._json_changed()
+
+    def __iadd__(self, values: Iterable[typing.Any]) -> Self:  # type: ignore[misc]
+        self.extend(values)
+        return self
+
+    def __imul__(self, count: typing.SupportsIndex) -> Self:
+        list.__setitem__(self, slice(None), _unwrap(self) * count)
+        self._json_changed()
+        return self
+
+    def insert(self, index: typing.SupportsIndex, value: typing.Any) -> None:
+        """Insert value before index."""
+        list.insert(self, index, self._json_adopt(None, value))
+        self._json_changed()
+
+    def pop(self, index: typing.SupportsIndex = -1) -> typing.Any:
+        """Remove and return item at index.
+
+        :return: removed value
+        :rtype: typing.Any
+        """
+        value = _detach(list.pop(self, index))
+        self._json_changed()
+        return value
+
+    def remove(self, value: typing.Any) -> None:
+        """Remove first occurrence of value."""
+        list.remove(self, value)
+        self._json_changed()
+
+    def clear(self) -> None:
+        """Remove all items."""
+        list.clear(self)
+        self._json_changed()
+
+    def sort(self, **kwargs: typing.Any) -> None:
+        """Sort the list in place."""
+        list.sort(self, **kwargs)
+        self._json_changed()
+
+    def reverse(self) -> None:
+        """Reverse the list in place."""
+        list.reverse(self)
+        self._json_changed()
+
+    def __getstate__(self) -> list[typing.Any]:
+        return _unwrap(self)  # type: ignore[no-any-return]
+
+    def __setstate__(self, state: list[typing.Any]) -> None:
+        list.extend(self, state)
+
+
+def _wrap(value: dict[str, typing.Any] | list[typing.Any]) -> NestedMutable:
+    """Wrap plain container.
+
+    :param value: plain container
+    :type value: dict[str, typing.Any] | list[typing.Any]
+    :return: nested mutable container
+    :rtype: NestedMutable
+    """
+    if isinstance(value, dict):
+        return NestedMutableDict(value)
+    return NestedMutableList(value)
+
+
+def _unwrap(value: typing.Any) -> typing.Any:
+    """Convert nested mutable containers to plain structures (deep copy of containers).
+
+    :param value: value to convert
+    :type value: typing.Any
+    :return: plain structure
+    :rtype: typing.Any
+    """
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in dict.items(value)}
+    if isinstance(value, list):
+        return [_unwrap(item) for item in list.__iter__(value)]
+    return value
+
+
+def _detach(value: typing.Any) -> typing.Any:
+    """Detach removed container from the document.
+
+    :param value: removed value
+    :type value: typing.Any
+    :return: value without link to the document
+    :rtype: typing.Any
+    """
+    if isinstance(value, NestedMutable):
+        value._json_parent = None
+        value._json_key = None
+    return value
+
+
+def _resolve(document: typing.Any, path: JSONPath) -> typing.Any:
+    """Get value by path.
+
+    :param document: document root
+    :type document: typing.Any
+    :param path: path inside the document
+    :type path: JSONPath
+    :return: value or _MISSING marker
+    :rtype: typing.Any
+    """
+    value = document
+    for key in path:
+        if isinstance(value, dict) and isinstance(key, str):
+            value = dict.get(value, key, _MISSING)
+        elif isinstance(value, list) and isinstance(key, int) and key < list.__len__(value):
+            value = list.__getitem__(value, key)
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return value
+    return value
+
+
+def _normalize_paths(paths: Iterable[JSONPath]) -> list[JSONPath]:
+    """Remove paths covered by changed parent paths.
+
+    :param paths: recorded paths
+    :type paths: Iterable[JSONPath]
+    :return: paths to write
+    :rtype: list[JSONPath]
+    """
+    result: list[JSONPath] = []
+    for path in sorted(paths, key=lambda path: (len(path), repr(path))):  # Stable order: same SQL for same changes
+        if not any(path[: len(parent)] == parent for parent in result):
+            result.append(path)
+    return result
+
+
+def _text_path(path: JSONPath, dialect_name: str) -> str:
+    """Render JSON path for SQLite and MySQL functions.
+
+    SQLite has no escapes in the quoted path keys and compares them with the stored (escaped) key text,
+    so only printable ASCII keys without quotes are matched reliably.
+
+    :param path: path inside the document
+    :type path: JSONPath
+    :param dialect_name: database dialect name
+    :type dialect_name: str
+    :return: JSON path expression
+    :rtype: str
+    :raises ValueError: key can not be expressed in the dialect path syntax
+    """
+    parts = ["$"]
+    for key in path:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+            continue
+        if dialect_name == "sqlite" and _SQLITE_KEY.fullmatch(key) is None:
+            raise ValueError(f"JSON key {key!r} can not be expressed in SQLite JSON path")
+        escaped = key.replace("\\", "\\\\")
+        if dialect_name != "sqlite":
+            escaped = escaped.replace('"', '\\"')
+        parts.append(f'."{escaped}"')
+    return "".join(parts)
+
+
+def partial_update_expression(
+    column: ColumnElement[typing.Any],
+    document: typing.Any,
+    paths: Iterable[JSONPath],
+    dialect: Dialect,
+) -> ColumnElement[typing.Any] | None:
+    """Build SQL expression updating only changed paths of the JSON document.
+
+    :param column: JSON column
+    :type column: ColumnElement[typing.Any]
+    :param document: current document
+    :type document: typing.Any
+    :param paths: changed paths
+    :type paths: Iterable[JSONPath]
+    :param dialect: database dialect
+    :type dialect: Dialect
+    :return: SQL expression or None if partial update is not possible
+    :rtype: ColumnElement[typing.Any] | None
+    """
+    normalized = _normalize_paths(paths)
+    if not normalized or () in normalized:
+        return None
+    if getattr(column.type, "canonical", False) and any(
+        isinstance(key, str) and not key.isascii() for path in normalized for key in path
+    ):
+        return None  # Stored keys are NFC normalized: path may not match the stored key
+
+    changes = [(path, _resolve(document, path)) for path in normalized]
+    updated = [(path, value) for path, value in changes if value is not _MISSING]
+    removed = [path for path, value in changes if value is _MISSING]
+
+    def bind(value: typing.Any, type_: typing.Any) -> ColumnElement[typing.Any]:
+        return sqlalchemy.bindparam(None, _unwrap(value), type_=type_, unique=True)
+
+    document_type = column.type  # Changed values are encoded by the column codec
+
+    expression: ColumnElement[typing.Any] = column
+    if dialect.name in {"sqlite", "mysql", "mariadb"}:
+        if dialect.name == "sqlite":
+            func_set, func_remove = sqlalchemy.func.json_set, sqlalchemy.func.json_remove
+
+            def json_value(value: typing.Any) -> ColumnElement[typing.Any]:
+                return sqlalchemy.func.json(bind(value, document_type))
+
+        else:
+            func_set, func_remove = sqlalchemy.func.JSON_SET, sqlalchemy.func.JSON_REMOVE
+
+            def json_value(value: typing.Any) -> ColumnElement[typing.Any]:
+                return sqlalchemy.func.JSON_EXTRACT(bind(value, document_type), "$")
+
+        try:
+            arguments: list[typing.Any] = []
+            for path, value in updated:
+                arguments.extend((_text_path(path, dialect.name), json_value(value)))
+            removed_paths = [_text_path(path, dialect.name) for path in removed]
+        except ValueError:  # Key is not addressable by path: document is written whole
+            return None
+        if arguments:
+            expression = func_set(expression, *arguments)
+        if removed:
+            expression = func_remove(expression, *removed_paths)
+        return expression
+
+    if dialect.name == "postgresql":
+        path_type = postgresql.ARRAY(sqlalchemy.Text)
+        expression = sqlalchemy.cast(column, postgresql.JSONB)
+        for path, value in updated:
+            expression = sqlalchemy.func.jsonb_set(
+                expression,
+                bind([str(key) for key in path], path_type),
+                sqlalchemy.cast(bind(value, document_type), postgresql.JSONB),
+            )
+        for path in removed:
+            expression = expression.op("#-")(bind([str(key) for key in path], path_type))
+        impl = column.type.dialect_impl(dialect)
+        if not isinstance(getattr(impl, "impl_instance", impl), postgresql.JSONB):
+            expression = sqlalchemy.cast(expression, postgresql.JSON)
+        return expression
+
+    return None
+
+
+def _listen_partial_update(attribute: InstrumentedAttribute[typing.Any]) -> None:
+    """Establish partial update listeners for the mapped attribute.
+
+    :param attribute: mapped attribute
+    :type attribute: InstrumentedAttribute[typing.Any]
+    """
+    key = attribute.key
+    parent_cls = attribute.class_
+    column = attribute.property.columns[0]
+
+    def set_(
+        target: sqlalchemy.orm.InstanceState[typing.Any],
+        value: typing.Any,
+        oldvalue: typing.Any,
+        initiator: typing.Any,
+    ) -> typing.Any:
+        """Mark assigned document for full rewrite.
+
+        :return: assigned value
+        :rtype: typing.Any
+        """
+        if isinstance(value, LazyJSON) and value is not oldvalue:  # Assigned document is written as a whole
+            value = value.value
+        if isinstance(value, NestedMutable) and value is not oldvalue:
+            if value._json_parent is not None:  # Part of another document
+                value = _wrap(_unwrap(value))
+                value._parents[target] = key
+            value._json_replaced = True
+        return value
+
+    def before_update(mapper: Mapper[typing.Any], connection: Connection, target: typing.Any) -> None:
+        """Replace document by partial update expression, if possible."""
+        state = sqlalchemy.inspect(target)
+        stored = document = state.dict.get(key)
+        if isinstance(document, LazyJSON):
+            if not document.is_decoded:  # Not accessed, so not changed
+                return
+            document = document.value
+        if not isinstance(document, NestedMutable) or document._json_replaced or not document._json_dirty:
+            return
+        use_native_json = getattr(column.type, "use_native_json", None)
+        if use_native_json is None or not use_native_json(connection.dialect):
+            return
+        expression = partial_update_expression(column, document, document._json_dirty, connection.dialect)
+        if expression is None:
+            return
+        state.info.setdefault("_jsonfield_partial", {})[key] = stored
+        state.dict[key] = expression  # Bypass attribute events: value is written by the flush as is
+
+    def after_flush(mapper: Mapper[typing.Any], connection: Connection, target: typing.Any) -> None:
+        """Restore document after partial update and reset change records."""
+        state = sqlalchemy.inspect(target)
+        document = state.info.get("_jsonfield_partial", {}).pop(key, None)
+        if document is not None:
+            sqlalchemy.orm.attributes.set_committed_value(target, key, document)
+        else:
+            document = state.dict.get(key)
+        if isinstance(document, LazyJSON) and document.is_decoded:
+            document = document.value
+        if isinstance(document, NestedMutable):
+            document._json_dirty = None
+            document._json_replaced = False
+
+    sqlalchemy.event.listen(attribute, "set", set_, raw=True, retval=True, propagate=True)
+    sqlalchemy.event.listen(parent_cls, "before_update", before_update, propagate=True)
+    sqlalchemy.event.listen(parent_cls, "after_update", after_flush, propagate=True)
+    sqlalchemy.event.listen(parent_cls, "after_insert", after_flush, propagate=True)
+
+
+def _skip_unchanged(session: sqlalchemy.orm.Session, flush_context: typing.Any, instances: typing.Any) -> None:
+    """Mark changed canonical documents as not modified if canonical form is equal to the loaded one.
+
+    :param session: flushed session
+    :type session: sqlalchemy.orm.Session
+    :param flush_context: unit of work
+    :type flush_context: typing.Any
+    :param instances: instances passed to flush
+    :type instances: typing.Any
+    """
+    for target in session.dirty:
+        state = sqlalchemy.inspect(target)
+        snapshots: dict[str, tuple[typing.Any, bytes]] | None = state.info.get(_CANONICAL_SNAPSHOTS)
+        if not snapshots:
+            continue
+        for key, (field, loaded) in tuple(snapshots.items()):
+            if key not in state.committed_state:
+                continue
+            document = state.dict.get(key)
+            if document is None:
+                continue
+            current = field.fingerprint(document)
+            if current != loaded:
+                snapshots[key] = (field, current)  # Written by this flush
+                continue
+            sqlalchemy.orm.attributes.set_committed_value(target, key, document)
+            if isinstance(document, LazyJSON) and document.is_decoded:
+                document = document.value
+            if isinstance(document, NestedMutable):
+                document._json_dirty = None
+                document._json_replaced = False
+
+
+def _listen_canonical(attribute: InstrumentedAttribute[typing.Any]) -> None:
+    """Record digests of loaded canonical documents to skip UPDATE of documents changed back.
+
+    :param attribute: mapped attribute
+    :type attribute: InstrumentedAttribute[typing.Any]
+    """
+    key = attribute.key
+    field = attribute.property.columns[0].type
+    if not getattr(field, "canonical", False):
+        return
+
+    def snapshot(target: sqlalchemy.orm.InstanceState[typing.Any]) -> None:
+        """Record digest of the loaded document."""
+        document = target.dict.get(key)
+        snapshots = target.info.setdefault(_CANONICAL_SNAPSHOTS, {})
+        if document is None or isinstance(document, PartialJSON):
+            snapshots.pop(key, None)
+        else:
+            snapshots[key] = (field, field.fingerprint(document))
+
+    def load(target: sqlalchemy.orm.InstanceState[typing.Any], context: typing.Any) -> None:
+        """Record digest of the loaded document."""
+        snapshot(target)
+
+    def refresh(target: sqlalchemy.orm.InstanceState[typing.Any], context: typing.Any, attrs: typing.Any) -> None:
+        """Record digest of the refreshed document."""
+        if attrs is None or key in attrs:
+            snapshot(target)
+
+    sqlalchemy.event.listen(attribute.class_, "load", load, raw=True, propagate=True)
+    sqlalchemy.event.listen(attribute.class_, "refresh", refresh, raw=True, propagate=True)
+    if not sqlalchemy.event.contains(sqlalchemy.orm.Session, "before_flush", _skip_unchanged):
+        sqlalchemy.event.listen(sqlalchemy.orm.Session, "before_flush", _skip_unchanged)
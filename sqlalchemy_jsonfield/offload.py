@@ -0,0 +1,156 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Offloading of large documents encoding/decoding from the asyncio event loop.
+
+SQLAlchemy asyncio extension runs statements and result processing in the greenlet on the event loop thread.
+Offloaded call suspends this greenlet until the executor completes the work, so other coroutines are running.
+Outside of asyncio context (sync engine) and for small documents functions are called inline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import typing
+
+from sqlalchemy.util.concurrency import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+
+from .lazy import LazyJSON
+
+try:
+    import greenlet
+except ImportError:
+    greenlet = None
+
+if typing.TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+__all__ = ("check_executor", "estimate_size", "offloaded", "payload_size")
+
+# Approximate encoded size of the scalar values and container syntax
+_SCALAR_SIZE = 8
+
+# Executors running work out of the process (interpreter): offloaded column functions are closures, not picklable
+_ISOLATED_EXECUTORS: tuple[type[Executor], ...] = tuple(
+    executor
+    for executor in (
+        concurrent.futures.ProcessPoolExecutor,
+        getattr(concurrent.futures, "InterpreterPoolExecutor", None),  # Python 3.14+
+    )
+    if executor is not None
+)
+
+
+def payload_size(value: typing.Any, limit: int) -> int:  # pylint: disable=unused-argument
+    """Stored payload size.
+
+    :param value: stored value
+    :type value: typing.Any
+    :param limit: size of interest (unused: size is known)
+    :type limit: int
+    :return: size in bytes (characters for text)
+    :rtype: int
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    return 0
+
+
+def estimate_size(value: typing.Any, limit: int) -> int:
+    """Estimate encoded size of the document.
+
+    Document is walked until the limit is reached, so the cost is bound by the limit, not by the document size.
+
+    :param value: document
+    :type value: typing.Any
+    :param limit: stop estimation when size reaches the limit
+    :type limit: int
+    :return: estimated size, values greater or equal limit mean "at least the limit"
+    :rtype: int
+    """
+    size = 0
+    stack = [value]
+    while stack and size < limit:
+        item = stack.pop()
+        if isinstance(item, str):
+            size += len(item) + 2
+        elif isinstance(item, dict):
+            size += _SCALAR_SIZE
+            for key, nested in item.items():
+                size += len(key) + 3 if isinstance(key, str) else _SCALAR_SIZE
+                stack.append(nested)
+        elif isinstance(item, (list, tuple)):
+            size += _SCALAR_SIZE
+            stack.extend(item)
+        elif isinstance(item, LazyJSON):
+            size += payload_size(item.raw, limit)
+        else:
+            size += _SCALAR_SIZE
+    return size
+
+
+def check_executor(executor: Executor | None) -> None:
+    """Check that executor runs offloaded work in the threads of the current interpreter.
+
+    Encoding and decoding functions are closures over the column configuration, they can not be pickled.
+
+    :param executor: executor for offloaded work
+    :type executor: concurrent.futures.Executor | None
+    :raises TypeError: process or interpreter pool executor
+    """
+    if isinstance(executor, _ISOLATED_EXECUTORS):
+        raise TypeError(
+            f"{executor.__class__.__name__} can not run offloaded encoding/decoding: thread executor is required"
+        )
+
+
+def _in_async_context() -> bool:
+    """Current code is running in the greenlet of SQLAlchemy asyncio extension.
+
+    :return: awaiting is possible
+    :rtype: bool
+    """
+    return greenlet is not None and in_greenlet()
+
+
+def offloaded(
+    func: typing.Callable[[typing.Any], typing.Any],
+    threshold: int,
+    executor: Executor | None = None,
+    measure: typing.Callable[[typing.Any, int], int] = payload_size,
+) -> typing.Callable[[typing.Any], typing.Any]:
+    """Make function running in the executor for large values if called in asyncio context.
+
+    :param func: encoding or decoding function
+    :type func: typing.Callable[[typing.Any], typing.Any]
+    :param threshold: minimal value size for offloading
+    :type threshold: int
+    :param executor: thread executor, event loop default executor (thread pool) if not set
+    :type executor: concurrent.futures.Executor | None
+    :param measure: value size function: payload_size for stored values, estimate_size for documents
+    :type measure: typing.Callable[[typing.Any, int], int]
+    :return: wrapped function
+    :rtype: typing.Callable[[typing.Any], typing.Any]
+    """
+
+    def call(value: typing.Any) -> typing.Any:
+        if not _in_async_context() or measure(value, threshold) < threshold:
+            return func(value)
+        return await_only(asyncio.get_running_loop().run_in_executor(executor, func, value))
+
+    return call
@@ -0,0 +1,257 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Server-side projection of JSONField documents: only selected paths are transferred and decoded.
+
+Partial document is built by the database:
+
+* SQLite: `json_object` over `json_extract`
+* MySQL/MariaDB: `JSON_OBJECT` over `JSON_EXTRACT`
+* PostgreSQL: `jsonb_build_object` over `#>` on value cast to JSONB
+
+Fetched values are read-only `PartialJSON` mappings: encoders reject them, so partial documents can not be
+written over full ones.
+"""
+
+from __future__ import annotations
+
+import typing
+
+import sqlalchemy
+import sqlalchemy.orm
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from .frozen import PartialJSON
+from .query import _check_storage
+from .query import _json_path
+from .query import _JSONPathBase
+from .query import _pg_document
+from .query import _pg_path
+
+if typing.TYPE_CHECKING:
+    from sqlalchemy.engine import Dialect
+    from sqlalchemy.orm.strategy_options import _AbstractLoad
+    from sqlalchemy.sql.compiler import SQLCompiler
+    from sqlalchemy.sql.elements import ColumnElement
+
+__all__ = ("JSONProjection", "json_projection", "load_json_paths")
+
+ProjectedPath = tuple[str, ...]
+# Key -> nested tree or None for the selected path
+_Tree = dict[str, typing.Any]
+
+
+def _normalize_path(path: str | tuple[str, ...]) -> ProjectedPath:
+    """Convert dotted path to the keys tuple.
+
+    :param path: dotted path ("meta.owner") or keys tuple (keys with dots)
+    :type path: str | tuple[str, ...]
+    :return: keys tuple
+    :rtype: tuple[str, ...]
+    :raises ValueError: path is empty or contains not string keys
+    """
+    keys = tuple(path.split(".")) if isinstance(path, str) else tuple(path)
+    if not keys or not all(isinstance(key, str) and key for key in keys):
+        raise ValueError(f"Projected path should consist of non-empty object keys, got {path!r}")
+    return keys
+
+
+def _tree(paths: tuple[ProjectedPath, ...]) -> _Tree:
+    """Build tree of the partial document.
+
+    :param paths: selected paths, none of them is inside another one
+    :type paths: tuple[tuple[str, ...], ...]
+    :return: nested keys tree, selected paths are leaves with None value
+    :rtype: dict[str, typing.Any]
+    """
+    tree: _Tree = {}
+    for path in paths:
+        node = tree
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = None
+    return tree
+
+
+class _PartialType(sqlalchemy.types.TypeDecorator):  # type: ignore[type-arg]  # pylint: disable=abstract-method
+    """Result type of the projection: decoded JSON object wrapped to PartialJSON."""
+
+    impl = sqlalchemy.JSON
+    cache_ok = True
+
+    def __init__(self, paths: tuple[ProjectedPath, ...]) -> None:
+        """Result type of the projection.
+
+        :param paths: selected paths
+        :type paths: tuple[tuple[str, ...], ...]
+        """
+        super().__init__()
+        self.paths = paths
+
+    def process_result_value(self, value: typing.Any, dialect: Dialect) -> PartialJSON | None:
+        """Wrap partial document.
+
+        :return: read-only partial document
+        :rtype: PartialJSON | None
+        """
+        if value is None:
+            return None
+        return PartialJSON(value, self.paths)
+
+
+class JSONProjection(_JSONPathBase):
+    """JSON object with the selected paths of the document."""
+
+    __visit_name__ = "jsonfield_projection"
+    inherit_cache = True
+
+    _traverse_internals = [  # noqa: RUF012
+        ("expr", InternalTraversal.dp_clauseelement),
+        ("paths", InternalTraversal.dp_plain_obj),
+    ]
+
+    def __init__(self, expr: ColumnElement[typing.Any], paths: tuple[ProjectedPath, ...]) -> None:
+        """JSON object with the selected paths of the document.
+
+        :param expr: JSON column expression
+        :type expr: ColumnElement[typing.Any]
+        :param paths: selected paths
+        :type paths: tuple[tuple[str, ...], ...]
+        """
+        self.expr = expr
+        self.paths = paths
+        self.type = _PartialType(paths)
+
+
+def json_projection(column: typing.Any, *paths: str | tuple[str, ...]) -> JSONProjection:
+    """Select only the paths of the document: `select(Model.id, json_projection(Model.json_record, "status"))`.
+
+    :param column: JSONField column or mapped attribute
+    :type column: typing.Any
+    :param paths: dotted paths ("meta.owner") or keys tuples
+    :type paths: str | tuple[str, ...]
+    :return: expression producing PartialJSON values
+    :rtype: JSONProjection
+    :raises ValueError: paths are not set or invalid
+    """
+    if not paths:
+        raise ValueError("At least one path should be selected")
+    selected = {_normalize_path(path) for path in paths}
+    # Paths inside other selected paths are covered by them
+    normalized = tuple(
+        sorted(path for path in selected if not any(path[:size] in selected for size in range(1, len(path))))
+    )
+    expr = column.__clause_element__() if hasattr(column, "__clause_element__") else column
+    return JSONProjection(expr, normalized)
+
+
+def load_json_paths(attribute: typing.Any, *paths: str | tuple[str, ...]) -> _AbstractLoad:
+    """Loader option: load only the paths of the document into the mapped attribute.
+
+    Usage: `select(Model).options(load_json_paths(Model.json_record, "meta.owner", "status"))`.
+    Attribute value is PartialJSON: flush of the assigned partial document fails on encoding.
+    Objects already present in the session keep loaded values unless `populate_existing` is used.
+
+    :param attribute: mapped attribute with JSONField type
+    :type attribute: typing.Any
+    :param paths: dotted paths ("meta.owner") or keys tuples
+    :type paths: str | tuple[str, ...]
+    :return: loader option
+    :rtype: sqlalchemy.orm.strategy_options._AbstractLoad
+    """
+    return sqlalchemy.orm.with_expression(attribute, json_projection(attribute, *paths))
+
+
+def _build(
+    tree: _Tree,
+    prefix: ProjectedPath,
+    make_object: typing.Callable[..., ColumnElement[typing.Any]],
+    extract: typing.Callable[[ProjectedPath], ColumnElement[typing.Any]],
+) -> ColumnElement[typing.Any]:
+    """Build nested object construction.
+
+    :param tree: keys tree
+    :type tree: dict[str, typing.Any]
+    :param prefix: path of the tree
+    :type prefix: tuple[str, ...]
+    :param make_object: dialect object constructor function
+    :type make_object: typing.Callable[..., ColumnElement[typing.Any]]
+    :param extract: dialect extraction of the JSON value by path
+    :type extract: typing.Callable[[tuple[str, ...]], ColumnElement[typing.Any]]
+    :return: object construction expression
+    :rtype: ColumnElement[typing.Any]
+    """
+    arguments: list[typing.Any] = []
+    for key, nested in tree.items():
+        path = (*prefix, key)
+        arguments.extend((key, extract(path) if nested is None else _build(nested, path, make_object, extract)))
+    return make_object(*arguments)
+
+
+@compiles(JSONProjection)
+def _compile_default(element: JSONProjection, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """Dialects without JSON functions.
+
+    :raises CompileError: not supported dialect
+    """
+    raise sqlalchemy.exc.CompileError(f"JSON projection is not supported for {compiler.dialect.name} dialect")
+
+
+@compiles(JSONProjection, "sqlite")
+def _compile_sqlite(element: JSONProjection, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """SQLite: json_extract returns SQL values for scalars, booleans are restored as JSON."""
+    _check_storage(element)
+
+    def extract(path: ProjectedPath) -> ColumnElement[typing.Any]:
+        text_path = _json_path(path, compiler.dialect.name)
+        return sqlalchemy.case(
+            (sqlalchemy.func.json_type(element.expr, text_path) == "true", sqlalchemy.func.json("true")),
+            (sqlalchemy.func.json_type(element.expr, text_path) == "false", sqlalchemy.func.json("false")),
+            else_=sqlalchemy.func.json_extract(element.expr, text_path),
+        )
+
+    return compiler.process(_build(_tree(element.paths), (), sqlalchemy.func.json_object, extract), **kw)
+
+
+@compiles(JSONProjection, "mysql")
+@compiles(JSONProjection, "mariadb")
+def _compile_mysql(element: JSONProjection, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """MySQL/MariaDB: JSON_EXTRACT returns JSON values."""
+    _check_storage(element)
+    return compiler.process(
+        _build(
+            _tree(element.paths),
+            (),
+            sqlalchemy.func.JSON_OBJECT,
+            lambda path: sqlalchemy.func.JSON_EXTRACT(element.expr, _json_path(path, compiler.dialect.name)),
+        ),
+        **kw,
+    )
+
+
+@compiles(JSONProjection, "postgresql")
+def _compile_postgresql(element: JSONProjection, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """PostgreSQL: text storage is cast to JSONB."""
+    _check_storage(element)
+    document = _pg_document(element)
+    return compiler.process(
+        _build(
+            _tree(element.paths),
+            (),
+            sqlalchemy.func.jsonb_build_object,
+            lambda path: document.op("#>")(_pg_path(path)),
+        ),
+        **kw,
+    )
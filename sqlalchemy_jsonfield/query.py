@@ -0,0 +1,589 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Server-side JSON path querying for JSONField columns.
+
+Expressions are compiled to the dialect JSON functions for native JSON and text storage:
+
+* SQLite: `json_extract`, `json_type`, `json_each`
+* MySQL/MariaDB: `JSON_EXTRACT`, `JSON_UNQUOTE`, `JSON_CONTAINS`, `JSON_CONTAINS_PATH`
+* PostgreSQL: `#>`, `#>>`, `@>` and `?` operators on value cast to JSONB
+"""
+
+from __future__ import annotations
+
+import json
+import typing
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import elements
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from .mutable import JSONPath
+from .mutable import _text_path
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlalchemy.sql.compiler import SQLCompiler
+    from sqlalchemy.sql.elements import BindParameter
+    from sqlalchemy.sql.elements import ColumnElement
+
+__all__ = ("JSONContains", "JSONHasKey", "JSONPathElement", "generated_column_name")
+
+_AS_TYPES: dict[str, type[sqlalchemy.types.TypeEngine[typing.Any]]] = {
+    "json": sqlalchemy.JSON,
+    "string": sqlalchemy.UnicodeText,
+    "integer": sqlalchemy.Integer,
+    "float": sqlalchemy.Float,
+    "boolean": sqlalchemy.Boolean,
+}
+
+# Shape of the containment candidate: structure is a part of the statement cache key, scalars are bound parameters
+Shape = tuple[typing.Any, ...]
+
+
+class _JSONPathBase(elements.ColumnElement[typing.Any]):
+    """Base class for expressions on the JSON document of the column."""
+
+    expr: ColumnElement[typing.Any]
+    path: JSONPath
+
+    @property
+    def _from_objects(self) -> list[typing.Any]:
+        return self.expr._from_objects  # pylint: disable=protected-access
+
+
+class JSONPathElement(_JSONPathBase):
+    """Element of the JSON document extracted by path.
+
+    Usage::
+
+        Model.json_record["a"]["b"].as_string() == "value"
+        Model.json_record["a"].as_integer() > 1
+        Model.json_record["tags"].contains("tag")
+        Model.json_record["a"].has_key("b")
+
+    Not converted element is a JSON value.
+    """
+
+    __visit_name__ = "jsonfield_path"
+    inherit_cache = True
+
+    _traverse_internals = [  # noqa: RUF012
+        ("expr", InternalTraversal.dp_clauseelement),
+        ("path", InternalTraversal.dp_plain_obj),
+        ("as_type", InternalTraversal.dp_string),
+    ]
+
+    def __init__(self, expr: ColumnElement[typing.Any], path: JSONPath, as_type: str = "json") -> None:
+        """Element of the JSON document extracted by path.
+
+        :param expr: JSON column expression
+        :type expr: ColumnElement[typing.Any]
+        :param path: path inside the document
+        :type path: tuple[str | int, ...]
+        :param as_type: result conversion: "json", "string", "integer", "float" or "boolean"
+        :type as_type: str
+        """
+        self.expr = expr
+        self.path = path
+        self.as_type = as_type
+        self.type = _AS_TYPES[as_type]()
+
+    def __getitem__(self, key: str | int) -> JSONPathElement:
+        """Nested element.
+
+        :param key: object key or array index
+        :type key: str | int
+        :return: nested element
+        :rtype: JSONPathElement
+        :raises TypeError: element is already converted
+        """
+        if self.as_type != "json":
+            raise TypeError(f"Element converted to {self.as_type} has no nested elements")
+        return JSONPathElement(self.expr, (*self.path, key))
+
+    def as_json(self) -> JSONPathElement:
+        """Element as JSON value.
+
+        :return: JSON element
+        :rtype: JSONPathElement
+        """
+        return JSONPathElement(self.expr, self.path, "json")
+
+    def as_string(self) -> JSONPathElement:
+        """Element as string.
+
+        :return: string element
+        :rtype: JSONPathElement
+        """
+        return JSONPathElement(self.expr, self.path, "string")
+
+    def as_integer(self) -> JSONPathElement:
+        """Element as integer.
+
+        :return: integer element
+        :rtype: JSONPathElement
+        """
+        return JSONPathElement(self.expr, self.path, "integer")
+
+    def as_float(self) -> JSONPathElement:
+        """Element as float.
+
+        :return: float element
+        :rtype: JSONPathElement
+        """
+        return JSONPathElement(self.expr, self.path, "float")
+
+    def as_boolean(self) -> JSONPathElement:
+        """Element as boolean.
+
+        :return: boolean element
+        :rtype: JSONPathElement
+        """
+        return JSONPathElement(self.expr, self.path, "boolean")
+
+    def contains(self, other: typing.Any, **kwargs: typing.Any) -> JSONContains:
+        """Element contains JSON value.
+
+        :param other: JSON value
+        :type other: typing.Any
+        :param kwargs: not used, ColumnOperators compatibility
+        :type kwargs: typing.Any
+        :return: boolean expression
+        :rtype: JSONContains
+        """
+        return JSONContains(self.expr, self.path, other)
+
+    def has_key(self, key: str) -> JSONHasKey:
+        """Element is an object with the key.
+
+        :param key: object key
+        :type key: str
+        :return: boolean expression
+        :rtype: JSONHasKey
+        """
+        return JSONHasKey(self.expr, self.path, key)
+
+
+def _shape(value: typing.Any, leaves: list[typing.Any], top: bool = True) -> Shape:
+    """Split containment candidate into structure and bound scalar values.
+
+    :param value: candidate value
+    :type value: typing.Any
+    :param leaves: bound parameters collector
+    :type leaves: list[typing.Any]
+    :param top: value is not nested in the array
+    :type top: bool
+    :return: candidate structure
+    :rtype: tuple[typing.Any, ...]
+    """
+    if value is None:
+        return ("null",)
+    if not top and isinstance(value, (dict, list, tuple)):  # Containers inside arrays are compared as JSON text
+        leaves.append(sqlalchemy.bindparam(None, json.dumps(value, separators=(",", ":")), unique=True))
+        return ("text",)
+    if isinstance(value, dict):
+        return ("object", tuple((str(key), _shape(item, leaves)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return ("array", tuple(_shape(item, leaves, top=False) for item in value))
+    leaves.append(sqlalchemy.bindparam(None, value, unique=True))
+    return ("scalar",)
+
+
+class JSONContains(_JSONPathBase):
+    """JSON document element contains value.
+
+    SQLite has no containment function, so candidate is checked key by key:
+    arrays should contain every candidate element, nested objects and arrays inside arrays are matched exactly.
+    """
+
+    __visit_name__ = "jsonfield_contains"
+    inherit_cache = True
+    _is_implicitly_boolean = True
+
+    _traverse_internals = [  # noqa: RUF012
+        ("expr", InternalTraversal.dp_clauseelement),
+        ("path", InternalTraversal.dp_plain_obj),
+        ("shape", InternalTraversal.dp_plain_obj),
+        ("leaves", InternalTraversal.dp_clauseelement_list),
+        ("document", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, expr: ColumnElement[typing.Any], path: JSONPath, value: typing.Any) -> None:
+        """JSON document element contains value.
+
+        :param expr: JSON column expression
+        :type expr: ColumnElement[typing.Any]
+        :param path: path inside the document
+        :type path: tuple[str | int, ...]
+        :param value: JSON value
+        :type value: typing.Any
+        """
+        self.expr = expr
+        self.path = path
+        leaves: list[typing.Any] = []
+        self.shape = _shape(value, leaves)
+        self.leaves = leaves
+        self.document: BindParameter[str] = sqlalchemy.bindparam(None, json.dumps(value), unique=True)
+        self.type = sqlalchemy.Boolean()
+
+
+class JSONHasKey(_JSONPathBase):
+    """JSON document element is an object with the key."""
+
+    __visit_name__ = "jsonfield_has_key"
+    inherit_cache = True
+    _is_implicitly_boolean = True
+
+    _traverse_internals = [  # noqa: RUF012
+        ("expr", InternalTraversal.dp_clauseelement),
+        ("path", InternalTraversal.dp_plain_obj),
+        ("object_key", InternalTraversal.dp_string),
+    ]
+
+    def __init__(self, expr: ColumnElement[typing.Any], path: JSONPath, key: str) -> None:
+        """JSON document element is an object with the key.
+
+        :param expr: JSON column expression
+        :type expr: ColumnElement[typing.Any]
+        :param path: path inside the document
+        :type path: tuple[str | int, ...]
+        :param key: object key
+        :type key: str
+        """
+        self.expr = expr
+        self.path = path
+        self.object_key = key
+        self.type = sqlalchemy.Boolean()
+
+
+def generated_column_name(column_name: str, path: JSONPath) -> str:
+    """Name of the generated column for the indexed path.
+
+    :param column_name: JSONField column name
+    :type column_name: str
+    :param path: indexed path
+    :type path: tuple[str | int, ...]
+    :return: generated column name
+    :rtype: str
+    """
+    return "_".join((column_name, *(str(key) for key in path)))
+
+
+def _indexed(element: JSONPathElement, kw: dict[str, typing.Any]) -> typing.Any:
+    """Indexed path declaration matching the element.
+
+    :param element: path element
+    :type element: JSONPathElement
+    :param kw: compiler keyword arguments
+    :type kw: dict[str, typing.Any]
+    :return: indexed path declaration or None
+    :rtype: IndexedPath | None
+    """
+    if kw.get("jsonfield_unrouted"):
+        return None
+    indexed = getattr(element.expr.type, "indexed_paths", None)
+    if not indexed or not isinstance(element.expr, sqlalchemy.Column):
+        return None
+    declaration = indexed.get(element.path)
+    if declaration is None or declaration.as_type != element.as_type:
+        return None
+    return declaration
+
+
+def _generated_column(element: JSONPathElement, kw: dict[str, typing.Any]) -> ColumnElement[typing.Any] | None:
+    """Generated column of the indexed path for SQLite and MySQL/MariaDB.
+
+    :param element: path element
+    :type element: JSONPathElement
+    :param kw: compiler keyword arguments
+    :type kw: dict[str, typing.Any]
+    :return: generated column or None if path is not indexed
+    :rtype: ColumnElement[typing.Any] | None
+    """
+    declaration = _indexed(element, kw)
+    if declaration is None:
+        return None
+    column = typing.cast("sqlalchemy.Column[typing.Any]", element.expr)
+    return sqlalchemy.column(
+        generated_column_name(column.name, element.path),
+        declaration.type,
+        _selectable=column.table,
+    )
+
+
+def _check_storage(element: _JSONPathBase) -> None:
+    """Check that document is stored as JSON text.
+
+    :param element: JSON path expression
+    :type element: _JSONPathBase
+    :raises CompileError: document is stored in binary form or in the side table
+    """
+    field = element.expr.type
+    if getattr(field, "is_binary", False):
+        raise sqlalchemy.exc.CompileError("JSON path querying is not available for binary and compressed storage")
+    if getattr(field, "content_store", None) is not None or getattr(field, "chunk_store", None) is not None:
+        raise sqlalchemy.exc.CompileError(
+            "JSON path querying is not available for content store and chunk store: column keeps references"
+        )
+
+
+def _json_path(path: JSONPath, dialect_name: str) -> str:
+    """Render JSON path for SQLite and MySQL functions.
+
+    :param path: path inside the document
+    :type path: JSONPath
+    :param dialect_name: database dialect name
+    :type dialect_name: str
+    :return: JSON path expression
+    :rtype: str
+    :raises CompileError: key can not be expressed in the dialect path syntax
+    """
+    try:
+        return _text_path(path, dialect_name)
+    except ValueError as exc:
+        raise sqlalchemy.exc.CompileError(str(exc)) from exc
+
+
+def _pg_document(element: _JSONPathBase) -> ColumnElement[typing.Any]:
+    """PostgreSQL: document as JSONB.
+
+    :param element: JSON path expression
+    :type element: _JSONPathBase
+    :return: JSONB expression
+    :rtype: ColumnElement[typing.Any]
+    """
+    return sqlalchemy.cast(element.expr, postgresql.JSONB)
+
+
+def _pg_path(path: JSONPath, literal: bool = False) -> ColumnElement[typing.Any]:
+    """PostgreSQL: path as text array.
+
+    :param path: path inside the document
+    :type path: tuple[str | int, ...]
+    :param literal: render path in the statement, as expression index requires
+    :type literal: bool
+    :return: text array parameter
+    :rtype: ColumnElement[typing.Any]
+    """
+    return sqlalchemy.bindparam(
+        None,
+        [str(key) for key in path],
+        type_=postgresql.ARRAY(sqlalchemy.Text),
+        unique=True,
+        literal_execute=literal,
+    )
+
+
+@compiles(JSONPathElement)
+@compiles(JSONContains)
+@compiles(JSONHasKey)
+def _compile_default(element: _JSONPathBase, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """Dialects without JSON functions.
+
+    :raises CompileError: not supported dialect
+    """
+    raise sqlalchemy.exc.CompileError(f"JSON path querying is not supported for {compiler.dialect.name} dialect")
+
+
+@compiles(JSONPathElement, "sqlite")
+def _compile_path_sqlite(element: JSONPathElement, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """SQLite: json_extract returns SQL values for scalars."""
+    _check_storage(element)
+    generated = _generated_column(element, kw)
+    if generated is not None:
+        return compiler.process(generated, **kw)
+    extracted = sqlalchemy.func.json_extract(element.expr, _json_path(element.path, compiler.dialect.name))
+    expression: ColumnElement[typing.Any]
+    if element.as_type == "json":
+        expression = sqlalchemy.func.json_quote(extracted)
+    elif element.as_type == "integer":
+        expression = sqlalchemy.cast(extracted, sqlalchemy.Integer)
+    elif element.as_type == "float":
+        expression = sqlalchemy.cast(extracted, sqlalchemy.Float)
+    else:
+        expression = extracted
+    return compiler.process(expression, **kw)
+
+
+@compiles(JSONPathElement, "mysql")
+@compiles(JSONPathElement, "mariadb")
+def _compile_path_mysql(element: JSONPathElement, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """MySQL/MariaDB: JSON null is converted explicitly, as SQLAlchemy JSON type does."""
+    _check_storage(element)
+    generated = _generated_column(element, kw)
+    if generated is not None:
+        return compiler.process(generated, **kw)
+    path = _json_path(element.path, compiler.dialect.name)
+    extracted = compiler.process(sqlalchemy.func.JSON_EXTRACT(element.expr, path), **kw)
+    if element.as_type == "json":
+        return extracted
+    if element.as_type == "boolean":
+        return f"CASE {extracted} WHEN 'null' THEN NULL WHEN true THEN true ELSE false END"
+    if element.as_type == "integer":
+        converted = f"CAST({extracted} AS SIGNED INTEGER)"
+    elif element.as_type == "float":
+        converted = f"{extracted}+0.0000000000000000000000"  # FLOAT cast is not available until MySQL 8.0.17
+    else:
+        converted = f"JSON_UNQUOTE({extracted})"
+    return f"CASE {extracted} WHEN 'null' THEN NULL ELSE {converted} END"
+
+
+@compiles(JSONPathElement, "postgresql")
+def _compile_path_postgresql(element: JSONPathElement, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """PostgreSQL: text storage is cast to JSONB."""
+    _check_storage(element)
+    document = _pg_document(element)
+    path = _pg_path(element.path, literal=_indexed(element, kw) is not None)
+    if element.as_type == "json":
+        return compiler.process(document.op("#>")(path).self_group(), **kw)
+    extracted = document.op("#>>", return_type=sqlalchemy.Text)(path)
+    if element.as_type == "string":
+        return compiler.process(extracted.self_group(), **kw)
+    return compiler.process(sqlalchemy.cast(extracted, _AS_TYPES[element.as_type]), **kw)
+
+
+def _sqlite_contains(
+    expr: ColumnElement[typing.Any],
+    path: JSONPath,
+    shape: Shape,
+    leaves: Iterator[typing.Any],
+    top: bool = True,
+) -> ColumnElement[bool]:
+    """SQLite: build containment check from the candidate structure.
+
+    :param expr: JSON column expression
+    :type expr: ColumnElement[typing.Any]
+    :param path: path inside the document
+    :type path: tuple[str | int, ...]
+    :param shape: candidate structure
+    :type shape: tuple[typing.Any, ...]
+    :param leaves: bound scalar values
+    :type leaves: Iterator[typing.Any]
+    :param top: candidate is not an element of the candidate array
+    :type top: bool
+    :return: boolean expression
+    :rtype: ColumnElement[bool]
+    """
+    text_path = _json_path(path, "sqlite")
+    kind = shape[0]
+    json_type = sqlalchemy.func.json_type(expr, text_path)
+
+    if kind == "object":
+        return sqlalchemy.and_(
+            json_type == "object",
+            *(_sqlite_contains(expr, (*path, key), item, leaves) for key, item in shape[1]),
+        )
+    if kind == "array":
+        return sqlalchemy.and_(
+            json_type == "array",
+            *(_sqlite_contains(expr, path, item, leaves, top=False) for item in shape[1]),
+        )
+
+    each = sqlalchemy.func.json_each(expr, text_path).table_valued("value", "type")
+    if kind == "null":
+        match_value = each.c.type == "null"
+        match_direct = json_type == "null"
+    elif kind == "text":
+        value = sqlalchemy.func.json(next(leaves))
+        match_value = each.c.value == value
+        match_direct = sqlalchemy.func.json_quote(sqlalchemy.func.json_extract(expr, text_path)) == value
+    else:
+        value = next(leaves)
+        match_value = sqlalchemy.and_(each.c.type.not_in(("object", "array")), each.c.value == value)
+        match_direct = sqlalchemy.and_(
+            json_type.not_in(("object", "array")),
+            sqlalchemy.func.json_extract(expr, text_path) == value,
+        )
+
+    member = sqlalchemy.and_(
+        json_type == "array",
+        sqlalchemy.exists(sqlalchemy.select(sqlalchemy.literal_column("1")).select_from(each).where(match_value)),
+    )
+    if top:  # Scalar matches equal value or array element
+        return sqlalchemy.or_(match_direct, member)
+    return member
+
+
+@compiles(JSONContains, "sqlite")
+def _compile_contains_sqlite(element: JSONContains, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """SQLite: no containment function, candidate is checked by structure."""
+    _check_storage(element)
+    return compiler.process(
+        _sqlite_contains(element.expr, element.path, element.shape, iter(element.leaves)).self_group(),
+        **kw,
+    )
+
+
+@compiles(JSONContains, "mysql")
+@compiles(JSONContains, "mariadb")
+def _compile_contains_mysql(element: JSONContains, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """MySQL/MariaDB: JSON_CONTAINS."""
+    _check_storage(element)
+    return compiler.process(
+        sqlalchemy.func.JSON_CONTAINS(element.expr, element.document, _json_path(element.path, compiler.dialect.name)),
+        **kw,
+    )
+
+
+@compiles(JSONContains, "postgresql")
+def _compile_contains_postgresql(element: JSONContains, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """PostgreSQL: JSONB containment operator."""
+    _check_storage(element)
+    document = _pg_document(element)
+    if element.path:
+        document = document.op("#>")(_pg_path(element.path))
+    return compiler.process(document.op("@>")(sqlalchemy.cast(element.document, postgresql.JSONB)).self_group(), **kw)
+
+
+@compiles(JSONHasKey, "sqlite")
+def _compile_has_key_sqlite(element: JSONHasKey, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """SQLite: json_type returns NULL for missing path."""
+    _check_storage(element)
+    return compiler.process(
+        sqlalchemy.and_(
+            sqlalchemy.func.json_type(element.expr, _json_path(element.path, compiler.dialect.name)) == "object",
+            sqlalchemy.func.json_type(
+                element.expr, _json_path((*element.path, element.object_key), compiler.dialect.name)
+            ).is_not(None),
+        ).self_group(),
+        **kw,
+    )
+
+
+@compiles(JSONHasKey, "mysql")
+@compiles(JSONHasKey, "mariadb")
+def _compile_has_key_mysql(element: JSONHasKey, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """MySQL/MariaDB: JSON_CONTAINS_PATH."""
+    _check_storage(element)
+    return compiler.process(
+        sqlalchemy.func.JSON_CONTAINS_PATH(
+            element.expr, "one", _json_path((*element.path, element.object_key), compiler.dialect.name)
+        ),
+        **kw,
+    )
+
+
+@compiles(JSONHasKey, "postgresql")
+def _compile_has_key_postgresql(element: JSONHasKey, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    """PostgreSQL: JSONB key existence operator."""
+    _check_storage(element)
+    document = _pg_document(element)
+    if element.path:
+        document = document.op("#>")(_pg_path(element.path))
+    return compiler.process(document.op("?", return_type=sqlalchemy.Boolean)(element.object_key).self_group(), **kw)
@@ -0,0 +1,492 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Conversion of decoded JSON documents to dataclasses, msgspec Structs and TypedDicts.
+
+With msgspec installed documents are validated by msgspec: columns with stdlib json or msgspec codec are decoded
+by the typed msgspec decoder in one pass, values decoded by other codecs are converted by `msgspec.convert`.
+Otherwise converters are generated once per schema: nested dataclasses, lists, tuples, dicts and optional values
+are converted by the straight-line code without validation.
+"""
+
+from __future__ import annotations
+
+import collections.abc
+import dataclasses
+import functools
+import typing
+
+from .codec import MsgspecCodec
+from .codec import OrjsonCodec
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    from types import UnionType
+except ImportError:  # Python 3.9
+    UnionType = typing.Union  # type: ignore[assignment,misc]
+
+if typing.TYPE_CHECKING:
+    from .codec import BatchEncoder
+    from .codec import Decoder
+    from .codec import Encoder
+    from .codec import JSONCodec
+
+__all__ = ("Schema", "get_schema")
+
+Converter = typing.Callable[[typing.Any], typing.Any]
+
+_SEQUENCES = frozenset((list, collections.abc.Sequence, collections.abc.MutableSequence, collections.abc.Iterable))
+_MAPPINGS = frozenset((dict, collections.abc.Mapping, collections.abc.MutableMapping))
+
+
+def _kind(schema: typing.Any) -> str | None:
+    """Detect schema kind.
+
+    :param schema: schema type
+    :type schema: typing.Any
+    :return: "dataclass", "struct", "typeddict" or None for not supported types
+    :rtype: str | None
+    """
+    if not isinstance(schema, type):
+        return None
+    if dataclasses.is_dataclass(schema):
+        return "dataclass"
+    if msgspec is not None and issubclass(schema, msgspec.Struct):
+        return "struct"
+    if issubclass(schema, dict) and hasattr(schema, "__total__"):
+        return "typeddict"
+    return None
+
+
+def _type_hints(schema: type) -> dict[str, typing.Any]:
+    """Resolved type hints of the schema fields, fields with not resolvable hints are not converted.
+
+    :param schema: schema type
+    :type schema: type
+    :return: type hints
+    :rtype: dict[str, typing.Any]
+    """
+    try:
+        return typing.get_type_hints(schema)
+    except (NameError, TypeError):  # Forward references to local names, `X | None` strings on Python 3.9
+        pass
+
+    hints: dict[str, typing.Any] = {}
+    for base in reversed(schema.__mro__):
+        for name, annotation in vars(base).get("__annotations__", {}).items():
+            single = type(base.__name__, (), {"__annotations__": {name: annotation}, "__module__": base.__module__})
+            try:
+                hints[name] = typing.get_type_hints(single, localns=dict(vars(base)))[name]
+            except (NameError, TypeError):
+                hints.pop(name, None)
+    return hints
+
+
+def _nested(schema: type, method: str) -> Converter:
+    """Converter of the nested schema, resolved on first call: recursive schemas are allowed.
+
+    :param schema: nested schema type
+    :type schema: type
+    :param method: Schema conversion method name
+    :type method: str
+    :return: converter
+    :rtype: Converter
+    """
+    resolved: Converter | None = None
+
+    def convert_nested(value: typing.Any) -> typing.Any:
+        nonlocal resolved
+        if resolved is None:
+            resolved = getattr(get_schema(schema), method)
+        return resolved(value)
+
+    return convert_nested
+
+
+def _identity(value: typing.Any) -> typing.Any:
+    """Value as is.
+
+    :param value: value
+    :type value: typing.Any
+    :return: the same value
+    :rtype: typing.Any
+    """
+    return value
+
+
+def _optional(convert: Converter) -> Converter:
+    """Converter of optional value.
+
+    :param convert: value converter
+    :type convert: Converter
+    :return: converter passing None as is
+    :rtype: Converter
+    """
+    return lambda value: None if value is None else convert(value)
+
+
+def _each_item(convert: Converter, container: Converter = list) -> Converter:
+    """Converter of array items.
+
+    :param convert: item converter
+    :type convert: Converter
+    :param container: result container type
+    :type container: Converter
+    :return: converter
+    :rtype: Converter
+    """
+    return lambda value: container([convert(item) for item in value])
+
+
+def _each_value(convert: Converter) -> Converter:
+    """Converter of object values.
+
+    :param convert: value converter
+    :type convert: Converter
+    :return: converter
+    :rtype: Converter
+    """
+    return lambda value: {key: convert(item) for key, item in value.items()}
+
+
+def _from_builtins_converter(hint: typing.Any) -> Converter | None:
+    """Converter from the decoded JSON value to the annotated type.
+
+    :param hint: type hint
+    :type hint: typing.Any
+    :return: converter or None if conversion is not required
+    :rtype: Converter | None
+    """
+    if _kind(hint) is not None:
+        return _nested(hint, "from_builtins")
+
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+    if origin in {typing.Union, UnionType}:
+        options = [arg for arg in args if arg is not type(None)]
+        convert = _from_builtins_converter(options[0]) if len(options) == 1 else None
+        return None if convert is None else _optional(convert)
+    if origin in _SEQUENCES and args:
+        convert = _from_builtins_converter(args[0])
+        return None if convert is None else _each_item(convert)
+    if origin is tuple:  # JSON arrays are decoded to lists
+        if len(args) == 2 and args[1] is Ellipsis:
+            convert = _from_builtins_converter(args[0])
+            return tuple if convert is None else _each_item(convert, tuple)
+        converters = [_from_builtins_converter(arg) or _identity for arg in args]
+        return lambda value: tuple([convert(item) for convert, item in zip(converters, value)])
+    if origin in _MAPPINGS and len(args) == 2:
+        convert = _from_builtins_converter(args[1])
+        return None if convert is None else _each_value(convert)
+    return None
+
+
+def _to_builtins_converter(hint: typing.Any) -> Converter | None:
+    """Converter from the annotated type to the value accepted by JSON encoders.
+
+    :param hint: type hint
+    :type hint: typing.Any
+    :return: converter or None if conversion is not required
+    :rtype: Converter | None
+    """
+    if _kind(hint) is not None:
+        return _nested(hint, "to_builtins")
+
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+    if origin in {typing.Union, UnionType}:
+        options = [arg for arg in args if arg is not type(None)]
+        convert = _to_builtins_converter(options[0]) if len(options) == 1 else None
+        return None if convert is None else _optional(convert)
+    if origin is tuple and not (len(args) == 2 and args[1] is Ellipsis):
+        converters = [_to_builtins_converter(arg) or _identity for arg in args]
+        return lambda value: [convert(item) for convert, item in zip(converters, value)]
+    if (origin in _SEQUENCES or origin is tuple) and args:
+        convert = _to_builtins_converter(args[0])
+        return None if convert is None else _each_item(convert)
+    if origin in _MAPPINGS and len(args) == 2:
+        convert = _to_builtins_converter(args[1])
+        return None if convert is None else _each_value(convert)
+    return None
+
+
+def _compile(name: str, source: list[str], namespace: dict[str, typing.Any]) -> Converter:
+    """Compile generated converter.
+
+    :param name: function name
+    :type name: str
+    :param source: function source lines
+    :type source: list[str]
+    :param namespace: function globals
+    :type namespace: dict[str, typing.Any]
+    :return: compiled function
+    :rtype: Converter
+    """
+    exec("\n".join(source), namespace)  # noqa: S102  # Source is generated from the dataclass field names
+    return namespace[name]  # type: ignore[no-any-return]
+
+
+def _dataclass_from_builtins(schema: type) -> Converter:
+    """Generate converter of the decoded dict to the dataclass.
+
+    :param schema: dataclass
+    :type schema: type
+    :return: converter
+    :rtype: Converter
+    """
+    hints = _type_hints(schema)
+    namespace: dict[str, typing.Any] = {"cls": schema}
+    arguments: list[str] = []
+    for idx, field in enumerate(dataclasses.fields(schema)):
+        if not field.init:
+            continue
+        expression = f"value[{field.name!r}]"
+        convert = _from_builtins_converter(hints.get(field.name))
+        if convert is not None:
+            namespace[f"convert_{idx}"] = convert
+            expression = f"convert_{idx}({expression})"
+        if field.default is not dataclasses.MISSING:
+            namespace[f"default_{idx}"] = field.default
+            expression = f"({expression} if {field.name!r} in value else default_{idx})"
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace[f"factory_{idx}"] = field.default_factory
+            expression = f"({expression} if {field.name!r} in value else factory_{idx}())"
+        arguments.append(f"        {field.name}={expression},")
+    return _compile(
+        "from_builtins",
+        ["def from_builtins(value):", "    return cls(", *arguments, "    )"],
+        namespace,
+    )
+
+
+def _dataclass_to_builtins(schema: type) -> Converter:
+    """Generate converter of the dataclass to dict without recursive copy of `dataclasses.asdict`.
+
+    :param schema: dataclass
+    :type schema: type
+    :return: converter
+    :rtype: Converter
+    """
+    hints = _type_hints(schema)
+    namespace: dict[str, typing.Any] = {}
+    items: list[str] = []
+    for idx, field in enumerate(dataclasses.fields(schema)):
+        expression = f"value.{field.name}"
+        convert = _to_builtins_converter(hints.get(field.name))
+        if convert is not None:
+            namespace[f"convert_{idx}"] = convert
+            expression = f"convert_{idx}({expression})"
+        items.append(f"        {field.name!r}: {expression},")
+    return _compile("to_builtins", ["def to_builtins(value):", "    return {", *items, "    }"], namespace)
+
+
+def _typeddict_converter(schema: type, make_converter: typing.Callable[[typing.Any], Converter | None]) -> Converter:
+    """Make TypedDict converter: only keys with nested schema values are converted.
+
+    :param schema: TypedDict type
+    :type schema: type
+    :param make_converter: field converter factory
+    :type make_converter: typing.Callable[[typing.Any], Converter | None]
+    :return: converter
+    :rtype: Converter
+    """
+    converters = {
+        key: convert for key, hint in _type_hints(schema).items() if (convert := make_converter(hint)) is not None
+    }
+    if not converters:
+        return dict
+
+    def convert_typeddict(value: dict[str, typing.Any]) -> dict[str, typing.Any]:
+        result = dict(value)
+        for key, convert in converters.items():
+            if key in result:
+                result[key] = convert(result[key])
+        return result
+
+    return convert_typeddict
+
+
+class Schema:
+    """Conversion between JSON documents and the schema type."""
+
+    __slots__ = ("__from_builtins", "__kind", "__schema", "__to_builtins")
+
+    def __init__(self, schema: type) -> None:
+        """Conversion between JSON documents and the schema type.
+
+        Use `get_schema` to get cached instance.
+
+        :param schema: dataclass, msgspec Struct or TypedDict
+        :type schema: type
+        :raises TypeError: schema type is not supported
+        """
+        kind = _kind(schema)
+        if kind is None:
+            raise TypeError(f"Schema should be dataclass, msgspec Struct or TypedDict, got {schema!r}")
+        self.__schema = schema
+        self.__kind = kind
+
+        self.__from_builtins: Converter
+        self.__to_builtins: Converter
+        if msgspec is not None:
+            self.__from_builtins = functools.partial(msgspec.convert, type=schema)
+            self.__to_builtins = msgspec.to_builtins
+        elif kind == "dataclass":
+            self.__from_builtins = _dataclass_from_builtins(schema)
+            self.__to_builtins = _dataclass_to_builtins(schema)
+        else:
+            self.__from_builtins = _typeddict_converter(schema, _from_builtins_converter)
+            self.__to_builtins = _typeddict_converter(schema, _to_builtins_converter)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.__schema!r})"
+
+    @property
+    def schema(self) -> type:
+        """Schema type.
+
+        :rtype: type
+        """
+        return self.__schema
+
+    @property
+    def kind(self) -> str:
+        """Schema kind: "dataclass", "struct" or "typeddict".
+
+        :rtype: str
+        """
+        return self.__kind
+
+    def from_builtins(self, value: typing.Any) -> typing.Any:
+        """Convert decoded JSON value to the schema type.
+
+        :param value: decoded JSON value
+        :type value: typing.Any
+        :return: schema instance
+        :rtype: typing.Any
+        """
+        return self.__from_builtins(value)
+
+    def to_builtins(self, value: typing.Any) -> typing.Any:
+        """Convert schema instance to the value accepted by JSON encoders.
+
+        :param value: schema instance
+        :type value: typing.Any
+        :return: builtin types value
+        :rtype: typing.Any
+        """
+        return self.__to_builtins(value)
+
+    def prepare(self) -> Converter:
+        """Make converter of bound values: schema instances are converted, other values are passed as is.
+
+        :return: converter
+        :rtype: Converter
+        """
+        if self.__kind == "typeddict":  # isinstance is not supported, value is dict anyway
+            return self.__to_builtins
+        schema = self.__schema
+        to_builtins = self.__to_builtins
+
+        def prepare(value: typing.Any) -> typing.Any:
+            if isinstance(value, schema):
+                return to_builtins(value)
+            return value
+
+        return prepare
+
+    def __encodes_natively(self, codec: JSONCodec) -> bool:
+        """Codec encodes schema instances without conversion.
+
+        :param codec: JSON codec
+        :type codec: JSONCodec
+        :return: conversion is not required
+        :rtype: bool
+        """
+        return isinstance(codec, MsgspecCodec) or (isinstance(codec, OrjsonCodec) and self.__kind != "struct")
+
+    def encoder(self, encode: Encoder, codec: JSONCodec) -> Encoder:
+        """Make encoder of schema instances.
+
+        :param encode: codec encoder
+        :type encode: Encoder
+        :param codec: JSON codec
+        :type codec: JSONCodec
+        :return: encoder
+        :rtype: Encoder
+        """
+        if self.__encodes_natively(codec):
+            return encode
+        prepare = self.prepare()
+
+        def encode_schema(value: typing.Any) -> str | bytes:
+            return encode(prepare(value))
+
+        return encode_schema
+
+    def batch_encoder(self, encode_batch: BatchEncoder, codec: JSONCodec) -> BatchEncoder:
+        """Make batch encoder of schema instances.
+
+        :param encode_batch: codec batch encoder
+        :type encode_batch: BatchEncoder
+        :param codec: JSON codec
+        :type codec: JSONCodec
+        :return: batch encoder
+        :rtype: BatchEncoder
+        """
+        if self.__encodes_natively(codec):
+            return encode_batch
+        prepare = self.prepare()
+
+        def encode_schema_batch(values: typing.Sequence[typing.Any]) -> list[str | bytes]:
+            return encode_batch([prepare(value) for value in values])
+
+        return encode_schema_batch
+
+    def decoder(self, decode: Decoder, codec: JSONCodec | None = None) -> Decoder:
+        """Make decoder producing schema instances.
+
+        :param decode: codec decoder or other decoder (intern table, driver result processor)
+        :type decode: Decoder
+        :param codec: JSON codec if decode is its plain decoder of JSON text: typed codec decoder is used if available
+        :type codec: JSONCodec | None
+        :return: decoder: typed codec decoder or decoder with the converter
+        :rtype: Decoder
+        """
+        typed = None if codec is None else codec.typed_decoder(self.__schema)
+        if typed is not None:
+            return typed
+        from_builtins = self.__from_builtins
+
+        def decode_schema(data: str | bytes | bytearray | memoryview) -> typing.Any:
+            return from_builtins(decode(data))
+
+        return decode_schema
+
+
+@functools.cache
+def get_schema(schema: type) -> Schema:
+    """Get cached schema conversion: converters are built once per schema type.
+
+    :param schema: dataclass, msgspec Struct or TypedDict
+    :type schema: type
+    :return: schema conversion
+    :rtype: Schema
+    :raises TypeError: schema type is not supported
+    """
+    return Schema(schema)
@@ -0,0 +1,164 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Binary storage framing: compression of encoded documents.
+
+Framed value layout::
+
+    b"\\x00" | format id (1 byte) | compression id (1 byte) | payload
+
+Encoded JSON never starts with NUL byte, so values without header (legacy plain rows
+and values below compression threshold) are returned as is.
+Values in other formats (see `formats`) always have the header: compression id 0 means not compressed.
+"""
+
+from __future__ import annotations
+
+import lzma
+import typing
+import zlib
+
+try:
+    from compression import zstd  # type: ignore[import-not-found,unused-ignore]  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd  # type: ignore[no-redef,unused-ignore]
+    except ImportError:
+        zstd = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+__all__ = ("FORMAT_JSON", "Compressor", "get_compressor", "pack", "register_compressor", "unpack")
+
+MAGIC = 0
+HEADER_SIZE = 3
+
+FORMAT_JSON = 1  # UTF-8 encoded JSON text
+
+
+class Compressor(typing.NamedTuple):
+    """Compression method description."""
+
+    name: str
+    ident: int
+    compress: typing.Callable[[bytes], bytes]
+    decompress: typing.Callable[[bytes], bytes]
+
+
+_COMPRESSORS: dict[str, Compressor] = {}
+_COMPRESSORS_BY_ID: dict[int, Compressor] = {}
+
+
+def register_compressor(compressor: Compressor) -> None:
+    """Register compression method.
+
+    :param compressor: compression method description
+    :type compressor: Compressor
+    :raises ValueError: compression id is reserved or already used by another method
+    """
+    if not 0 < compressor.ident < 256:
+        raise ValueError(f"Compression id should be in range 1..255, got {compressor.ident}")
+    registered = _COMPRESSORS_BY_ID.get(compressor.ident)
+    if registered is not None and registered.name != compressor.name:
+        raise ValueError(f"Compression id {compressor.ident} is already used by {registered.name}")
+    _COMPRESSORS[compressor.name] = compressor
+    _COMPRESSORS_BY_ID[compressor.ident] = compressor
+
+
+def get_compressor(compression: str | Compressor) -> Compressor:
+    """Get registered compression method.
+
+    :param compression: compression method name or description
+    :type compression: str | Compressor
+    :return: compression method description
+    :rtype: Compressor
+    :raises ValueError: compression method is not available
+    """
+    if isinstance(compression, Compressor):
+        return compression
+    try:
+        return _COMPRESSORS[compression]
+    except KeyError:
+        raise ValueError(
+            f"Compression {compression!r} is not available, registered: {', '.join(sorted(_COMPRESSORS))}"
+        ) from None
+
+
+register_compressor(Compressor("zlib", 1, zlib.compress, zlib.decompress))
+register_compressor(Compressor("lzma", 2, lzma.compress, lzma.decompress))
+if zstd is not None:
+    if hasattr(zstd, "ZstdCompressor"):  # zstandard package
+        register_compressor(
+            Compressor(
+                "zstd",
+                3,
+                zstd.ZstdCompressor().compress,
+                lambda data: zstd.ZstdDecompressor().decompress(data),
+            )
+        )
+    else:
+        register_compressor(Compressor("zstd", 3, zstd.compress, zstd.decompress))
+if lz4_frame is not None:
+    register_compressor(Compressor("lz4", 4, lz4_frame.compress, lz4_frame.decompress))
+
+
+def pack(
+    data: bytes,
+    compressor: Compressor | None,
+    threshold: int = 0,
+    data_format: int = FORMAT_JSON,
+) -> bytes:
+    """Add header and compress encoded value, if required.
+
+    :param data: encoded value
+    :type data: bytes
+    :param compressor: compression method
+    :type compressor: Compressor | None
+    :param threshold: minimal encoded size for compression
+    :type threshold: int
+    :param data_format: encoded data format id
+    :type data_format: int
+    :return: stored value
+    :rtype: bytes
+    """
+    if compressor is None or len(data) < threshold:
+        if data_format == FORMAT_JSON:
+            return data
+        return bytes((MAGIC, data_format, 0)) + data
+    return bytes((MAGIC, data_format, compressor.ident)) + compressor.compress(data)
+
+
+def unpack(data: bytes | bytearray | memoryview | str) -> tuple[int, bytes | bytearray | memoryview | str]:
+    """Remove header and decompress stored value, if required.
+
+    :param data: stored value
+    :type data: bytes | bytearray | memoryview | str
+    :return: data format id and encoded value
+    :rtype: tuple[int, bytes | bytearray | memoryview | str]
+    :raises ValueError: stored value uses unavailable compression
+    """
+    if isinstance(data, str) or not data or data[0] != MAGIC:  # Plain value or legacy text row
+        return FORMAT_JSON, data
+    data_format = data[1]
+    compression_id = data[2]
+    if compression_id == 0:
+        return data_format, data[HEADER_SIZE:]
+    try:
+        compressor = _COMPRESSORS_BY_ID[compression_id]
+    except KeyError:
+        raise ValueError(f"Stored value uses unavailable compression id {compression_id}") from None
+    return data_format, compressor.decompress(data[HEADER_SIZE:])  # type: ignore[arg-type]
@@ -0,0 +1,304 @@
+#    Copyright 2017-2026 Alexey Stepanov aka penguinolog
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+
+#         http://www.apache.org/licenses/LICENSE-2.0
+
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Incremental decoding of the top-level members of large JSON documents."""
+
+from __future__ import annotations
+
+import io
+import json
+import json.decoder
+import re
+import typing
+
+from .lazy import LazyJSON
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = ("IjsonParser", "IncrementalParser", "JSONStream", "StdlibParser", "get_parser")
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class IncrementalParser(typing.Protocol):
+    """Parser yielding top-level members of JSON document one by one."""
+
+    def iterate(self, data: str | bytes) -> Iterator[tuple[str | int, typing.Any]]:
+        """Iterate over the top-level container.
+
+        :param data: JSON document
+        :type data: str | bytes
+        :return: (key, value) pairs for object or (index, value) pairs for array
+        :rtype: Iterator[tuple[str | int, typing.Any]]
+        :raises TypeError: top-level value is not an object or array
+        """
+
+
+class StdlibParser:
+    """Pure python parser: members are decoded by stdlib json one by one.
+
+    Document text is kept in memory, decoded tree is not built.
+    """
+
+    __slots__ = ("__decoder",)
+
+    def __init__(self) -> None:
+        """Stdlib json based incremental parser."""
+        self.__decoder = json.JSONDecoder()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+    def iterate(self, data: str | bytes) -> Iterator[tuple[str | int, typing.Any]]:
+        """Iterate over the top-level container.
+
+        :param data: JSON document
+        :type data: str | bytes
+        :return: (key, value) pairs for object or (index, value) pairs for array
+        :rtype: Iterator[tuple[str | int, typing.Any]]
+        :raises TypeError: top-level value is not an object or array
+        :raises json.JSONDecodeError: malformed document
+        """
+        text = data if isinstance(data, str) else bytes(data).decode("utf-8")
+        skip = _WHITESPACE.match
+        raw_decode = self.__decoder.raw_decode
+
+        idx = skip(text, 0).end()  # type: ignore[union-attr]
+        opening = text[idx : idx + 1]
+        if opening not in {"{", "["}:
+            raise TypeError("Top-level JSON value is not an object or array")
+        is_object = opening == "{"
+        closing = "}" if is_object else "]"
+        idx = skip(text, idx + 1).end()  # type: ignore[union-attr]
+
+        index = 0
+        if text[idx : idx + 1] != closing:
+            while True:
+                key: str | int = index
+                if is_object:
+                    if text[idx : idx + 1] != '"':
+                        raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, idx)
+                    key, idx = json.decoder.scanstring(text, idx + 1)  # type: ignore[attr-defined]
+                    idx = skip(text, idx).end()  # type: ignore[union-attr]
+                    if text[idx : idx + 1] != ":":
+                        raise json.JSONDecodeError("Expecting ':' delimiter", text, idx)
+                    idx = skip(text, idx + 1).end()  # type: ignore[union-attr]
+                value, idx = raw_decode(text, idx)
+                yield key, value
+                index += 1
+                idx = skip(text, idx).end()  # type: ignore[union-attr]
+                delimiter = text[idx : idx + 1]
+                if delimiter == closing:
+                    break
+                if delimiter != ",":
+                    raise json.JSONDecodeError(f"Expecting ',' or '{closing}' delimiter", text, idx)
+                idx = skip(text, idx + 1).end()  # type: ignore[union-attr]
+
+        idx = skip(text, idx + 1).end()  # type: ignore[union-attr]
+        if idx != len(text):
+            raise json.JSONDecodeError("Extra data", text, idx)
+
+
+class IjsonParser:
+    """Parser based on ijson: document is read by chunks by the event-based parser (C backend if available)."""
+
+    __slots__ = ("__buf_size",)
+
+    def __init__(self, buf_size: int = 65536) -> None:
+        """ijson based incremental parser.
+
+        :param buf_size: read chunk size
+        :type buf_size: int
+        :raises ImportError: ijson is not installed
+        """
+        if ijson is None:
+            raise ImportError("ijson is not installed")
+        self.__buf_size = buf_size
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(buf_size={self.__buf_size!r})"
+
+    def iterate(self, data: str | bytes) -> Iterator[tuple[str | int, typing.Any]]:
+        """Iterate over the top-level container.
+
+        :param data: JSON document
+        :type data: str | bytes
+        :return: (key, value) pairs for object or (index, value) pairs for array
+        :rtype: Iterator[tuple[str | int, typing.Any]]
+        :raises TypeError: top-level value is not an object or array
+        """
+        source = io.BytesIO(data.encode("utf-8") if isinstance(data, str) else data)
+        events = ijson.parse(source, buf_size=self.__buf_size)
+        _, event, _ = next(events)
+        if event not in {"start_map", "start_array"}:
+            raise TypeError("Top-level JSON value is not an object or array")
+        source.seek(0)
+        if event == "start_map":
+            yield from ijson.kvitems(source, "", use_float=True, buf_size=self.__buf_size)
+        else:
+            yield from enumerate(ijson.items(source, "item", use_float=True, buf_size=self.__buf_size))
+
+
+def get_parser(parser: str | IncrementalParser = "auto") -> IncrementalParser:
+    """Get incremental parser.
+
+    :param parser: "auto" (ijson if installed, stdlib otherwise), "ijson", "stdlib" or parser object
+    :type parser: str | IncrementalParser
+    :return: incremental parser
+    :rtype: IncrementalParser
+    :raises ValueError: unknown parser name
+    """
+    if not isinstance(parser, str):
+        return parser
+    if parser == "auto":
+        return StdlibParser() if ijson is None else IjsonParser()
+    if parser == "ijson":
+        return IjsonParser()
+    if parser == "stdlib":
+        return StdlibParser()
+    raise ValueError(f"Unknown incremental parser: {parser!r}")
+
+
+class JSONStream(LazyJSON):
+    """Stored JSON document with incremental access to the top-level members.
+
+    Iteration yields keys of object or items of array, `items()` and `values()` yield decoded members one by one
+    without building the full document tree, `len()` and `bool()` parse the document without keeping the values.
+    Length is remembered after the first full pass. `len()` keeps keys of object, so `list()` (asking length first)
+    parses object once. Other operations decode the full document as `LazyJSON` does.
+    If the document has been decoded, iteration uses the decoded value.
+    """
+
+    __slots__ = ("__keys", "__length", "__parser", "__text")
+
+    def __init__(
+        self,
+        raw: typing.Any,
+        decoder: typing.Callable[[typing.Any], typing.Any],
+        parser: IncrementalParser,
+        text: typing.Callable[[typing.Any], str | bytes] | None = None,
+    ) -> None:
+        """Stored JSON document with incremental access.
+
+        :param raw: stored value (str, bytes or buffer, depends on storage)
+        :type raw: typing.Any
+        :param decoder: decoding function for the full document
+        :type decoder: typing.Callable[[typing.Any], typing.Any]
+        :param parser: incremental parser
+        :type parser: IncrementalParser
+        :param text: function extracting JSON text from the stored value
+        :type text: typing.Callable[[typing.Any], str | bytes] | None
+        """
+        super().__init__(raw, decoder)
+        self.__parser = parser
+        self.__text = text
+        self.__length: int | None = None
+        self.__keys: list[str] | None = None
+
+    @property
+    def parser(self) -> IncrementalParser:
+        """Incremental parser.
+
+        :return: incremental parser
+        :rtype: IncrementalParser
+        """
+        return self.__parser
+
+    def __pairs(self) -> Iterator[tuple[str | int, typing.Any]]:
+        """Top-level members.
+
+        :return: (key, value) pairs for object or (index, value) pairs for array
+        :rtype: Iterator[tuple[str | int, typing.Any]]
+        """
+        raw = self.raw
+        if self.__text is not None:
+            raw = self.__text(raw)
+        elif isinstance(raw, (bytearray, memoryview)):
+            raw = bytes(raw)
+        return self.__parser.iterate(raw)
+
+    def __counted(self, pairs: Iterator[tuple[str | int, typing.Any]]) -> Iterator[tuple[str | int, typing.Any]]:
+        """Remember length after the full pass over the members.
+
+        :param pairs: top-level members
+        :type pairs: Iterator[tuple[str | int, typing.Any]]
+        :return: same members
+        :rtype: Iterator[tuple[str | int, typing.Any]]
+        """
+        length = 0
+        for pair in pairs:
+            length += 1
+            yield pair
+        self.__length = length
+
+    def __iter__(self) -> Iterator[typing.Any]:
+        # list() creates iterator before asking length: source is chosen on the first step
+        if self.is_decoded:
+            yield from self.value
+        elif self.__keys is not None:
+            yield from self.__keys
+        else:
+            for key, value in self.__counted(self.__pairs()):
+                yield key if isinstance(key, str) else value
+
+    def __len__(self) -> int:
+        if self.is_decoded:
+            return len(self.value)
+        if self.__length is None:  # list() asks length first: keys of object are kept, values are dropped
+            keys = [key for key, _ in self.__pairs()]
+            self.__length = len(keys)
+            if keys and isinstance(keys[0], str):
+                self.__keys = keys  # type: ignore[assignment]
+        return self.__length
+
+    def __bool__(self) -> bool:
+        if self.is_decoded:
+            return bool(self.value)
+        return next(self.__pairs(), None) is not None
+
+    def items(self) -> Iterator[tuple[str, typing.Any]]:
+        """Iterate over the top-level object members.
+
+        :return: (key, value) pairs
+        :rtype: Iterator[tuple[str, typing.Any]]
+        :raises TypeError: document is not an object
+        """
+        if self.is_decoded:
+            if not isinstance(self.value, dict):
+                raise TypeError("Top-level JSON value is not an object")
+            yield from self.value.items()
+            return
+        for key, value in self.__counted(self.__pairs()):
+            if not isinstance(key, str):
+                raise TypeError("Top-level JSON value is not an object")
+            yield key, value
+
+    def values(self) -> Iterator[typing.Any]:
+        """Iterate over the top-level object values or array items.
+
+        :return: decoded values
+        :rtype: Iterator[typing.Any]
+        """
+        if self.is_decoded:
+            value = self.value
+            yield from value.values() if isinstance(value, dict) else value
+            return
+        for _, value in self.__counted(self.__pairs()):
+            yield value
@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import contextlib
+import dataclasses
+import datetime as dt
+import importlib.util
 import os.path
 import random
 import sqlite3
 import string
 import sys
 import tempfile
+import typing
 import unittest
 
+import sqlalchemy.ext.asyncio
 import sqlalchemy.orm
 
 try:
@@ -25,6 +31,8 @@ except ImportError:
 
 import sqlalchemy_jsonfield
 
+ASYNC_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ("greenlet", "aiosqlite"))
+
 # Table name
 table_name = "create_test"
 
@@ -40,6 +48,139 @@ class ExampleTable(Base):
     json_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(), nullable=False)
 
 
+class BinaryTable(Base):
+    __tablename__ = "binary_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(enforce_binary=True), nullable=False)
+
+
+class CompressedTable(Base):
+    __tablename__ = "compressed_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(
+        sqlalchemy_jsonfield.JSONField(compression="zlib", compression_threshold=64), nullable=False
+    )
+
+
+class NestedTable(Base):
+    __tablename__ = "nested_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.mutable_json_field(track_nested=True), nullable=False)
+    text_record = sqlalchemy.Column(
+        sqlalchemy_jsonfield.mutable_json_field(enforce_string=True, track_nested=True), nullable=False
+    )
+    codec_record = sqlalchemy.Column(
+        sqlalchemy_jsonfield.mutable_json_field(
+            json=sqlalchemy_jsonfield.CallableCodec(lambda value: json.dumps(value, default=str), json.loads),
+            track_nested=True,
+        )
+    )
+
+
+class LazyTable(Base):
+    __tablename__ = "lazy_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.mutable_json_field(lazy=True), nullable=False)
+    nested_record = sqlalchemy.Column(
+        sqlalchemy_jsonfield.mutable_json_field(track_nested=True, lazy=True), nullable=False
+    )
+
+
+class QueryTable(Base):
+    __tablename__ = "query_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(), nullable=False)
+    text_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(enforce_string=True), nullable=False)
+
+
+class IndexedTable(Base):
+    __tablename__ = "indexed_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(
+        sqlalchemy_jsonfield.JSONField(
+            enforce_string=True,
+            indexed_paths={"tenant": sqlalchemy.Integer, ("owner", "name"): sqlalchemy.String(32)},
+        ),
+        nullable=False,
+    )
+
+
+class StreamTable(Base):
+    __tablename__ = "stream_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(stream=True), nullable=False)
+
+
+@dataclasses.dataclass
+class Settings:
+    name: str
+    limits: list[int] = dataclasses.field(default_factory=list)
+
+
+class SchemaTable(Base):
+    __tablename__ = "schema_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(schema=Settings), nullable=False)
+    text_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(enforce_string=True, schema=Settings))
+
+
+class FormatTable(Base):
+    __tablename__ = "format_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(storage_format="compact"))
+
+
+content_store = sqlalchemy_jsonfield.ContentStore(Base.metadata, cache_size=4)
+
+
+class ContentTable(Base):
+    __tablename__ = "content_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(content_store=content_store))
+
+
+chunk_store = sqlalchemy_jsonfield.ChunkStore(Base.metadata, threshold=500, chunk_size=400)
+
+
+class ChunkTable(Base):
+    __tablename__ = "chunk_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(chunk_store=chunk_store))
+
+
+class CanonicalTable(Base):
+    __tablename__ = "canonical_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(sqlalchemy_jsonfield.mutable_json_field(enforce_string=True, canonical=True))
+    plain_record = sqlalchemy.Column(sqlalchemy_jsonfield.JSONField(enforce_string=True, canonical=True))
+
+
+class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+    submitted = 0
+
+    def submit(
+        self, fn: typing.Any, /, *args: typing.Any, **kwargs: typing.Any
+    ) -> concurrent.futures.Future[typing.Any]:
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+offload_executor = CountingExecutor(1)
+
+
+class OffloadTable(Base):
+    __tablename__ = "offload_test"
+    id: int = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    json_record = sqlalchemy.Column(
+        sqlalchemy_jsonfield.JSONField(
+            enforce_string=True,
+            offload_threshold=1024,
+            offload_executor=offload_executor,
+        ),
+        nullable=False,
+    )
+
+
 class SQLIteTests(unittest.TestCase):
     def setUp(self) -> None:
         # Path to test database
@@ -139,3 +280,616 @@ class SQLIteTests(unittest.TestCase):
             self.assertEqual(result["dict_record"], json.dumps(test_dict))
 
             self.assertEqual(result["list_record"], json.dumps(test_list))
+
+    def test_binary(self) -> None:
+        """Check binary storage."""
+        test_dict = {"key": "значение"}
+
+        with self.session:
+            self.session.add(BinaryTable(id=1, json_record=test_dict))
+            self.session.commit()
+
+        self.assertEqual(self.session.get(BinaryTable, 1).json_record, test_dict)
+
+        # noinspection PyArgumentList
+        with sqlite3.connect(database=f"file:{self.db_path}?mode=ro", uri=True) as conn:
+            c = conn.cursor()
+            c.execute("SELECT json_record FROM binary_test")
+            (stored,) = c.fetchone()
+
+        self.assertIsInstance(stored, bytes)
+        self.assertEqual(json.loads(stored), test_dict)
+
+    def test_compressed(self) -> None:
+        """Check compressed storage with legacy text rows."""
+        test_dict = {"key": "значение" * 100}
+
+        # noinspection PyArgumentList
+        with sqlite3.connect(database=self.db_path) as conn:
+            conn.execute("INSERT INTO compressed_test (id, json_record) VALUES (1, ?)", (json.dumps(test_dict),))
+
+        with self.session:
+            self.session.add(CompressedTable(id=2, json_record=test_dict))
+            self.session.commit()
+
+        self.assertEqual(self.session.get(CompressedTable, 1).json_record, test_dict)
+        self.assertEqual(self.session.get(CompressedTable, 2).json_record, test_dict)
+
+        # noinspection PyArgumentList
+        with sqlite3.connect(database=f"file:{self.db_path}?mode=ro", uri=True) as conn:
+            c = conn.cursor()
+            c.execute("SELECT json_record FROM compressed_test WHERE id = 2")
+            (stored,) = c.fetchone()
+
+        self.assertEqual(stored[:3], b"\x00\x01\x01")
+        self.assertLess(len(stored), len(json.dumps(test_dict)))
+
+    def test_storage_format(self) -> None:
+        """Check binary format with legacy text rows and migration."""
+        test_dict = {"values": [1.5, 2, None], "name": "значение"}
+
+        # noinspection PyArgumentList
+        with sqlite3.connect(database=self.db_path) as conn:
+            conn.executemany(
+                "INSERT INTO format_test (id, json_record) VALUES (?, ?)",
+                [(idx, json.dumps(test_dict)) for idx in range(1, 6)],
+            )
+            conn.execute("INSERT INTO format_test (id, json_record) VALUES (6, NULL)")
+
+        with self.session:
+            self.session.add(FormatTable(id=7, json_record=test_dict))
+            self.session.commit()
+
+        for idx in (1, 7):
+            self.assertEqual(self.session.get(FormatTable, idx).json_record, test_dict)
+        self.session.close()
+
+        engine = self.session.get_bind()
+        self.assertEqual(
+            sqlalchemy_jsonfield.reencode_column(engine, FormatTable.__table__.c.json_record, batch_size=2), 5
+        )
+        self.assertEqual(sqlalchemy_jsonfield.reencode_column(engine, FormatTable.__table__.c.json_record), 0)
+
+        # noinspection PyArgumentList
+        with sqlite3.connect(database=f"file:{self.db_path}?mode=ro", uri=True) as conn:
+            stored = [row[0] for row in conn.execute("SELECT json_record FROM format_test ORDER BY id")]
+
+        self.assertIsNone(stored[5])
+        for value in stored[:5] + stored[6:]:
+            self.assertEqual(value[:3], b"\x00\x02\x00")
+        self.assertEqual(self.session.get(FormatTable, 3).json_record, test_dict)
+
+    def test_migration(self) -> None:
+        """Check resumable migration between storage modes."""
+        test_dict = {"values": [1.5, 2, None], "name": "значение"}
+
+        with self.session:
+            self.session.add_all(FormatTable(id=idx, json_record=test_dict) for idx in range(1, 8))
+            self.session.commit()
+
+        text_table = sqlalchemy.Table(
+            "format_test",
+            sqlalchemy.MetaData(),
+            sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column("json_record", sqlalchemy_jsonfield.JSONField(enforce_string=True)),
+        )
+        engine = self.session.get_bind()
+        reports: list[sqlalchemy_jsonfield.migration.MigrationProgress] = []
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            self.assertEqual(
+                sqlalchemy_jsonfield.reencode_column(
+                    engine,
+                    text_table.c.json_record,
+                    batch_size=3,
+                    source=FormatTable.__table__.c.json_record.type,
+                    executor=executor,
+                    chunk_size=2,
+                    start_after=(2,),
+                    progress=reports.append,
+                ),
+                5,
+            )
+        self.assertEqual(
+            [(report.scanned, report.updated, report.last_key) for report in reports], [(3, 3, (5,)), (5, 5, (7,))]
+        )
+        self.assertGreaterEqual(reports[-1].rows_per_second, 0)
+
+        # Resumed from the start: converted rows are skipped
+        self.assertEqual(
+            sqlalchemy_jsonfield.reencode_column(
+                engine, text_table.c.json_record, source=FormatTable.__table__.c.json_record.type
+            ),
+            2,
+        )
+
+        # noinspection PyArgumentList
+        with sqlite3.connect(database=f"file:{self.db_path}?mode=ro", uri=True) as conn:
+            stored = [row[0] for row in conn.execute("SELECT json_record FROM format_test ORDER BY id")]
+        self.assertEqual([json.loads(value) for value in stored], [test_dict] * 7)
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.reencode_column(engine, text_table.c.json_record, start_after=(1, 2))
+
+        # Migration to chunk store in worker threads: chunks are inserted by the batch statements
+        chunk_store.attach(engine)
+        plain_chunks = sqlalchemy.Table(
+            "chunk_test",
+            sqlalchemy.MetaData(),
+            sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column("json_record", sqlalchemy_jsonfield.JSONField(enforce_string=True)),
+        )
+        documents = [{f"key{idx}": f"{row:03}" * 30 for idx in range(20)} for row in range(20)]
+        with engine.begin() as connection:
+            connection.execute(
+                plain_chunks.insert(), [{"id": row, "json_record": document} for row, document in enumerate(documents)]
+            )
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            self.assertEqual(
+                sqlalchemy_jsonfield.reencode_column(
+                    engine,
+                    ChunkTable.__table__.c.json_record,
+                    batch_size=10,
+                    source=plain_chunks.c.json_record.type,
+                    executor=executor,
+                    chunk_size=5,
+                ),
+                20,
+            )
+        with engine.connect() as connection:
+            stored_chunks = set(connection.scalars(sqlalchemy.select(chunk_store.table.c.hash)))
+        with sqlalchemy.orm.Session(engine) as session:
+            records = session.scalars(sqlalchemy.select(ChunkTable).order_by(ChunkTable.id)).all()
+            for record in records:
+                self.assertLessEqual(set(record.json_record.chunks_refs), stored_chunks)
+            self.assertEqual([record.json_record for record in records], documents)
+
+    def test_nested_partial_update(self) -> None:
+        """Check nested changes tracking and partial update."""
+        statements: list[str] = []
+
+        with self.session:
+            self.session.add(
+                NestedTable(id=1, json_record={"a": {"b": [1, {"c": 2}]}, "d": 1}, text_record={"a": {"b": 1}})
+            )
+            self.session.commit()
+
+            record = self.session.get(NestedTable, 1)
+            record.json_record["a"]["b"][1]["c"] = 3
+            del record.json_record["d"]
+            record.text_record["a"]["b"] = 2
+            record.codec_record = {"a": {}}
+
+            @sqlalchemy.event.listens_for(self.session.bind, "before_cursor_execute")
+            def collect(conn, cursor, statement, *args: typing.Any) -> None:
+                statements.append(statement)
+
+            self.session.flush()
+            self.assertEqual(record.json_record, {"a": {"b": [1, {"c": 3}]}})
+            self.session.commit()
+
+        self.assertIn("json_set(nested_test.json_record", statements[0])
+        self.assertIn("json_remove(", statements[0])
+        self.assertIn("text_record=?", statements[0])
+
+        # noinspection PyArgumentList
+        with sqlite3.connect(database=f"file:{self.db_path}?mode=ro", uri=True) as conn:
+            c = conn.cursor()
+            c.execute("SELECT json_record, text_record FROM nested_test")
+            json_record, text_record = c.fetchone()
+
+        self.assertEqual(json.loads(json_record), {"a": {"b": [1, {"c": 3}]}})
+        self.assertEqual(json.loads(text_record), {"a": {"b": 2}})
+
+        # Changed values are encoded by the column codec
+        with self.session:
+            record = self.session.get(NestedTable, 1)
+            record.codec_record["a"]["at"] = dt.date(2026, 1, 2)
+            self.session.commit()
+            self.assertEqual(self.session.get(NestedTable, 1).codec_record, {"a": {"at": "2026-01-02"}})
+
+        # Keys not addressable by SQLite JSON path: document is written whole
+        statements.clear()
+        with self.session:
+            record = self.session.get(NestedTable, 1)
+            record.json_record['q"k'] = {"x": 1}
+            record.json_record["é"] = {"x": 1}
+            self.session.commit()
+
+            record = self.session.get(NestedTable, 1)
+            record.json_record['q"k']["x"] = 2
+            record.json_record["é"]["x"] = 2
+            self.session.commit()
+
+        self.assertNotIn("json_set(", statements[-1])
+        with self.session:
+            self.assertEqual(
+                self.session.get(NestedTable, 1).json_record,
+                {"a": {"b": [1, {"c": 3}]}, 'q"k': {"x": 2}, "é": {"x": 2}},
+            )
+
+    def test_lazy(self) -> None:
+        """Check lazy decoding with mutable fields."""
+        statements: list[str] = []
+
+        with self.session:
+            self.session.add(LazyTable(id=1, json_record={"a": 1}, nested_record={"a": {"b": 1}}))
+            self.session.commit()
+
+        with self.session:
+            record = self.session.get(LazyTable, 1)
+            self.assertIsInstance(record.json_record, sqlalchemy_jsonfield.LazyJSON)
+            self.assertFalse(record.json_record.is_decoded)
+            self.assertFalse(record.nested_record.is_decoded)
+
+            record.json_record["b"] = 2
+            record.nested_record["a"]["b"] = 2
+
+            @sqlalchemy.event.listens_for(self.session.bind, "before_cursor_execute")
+            def collect(conn, cursor, statement, *args: typing.Any) -> None:
+                statements.append(statement)
+
+            self.session.commit()
+
+        self.assertIn("json_set(lazy_test.nested_record", statements[0])
+
+        with self.session:
+            record = self.session.get(LazyTable, 1)
+            self.assertEqual(record.json_record, {"a": 1, "b": 2})
+            self.assertEqual(record.nested_record, {"a": {"b": 2}})
+
+    def test_bulk_encoding(self) -> None:
+        """Check batch encoding of executemany parameters."""
+        sqlalchemy_jsonfield.enable_bulk_encoding(self.session.bind, min_rows=2)
+        rows = [{"id": idx, "json_record": {"key": "значение" * idx}} for idx in range(1, 300, 10)]
+
+        with self.session:
+            self.session.execute(sqlalchemy.insert(BinaryTable), rows)
+            self.session.execute(sqlalchemy.insert(CompressedTable), rows)
+            self.session.commit()
+
+        self.assertEqual(rows[1]["json_record"], {"key": "значение" * 11})  # parameters are not modified
+        with self.session:
+            for table in (BinaryTable, CompressedTable):
+                stored = self.session.execute(sqlalchemy.select(table.id, table.json_record).order_by(table.id)).all()
+                self.assertEqual([{"id": idx, "json_record": record} for idx, record in stored], rows)
+
+    def test_query_path(self) -> None:
+        """Check server-side JSON path querying for native and text storage."""
+        documents = (
+            {"a": {"b": "x"}, "n": 2, "v": 1.5, "f": True, "tags": ["a", "b"], "k": None},
+            {"a": {"b": "y"}, "n": 1, "v": 0.5, "f": False, "tags": ["b"]},
+        )
+        with self.session:
+            for idx, document in enumerate(documents, start=1):
+                self.session.add(QueryTable(id=idx, json_record=document, text_record=document))
+            self.session.commit()
+
+            for column in (QueryTable.json_record, QueryTable.text_record):
+
+                def select_ids(condition: typing.Any) -> list[int]:
+                    return list(self.session.scalars(sqlalchemy.select(QueryTable.id).where(condition).order_by("id")))
+
+                self.assertEqual(select_ids(column["a"]["b"].as_string() == "y"), [2])
+                self.assertEqual(select_ids(column["n"].as_integer() > 1), [1])
+                self.assertEqual(select_ids(column["v"].as_float() < 1), [2])
+                self.assertEqual(select_ids(column["f"].as_boolean()), [1])
+                self.assertEqual(select_ids(column["tags"].contains("a")), [1])
+                self.assertEqual(select_ids(column.contains({"tags": ["b"], "a": {"b": "x"}})), [1])
+                self.assertEqual(select_ids(column["a"].has_key("b")), [1, 2])
+                self.assertEqual(select_ids(~column.has_key("k")), [2])
+                self.assertEqual(
+                    self.session.execute(sqlalchemy.select(column["a"], column["tags"][0].as_string())).all(),
+                    [({"b": "x"}, "a"), ({"b": "y"}, "b")],
+                )
+
+    def test_projection(self) -> None:
+        """Check loading of the selected paths only."""
+        document = {"meta": {"owner": "user", "flags": [True, False], "size": 1.5}, "status": "ok", "body": "x" * 100}
+        with self.session:
+            self.session.add(QueryTable(id=1, json_record=document, text_record=document))
+            self.session.add(NestedTable(id=1, json_record=document, text_record=document))
+            self.session.commit()
+
+        expected = {"meta": {"owner": "user", "flags": (True, False)}, "status": "ok", "missing": None}
+        with self.session:
+            for column in (QueryTable.json_record, QueryTable.text_record):
+                self.assertEqual(
+                    self.session.scalar(
+                        sqlalchemy.select(
+                            sqlalchemy_jsonfield.json_projection(
+                                column, "meta.owner", "meta.flags", "status", "missing"
+                            )
+                        )
+                    ),
+                    expected,
+                )
+
+            row = self.session.scalars(
+                sqlalchemy.select(NestedTable).options(
+                    sqlalchemy_jsonfield.load_json_paths(NestedTable.text_record, "meta.owner", "status")
+                )
+            ).one()
+            self.assertIsInstance(row.text_record, sqlalchemy_jsonfield.PartialJSON)
+            self.assertEqual(row.text_record, {"meta": {"owner": "user"}, "status": "ok"})
+            self.assertEqual(row.json_record, document)
+
+            row.json_record["status"] = "changed"  # Other columns are written
+            self.session.commit()
+            self.assertIsInstance(row.text_record, sqlalchemy_jsonfield.PartialJSON)  # Options are kept on refresh
+
+        with self.session:
+            row = self.session.scalars(
+                sqlalchemy.select(NestedTable).options(
+                    sqlalchemy_jsonfield.load_json_paths(NestedTable.json_record, "status")
+                )
+            ).one()
+            self.assertEqual(row.json_record, {"status": "changed"})
+            row.text_record = row.json_record  # Partial document is not written over the full one
+            with self.assertRaises(sqlalchemy.exc.StatementError):
+                self.session.flush()
+
+    def test_indexed_paths(self) -> None:
+        """Check generated columns and indexes of the indexed paths."""
+        with self.session:
+            for idx in range(10):
+                self.session.add(
+                    IndexedTable(id=idx, json_record={"tenant": idx % 3, "owner": {"name": f"user{idx}"}}),
+                )
+            self.session.commit()
+
+            query = sqlalchemy.select(IndexedTable.id).where(
+                IndexedTable.json_record["tenant"].as_integer() == 1,
+                IndexedTable.json_record["owner"]["name"].as_string() != "user4",
+            )
+            self.assertIn("indexed_test.json_record_tenant = ?", str(query.compile(self.session.bind)))
+            self.assertEqual(list(self.session.scalars(query.order_by("id"))), [1, 7])
+
+            plan = self.session.execute(
+                sqlalchemy.text(
+                    f"EXPLAIN QUERY PLAN {query.compile(self.session.bind, compile_kwargs={'literal_binds': True})}"
+                )
+            ).all()
+            self.assertIn("USING INDEX ix_indexed_test_json_record_tenant", plan[0][-1])
+
+            # Not matching conversion is not routed
+            self.assertEqual(
+                list(
+                    self.session.scalars(
+                        sqlalchemy.select(IndexedTable.id)
+                        .where(IndexedTable.json_record["tenant"].as_float() == 2)
+                        .order_by("id")
+                    )
+                ),
+                [2, 5, 8],
+            )
+
+    def test_stream(self) -> None:
+        """Check incremental access to the stored documents."""
+        with self.session:
+            for idx in range(5):
+                self.session.add(StreamTable(id=idx, json_record=[{"row": idx, "item": item} for item in range(100)]))
+            self.session.commit()
+
+        with sqlalchemy.orm.Session(self.session.bind) as session:
+            total = 0
+            for record in session.scalars(sqlalchemy.select(StreamTable).execution_options(yield_per=2)):
+                self.assertIsInstance(record.json_record, sqlalchemy_jsonfield.JSONStream)
+                total += sum(item["item"] for item in record.json_record)
+                self.assertFalse(record.json_record.is_decoded)
+            self.assertEqual(total, 5 * sum(range(100)))
+
+            record = session.get(StreamTable, 1)
+            self.assertEqual(record.json_record[0], {"row": 1, "item": 0})
+            record.json_record = [1]
+            session.commit()
+            self.assertEqual(session.get(StreamTable, 1).json_record, [1])
+
+    def test_schema(self) -> None:
+        """Check documents decoded to dataclasses."""
+        with self.session:
+            self.session.add(SchemaTable(id=1, json_record=Settings("a", [1, 2]), text_record=Settings("b")))
+            self.session.commit()
+
+        with sqlalchemy.orm.Session(self.session.bind) as session:
+            record = session.get(SchemaTable, 1)
+            self.assertEqual(record.json_record, Settings("a", [1, 2]))
+            self.assertEqual(record.text_record, Settings("b"))
+            self.assertEqual(
+                session.scalar(
+                    sqlalchemy.select(SchemaTable.id).where(SchemaTable.json_record["name"].as_string() == "a")
+                ),
+                1,
+            )
+            record.text_record = Settings("c", [3])
+            session.commit()
+            self.assertEqual(session.get(SchemaTable, 1).text_record, Settings("c", [3]))
+
+    def test_content_store(self) -> None:
+        """Check deduplicated storage of the repeated documents."""
+        content_store.attach(self.session.bind)
+        template = {"body": "x" * 1000, "version": 1}
+        with self.session:
+            self.session.add_all(ContentTable(id=idx, json_record=template) for idx in range(10))
+            self.session.commit()
+            self.session.execute(
+                sqlalchemy.insert(ContentTable),
+                [{"id": 10 + idx, "json_record": {"version": idx % 3, "body": "x" * 1000}} for idx in range(30)],
+            )
+            self.session.commit()
+
+        with self.session.bind.connect() as connection:
+            self.assertEqual(
+                connection.scalar(sqlalchemy.select(sqlalchemy.func.count()).select_from(content_store.table)), 3
+            )
+            stored = connection.exec_driver_sql("SELECT json_record FROM content_test").scalar()
+            self.assertEqual(len(stored), 64)  # Reference only
+
+        with sqlalchemy.orm.Session(self.session.bind) as session:
+            records = session.scalars(sqlalchemy.select(ContentTable).order_by(ContentTable.id)).all()
+            self.assertIsInstance(records[0].json_record, sqlalchemy_jsonfield.LazyJSON)
+            content_store.resolve(session, [record.json_record for record in records])
+            self.assertEqual(records[0].json_record, template)
+            self.assertEqual([record.json_record["version"] for record in records[10:13]], [0, 1, 2])
+
+            records[0].json_record = {"body": "changed"}
+            records[1].json_record = records[11].json_record  # Not accessed value keeps the reference
+            session.commit()
+            self.assertEqual(session.get(ContentTable, 0).json_record, {"body": "changed"})
+            self.assertEqual(session.get(ContentTable, 1).json_record["version"], 1)
+
+        def stored(document: dict[str, str]) -> int:
+            with self.session.bind.connect() as connection:
+                return connection.scalar(
+                    sqlalchemy.select(sqlalchemy.func.count())
+                    .select_from(content_store.table)
+                    .where(content_store.table.c.document == json.dumps(document, separators=(",", ":")))
+                )
+
+        # Documents seen in the rolled back transaction are inserted again
+        document = {"body": "rolled back"}
+        with sqlalchemy.orm.Session(self.session.bind) as session:
+            session.add(ContentTable(id=100, json_record=document))
+            session.flush()
+            session.add(ContentTable(id=101, json_record=document))
+            session.flush()
+            session.rollback()
+            session.add(ContentTable(id=100, json_record=document))
+            session.commit()
+        self.assertEqual(stored(document), 1)
+
+        # Documents are carried by the bound references: encoding in other threads and in batches
+        field = ContentTable.__table__.c.json_record.type
+        documents = [{"body": f"batch {idx}"} for idx in range(4)]
+        with concurrent.futures.ThreadPoolExecutor(2) as executor, self.session:
+            encoded = field.encode_many(documents, self.session.bind.dialect, executor=executor, chunk_size=1)
+            self.session.execute(
+                sqlalchemy.insert(ContentTable),
+                [{"id": 200 + idx, "json_record": value} for idx, value in enumerate(encoded)],
+            )
+            self.session.commit()
+        self.assertEqual([stored(document) for document in documents], [1, 1, 1, 1])
+
+    def test_chunk_store(self) -> None:
+        """Check chunked storage of oversized documents with partial reads."""
+        chunk_store.attach(self.session.bind)
+        document = {f"key{idx}": "v" * 50 + str(idx) for idx in range(40)}
+        items = [{"item": idx, "text": "x" * 20} for idx in range(100)]
+        with self.session:
+            self.session.add_all(
+                (
+                    ChunkTable(id=1, json_record=document),
+                    ChunkTable(id=2, json_record=items),
+                    ChunkTable(id=3, json_record={"small": True}),
+                )
+            )
+            self.session.commit()
+
+        def count_chunks() -> int:
+            with self.session.bind.connect() as connection:
+                return connection.scalar(sqlalchemy.select(sqlalchemy.func.count()).select_from(chunk_store.table))
+
+        with self.session.bind.connect() as connection:
+            stored = connection.exec_driver_sql("SELECT json_record FROM chunk_test ORDER BY id").scalars().all()
+        self.assertTrue(stored[0].startswith("@chunks:"))
+        self.assertTrue(stored[1].startswith("@chunks:"))
+        self.assertEqual(json.loads(stored[2]), {"small": True})
+        chunks = count_chunks()
+
+        with sqlalchemy.orm.Session(self.session.bind) as session:
+            record = session.get(ChunkTable, 1)
+            value = record.json_record
+            self.assertIsInstance(value, sqlalchemy_jsonfield.ChunkedJSON)
+            self.assertGreater(value.chunks, 2)
+            self.assertEqual(len(value), 40)
+            self.assertIn("key39", value)
+            self.assertEqual(list(value), list(document))
+            self.assertEqual(value.loaded_chunks, 0)
+            self.assertEqual(value["key5"], document["key5"])
+            self.assertIsNone(value.get("missing"))
+            self.assertEqual(value.loaded_chunks, 1)
+            self.assertEqual(value, document)
+
+            array = session.get(ChunkTable, 2).json_record
+            self.assertEqual(len(array), 100)
+            self.assertEqual(array[-1], items[-1])
+            self.assertEqual(array[42], items[42])
+            self.assertLessEqual(array.loaded_chunks, 2)
+            self.assertEqual(array, items)
+            self.assertEqual(session.get(ChunkTable, 3).json_record, {"small": True})
+
+            # Only changed chunk is written
+            record.json_record = {**document, "key5": "w" * 50 + "5"}
+            session.commit()
+            self.assertEqual(count_chunks(), chunks + 1)
+            self.assertEqual(session.get(ChunkTable, 1).json_record["key5"], "w" * 50 + "5")
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(chunk_store=chunk_store, enforce_binary=True)
+
+    def test_canonical(self) -> None:
+        """Check canonical storage and skipped UPDATE of unchanged documents."""
+        updates: list[str] = []
+
+        def before_cursor_execute(conn: typing.Any, cursor: typing.Any, statement: str, *args: typing.Any) -> None:
+            if statement.startswith("UPDATE"):
+                updates.append(statement)
+
+        sqlalchemy.event.listen(self.session.bind, "before_cursor_execute", before_cursor_execute)
+        with self.session:
+            self.session.add(CanonicalTable(id=1, json_record={"b": 1, "a": [1, 2]}, plain_record={"z": 1, "y": 2}))
+            self.session.commit()
+            self.assertEqual(
+                tuple(
+                    self.session.connection()
+                    .exec_driver_sql("SELECT json_record, plain_record FROM canonical_test")
+                    .one()
+                ),
+                ('{"a":[1,2],"b":1}', '{"y":2,"z":1}'),
+            )
+
+            record = self.session.get(CanonicalTable, 1)
+            record.json_record["b"] = 2
+            record.json_record["b"] = 1
+            record.plain_record = {"y": 2, "z": 1}
+            self.session.commit()
+            self.assertEqual(updates, [])
+
+            record.json_record["b"] = 3
+            record.plain_record = {"y": True, "z": 1}
+            self.session.commit()
+            self.assertEqual(len(updates), 1)
+            self.assertEqual(self.session.get(CanonicalTable, 1).plain_record, {"y": True, "z": 1})
+
+
+@unittest.skipIf(not ASYNC_AVAILABLE, "greenlet and aiosqlite are required")
+class SQLiteAsyncTests(unittest.IsolatedAsyncioTestCase):
+    async def test_offload(self) -> None:
+        """Check large documents processing in the executor by the asyncio engine."""
+        engine = sqlalchemy.ext.asyncio.create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            await connection.run_sync(OffloadTable.__table__.create)
+
+        large = {"items": [f"item{idx}" for idx in range(500)]}
+        offload_executor.submitted = 0
+        async with sqlalchemy.ext.asyncio.AsyncSession(engine) as session:
+            session.add_all((OffloadTable(id=1, json_record={"small": True}), OffloadTable(id=2, json_record=large)))
+            await session.commit()
+            self.assertEqual(offload_executor.submitted, 1)  # Small document is encoded inline
+
+        async with sqlalchemy.ext.asyncio.AsyncSession(engine) as session:
+            records = (await session.scalars(sqlalchemy.select(OffloadTable).order_by(OffloadTable.id))).all()
+            self.assertEqual([record.json_record for record in records], [{"small": True}, large])
+            self.assertEqual(offload_executor.submitted, 2)
+        await engine.dispose()
+
+        # Sync usage: inline processing
+        with sqlalchemy.orm.Session(sqlalchemy.create_engine("sqlite://")) as session:
+            OffloadTable.__table__.create(session.connection())
+            session.add(OffloadTable(id=1, json_record=large))
+            session.commit()
+            self.assertEqual(session.get(OffloadTable, 1).json_record, large)
+        self.assertEqual(offload_executor.submitted, 2)
+
+        # Column functions are closures: process pools can not run them
+        with concurrent.futures.ProcessPoolExecutor(1) as pool, self.assertRaises(TypeError):
+            sqlalchemy_jsonfield.JSONField(offload_threshold=1, offload_executor=pool)
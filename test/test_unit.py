@@ -4,16 +4,65 @@
 from __future__ import annotations
 
 # Standard Library
+import concurrent.futures
+import dataclasses
+import datetime as dt
+import importlib
+import importlib.util
 import json
+import pickle
+import types
+import typing
 import unittest
 
 # External Dependencies
+import pytest
 import sqlalchemy.types
+from sqlalchemy.dialects import mssql
 from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects import sqlite
 
 # Package Implementation
 import sqlalchemy_jsonfield
+from sqlalchemy_jsonfield import instrumentation
+from sqlalchemy_jsonfield.indexing import AddGeneratedColumn
+from sqlalchemy_jsonfield.indexing import CreatePathIndex
+from sqlalchemy_jsonfield.migration import _converter
+from sqlalchemy_jsonfield.schema import get_schema
+from sqlalchemy_jsonfield.stream import IjsonParser
+from sqlalchemy_jsonfield.stream import StdlibParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+@dataclasses.dataclass
+class Item:
+    name: str
+    qty: int = 1
+
+
+@dataclasses.dataclass
+class Order:
+    id: int
+    items: list[Item]
+    owner: typing.Optional[Item] = None  # noqa: UP045  # Evaluated by get_type_hints on Python 3.9
+    tags: tuple[str, ...] = ()
+    by_name: dict[str, Item] = dataclasses.field(default_factory=dict)
+    children: list[Order] = dataclasses.field(default_factory=list)
+
+
+class OrderDict(typing.TypedDict):
+    id: int
+    item: Item
 
 
 # noinspection PyStatementEffect
@@ -78,3 +127,912 @@ class BaseFunctionality(unittest.TestCase):
             ),
             {"key": "val"},
         )
+
+    def test_cache_key(self) -> None:
+        field_key = sqlalchemy_jsonfield.JSONField()._static_cache_key
+        self.assertEqual(field_key, sqlalchemy_jsonfield.JSONField()._static_cache_key)
+        self.assertNotEqual(field_key, sqlalchemy_jsonfield.JSONField(enforce_string=True)._static_cache_key)
+        self.assertNotEqual(field_key, sqlalchemy_jsonfield.JSONField(enforce_unicode=True)._static_cache_key)
+        self.assertNotEqual(
+            field_key, sqlalchemy_jsonfield.JSONField(json_type=sqlalchemy.JSON(none_as_null=True))._static_cache_key
+        )
+
+        class UnhashableCodec:
+            __hash__ = None  # type: ignore[assignment]
+            dumps = staticmethod(json.dumps)
+            loads = staticmethod(json.loads)
+
+        codec = UnhashableCodec()
+        codec_key = sqlalchemy_jsonfield.JSONField(json=codec)._static_cache_key
+        self.assertEqual(hash(codec_key), hash(sqlalchemy_jsonfield.JSONField(json=codec)._static_cache_key))
+        self.assertEqual(codec_key, sqlalchemy_jsonfield.JSONField(json=codec)._static_cache_key)
+        self.assertNotEqual(codec_key, sqlalchemy_jsonfield.JSONField(json=UnhashableCodec())._static_cache_key)
+
+    def test_processors(self) -> None:
+        dialect = sqlite.dialect()
+
+        native = sqlalchemy_jsonfield.JSONField().dialect_impl(dialect)
+        self.assertEqual(native.bind_processor(dialect)({"key": "val"}), json.dumps({"key": "val"}))
+        self.assertEqual(native.result_processor(dialect, None)(json.dumps({"key": "val"})), {"key": "val"})
+
+        field = sqlalchemy_jsonfield.JSONField(enforce_string=True, enforce_unicode=True).dialect_impl(dialect)
+        bind_processor = field.bind_processor(dialect)
+        result_processor = field.result_processor(dialect, None)
+
+        self.assertIsNone(bind_processor(None))
+        self.assertIsNone(result_processor(None))
+        self.assertEqual(bind_processor({"ключ": "значение"}), json.dumps({"ключ": "значение"}, ensure_ascii=False))
+        self.assertEqual(result_processor(json.dumps({"key": "val"})), {"key": "val"})
+
+    def test_lazy(self) -> None:
+        dialect = sqlite.dialect()
+        field = sqlalchemy_jsonfield.JSONField(enforce_string=True, lazy=True).dialect_impl(dialect)
+        bind_processor = field.bind_processor(dialect)
+        result_processor = field.result_processor(dialect, None)
+
+        self.assertIsNone(result_processor(None))
+        stored = json.dumps({"key": ["val"]})
+        value = result_processor(stored)
+        self.assertIsInstance(value, sqlalchemy_jsonfield.LazyJSON)
+        self.assertFalse(value.is_decoded)
+        self.assertIs(bind_processor(value), stored)  # Not accessed: stored as is
+        self.assertEqual(value, result_processor(stored))
+        self.assertFalse(value.is_decoded)
+
+        self.assertEqual(value["key"], ["val"])
+        self.assertTrue(value.is_decoded)
+        self.assertEqual(value, {"key": ["val"]})
+        self.assertEqual({"key": ["val"]}, value)
+        self.assertEqual(list(value.items()), [("key", ["val"])])
+        self.assertIn("key", value)
+        self.assertEqual(len(value), 1)
+
+        value["key"].append("other")
+        self.assertEqual(bind_processor(value), json.dumps({"key": ["val", "other"]}))
+
+        native = sqlalchemy_jsonfield.JSONField(lazy=True).dialect_impl(dialect)
+        value = native.result_processor(dialect, None)(stored)
+        self.assertIsInstance(value, sqlalchemy_jsonfield.LazyJSON)
+        self.assertEqual(native.bind_processor(dialect)(value), stored)
+        self.assertNotEqual(
+            sqlalchemy_jsonfield.JSONField(lazy=True)._static_cache_key,
+            sqlalchemy_jsonfield.JSONField()._static_cache_key,
+        )
+
+    def test_encode_many(self) -> None:
+        dialect = sqlite.dialect()
+        field = sqlalchemy_jsonfield.JSONField(enforce_string=True)
+        bind_processor = field.dialect_impl(dialect).bind_processor(dialect)
+        lazy = sqlalchemy_jsonfield.LazyJSON(json.dumps({"lazy": 1}), json.loads)
+        values = [{"ключ": [1, 2.5, None]}, None, "text", lazy]
+
+        encoded = field.encode_many(values, dialect)
+        self.assertEqual(
+            [bind_processor(value) for value in encoded],
+            [json.dumps(values[0]), None, json.dumps("text"), json.dumps({"lazy": 1})],
+        )
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            self.assertEqual(field.encode_many(values, dialect, executor=executor, chunk_size=1), encoded)
+
+        self.assertEqual(sqlalchemy_jsonfield.JSONField().encode_many(values, dialect), values)  # native JSON
+
+        codec = sqlalchemy_jsonfield.StdlibCodec(json)
+        self.assertEqual(
+            codec.batch_encoder(ensure_ascii=False, binary=True)(values[:3]),
+            [json.dumps(value, ensure_ascii=False).encode("utf-8") for value in values[:3]],
+        )
+        with self.assertRaisesRegex(TypeError, "not JSON serializable"):
+            codec.batch_encoder()([object()])
+
+    def test_migration_converter(self) -> None:
+        class Wrapper:  # Driver wrapper of the bound document, not comparable with fetched values
+            def __init__(self, value: typing.Any) -> None:
+                self.value = value
+
+        convert = _converter(None, Wrapper, None)
+        self.assertEqual(convert([{"a": 1}]), [None])  # Driver-decoded value is compared by document
+        convert = _converter(json.loads, lambda value: json.dumps(value, separators=(",", ":")), None)
+        self.assertEqual(convert(['{"a": 1}', '{"a":1}']), ['{"a":1}', None])
+
+    def test_decode_cache(self) -> None:
+        cache = sqlalchemy_jsonfield.DecodeCache(2, max_item_size=100)
+        decode = cache.wrap(json.loads)
+
+        first = decode('{"key": [1]}')
+        first["key"].append(2)  # Cached value is not affected
+        self.assertEqual(decode('{"key": [1]}'), {"key": [1]})
+        self.assertIsNot(decode('{"key": [1]}'), decode('{"key": [1]}'))
+        self.assertEqual(cache.info()[:4], (3, 1, 0, 1))
+
+        decode(b"[1]")
+        decode(memoryview(b"[2]"))
+        self.assertEqual(cache.info().evictions, 1)
+        self.assertEqual(decode(json.dumps("x" * 200)), "x" * 200)  # Too large, not cached
+        self.assertEqual(cache.info()[:4], (3, 3, 1, 2))
+
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 0, 0, 0))
+
+        shared = sqlalchemy_jsonfield.DecodeCache(16)
+        plain = sqlalchemy_jsonfield.JSONField(enforce_string=True, decode_cache=shared)
+        frozen = sqlalchemy_jsonfield.JSONField(enforce_string=True, decode_cache=shared, frozen=True)
+        self.assertEqual(plain.process_result_value('{"key": [1]}', sqlite.dialect()), {"key": [1]})
+        self.assertIsInstance(
+            frozen.process_result_value('{"key": [1]}', sqlite.dialect()), sqlalchemy_jsonfield.FrozenDict
+        )
+        self.assertIs(type(plain.process_result_value('{"key": [1]}', sqlite.dialect())), dict)
+        self.assertEqual(shared.info()[:2], (1, 2))  # Fields sharing the cache do not see values of each other
+
+        dialect = sqlite.dialect()
+        for field in (
+            sqlalchemy_jsonfield.JSONField(decode_cache=16),
+            sqlalchemy_jsonfield.JSONField(enforce_binary=True, decode_cache=16),
+        ):
+            processor = field.dialect_impl(dialect).result_processor(dialect, None)
+            stored = field.dialect_impl(dialect).bind_processor(dialect)({"key": "val"})
+            self.assertIsNone(processor(None))
+            self.assertEqual(processor(stored), {"key": "val"})
+            self.assertEqual(processor(stored), {"key": "val"})
+            self.assertEqual(field.decode_cache.info()[:2], (1, 1))
+
+    def test_encode_cache(self) -> None:
+        cache = sqlalchemy_jsonfield.EncodeCache(64)
+        encode = cache.wrap(json.dumps)
+
+        document = sqlalchemy_jsonfield.NestedMutableDict({"key": {"nested": [1]}})
+        self.assertEqual(encode(document), '{"key": {"nested": [1]}}')
+        self.assertEqual(encode(document), '{"key": {"nested": [1]}}')
+        self.assertEqual(cache.info()[:2], (1, 1))
+
+        document["key"]["nested"].append(2)  # Change event invalidates cached value
+        self.assertEqual(encode(document), '{"key": {"nested": [1, 2]}}')
+        self.assertEqual(encode(document["key"]), '{"nested": [1, 2]}')  # Not a document root: not cached
+        self.assertEqual(encode({"plain": 1}), '{"plain": 1}')  # Changes are not tracked: not cached
+        self.assertEqual(encode(sqlalchemy_jsonfield.MutableJSONDict({"nested": {}})), '{"nested": {}}')
+        self.assertEqual(cache.info()[:4], (1, 2, 0, 1))
+
+        flat = sqlalchemy_jsonfield.MutableJSONDict({"key": "x" * 40})
+        encode(flat)
+        self.assertEqual(cache.info()[:4], (1, 3, 1, 1))  # Size limit: least recently used value is evicted
+        flat["key"] = "y"
+        self.assertEqual(encode(flat), '{"key": "y"}')
+        self.assertEqual(encode(flat), '{"key": "y"}')
+        self.assertEqual(cache.info()[:2], (2, 4))
+        self.assertEqual(cache.wrap(json.dumps)(flat), '{"key": "y"}')  # Other encoder: values are not shared
+        self.assertEqual(cache.info()[:2], (2, 5))
+
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 0, 0, 0))
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.EncodeCache(0)
+
+        dialect = sqlite.dialect()
+        for field in (
+            sqlalchemy_jsonfield.JSONField(encode_cache=1024),
+            sqlalchemy_jsonfield.JSONField(enforce_string=True, encode_cache=1024),
+        ):
+            processor = field.dialect_impl(dialect).bind_processor(dialect)
+            self.assertEqual(processor(document), processor(document))
+            self.assertEqual(field.encode_cache.info()[:2], (1, 1))
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(
+                encode_cache=1024, content_store=sqlalchemy_jsonfield.ContentStore(sqlalchemy.MetaData())
+            )
+
+    def test_frozen(self) -> None:
+        value = sqlalchemy_jsonfield.freeze({"a": [1, {"b": [2]}], "c": {"d": None}})
+        self.assertEqual(value, {"a": (1, {"b": (2,)}), "c": {"d": None}})
+        self.assertIsInstance(value["a"][1], sqlalchemy_jsonfield.FrozenDict)
+        self.assertEqual(hash(value), hash(sqlalchemy_jsonfield.freeze({"c": {"d": None}, "a": [1, {"b": [2]}]})))
+        self.assertEqual(pickle.loads(pickle.dumps(value)), value)  # noqa: S301
+        with self.assertRaises(TypeError):
+            value["a"] = 1
+        with self.assertRaises(TypeError):
+            value["c"].update(d=1)
+
+        thawed = sqlalchemy_jsonfield.thaw(value)
+        self.assertEqual(thawed, {"a": [1, {"b": [2]}], "c": {"d": None}})
+        self.assertIs(type(thawed["a"][1]), dict)
+
+        dialect = sqlite.dialect()
+        for field in (
+            sqlalchemy_jsonfield.JSONField(frozen=True, decode_cache=4),
+            sqlalchemy_jsonfield.JSONField(frozen=True, enforce_string=True, decode_cache=4),
+        ):
+            processor = field.dialect_impl(dialect).result_processor(dialect, None)
+            decoded = processor(json.dumps({"a": [1, 2]}))
+            self.assertEqual(decoded, {"a": (1, 2)})
+            self.assertIs(processor(json.dumps({"a": [1, 2]})), decoded)  # Shared without copying
+            self.assertEqual(field.dialect_impl(dialect).bind_processor(dialect)(decoded), json.dumps({"a": [1, 2]}))
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.mutable_json_field(frozen=True)
+
+    def test_query_path(self) -> None:
+        table = sqlalchemy.Table(
+            "query",
+            sqlalchemy.MetaData(),
+            sqlalchemy.Column("text_record", sqlalchemy_jsonfield.JSONField(enforce_string=True)),
+            sqlalchemy.Column("binary_record", sqlalchemy_jsonfield.JSONField(enforce_binary=True)),
+        )
+        column = table.c.text_record
+
+        def compile_sql(expression: typing.Any, dialect: typing.Any) -> str:
+            return str(expression.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+        self.assertEqual(
+            compile_sql(column["a"][1].as_integer(), mysql.dialect()),
+            "CASE JSON_EXTRACT(query.text_record, '$.\"a\"[1]') WHEN 'null' THEN NULL "
+            "ELSE CAST(JSON_EXTRACT(query.text_record, '$.\"a\"[1]') AS SIGNED INTEGER) END",
+        )
+        self.assertEqual(
+            compile_sql(column.contains({"a": 1}), mysql.dialect()),
+            "JSON_CONTAINS(query.text_record, '{\"a\": 1}', '$')",
+        )
+        self.assertEqual(
+            compile_sql(column["a"].as_string(), postgresql.dialect()),
+            "(CAST(query.text_record AS JSONB) #>> ARRAY['a'])",
+        )
+        self.assertEqual(
+            compile_sql(column.has_key("a"), postgresql.dialect()),
+            "(CAST(query.text_record AS JSONB) ? 'a')",
+        )
+        self.assertEqual(
+            (column["a"].as_string() == "x")._generate_cache_key(),
+            (column["a"].as_string() == "y")._generate_cache_key(),
+        )
+        self.assertNotEqual(
+            (column["a"].as_string() == "x")._generate_cache_key(),
+            (column["b"].as_string() == "x")._generate_cache_key(),
+        )
+        with self.assertRaises(TypeError):
+            column["a"].as_string()["b"]
+        with self.assertRaises(sqlalchemy.exc.CompileError):
+            compile_sql(table.c.binary_record["a"].as_string(), sqlite.dialect())
+        with self.assertRaises(sqlalchemy.exc.CompileError):
+            compile_sql(column["a"].as_string(), mssql.dialect())
+
+        # SQLite JSON path has no escapes in keys
+        self.assertEqual(
+            compile_sql(column['q"k'].as_json(), mysql.dialect()),
+            'JSON_EXTRACT(query.text_record, \'$."q\\\\"k"\')',
+        )
+        for expression in (column['q"k'].as_string(), column.contains({'q"k': 1}), column["a"].has_key('q"k')):
+            with self.subTest(expression=expression), self.assertRaises(sqlalchemy.exc.CompileError):
+                compile_sql(expression, sqlite.dialect())
+
+        stores = sqlalchemy.Table(
+            "stores",
+            sqlalchemy.MetaData(),
+            sqlalchemy.Column(
+                "content_record",
+                sqlalchemy_jsonfield.JSONField(content_store=sqlalchemy_jsonfield.ContentStore(sqlalchemy.MetaData())),
+            ),
+            sqlalchemy.Column(
+                "chunk_record",
+                sqlalchemy_jsonfield.JSONField(chunk_store=sqlalchemy_jsonfield.ChunkStore(sqlalchemy.MetaData())),
+            ),
+        )
+        for stored in stores.c:  # Column keeps references and manifests
+            with self.subTest(column=stored.name):
+                for expression in (stored["a"].as_string(), stored.contains({"a": 1}), stored.has_key("a")):
+                    with self.assertRaises(sqlalchemy.exc.CompileError):
+                        compile_sql(expression, sqlite.dialect())
+                with self.assertRaises(sqlalchemy.exc.CompileError):
+                    compile_sql(sqlalchemy_jsonfield.json_projection(stored, "a"), postgresql.dialect())
+
+    def test_projection(self) -> None:
+        table = sqlalchemy.Table(
+            "query",
+            sqlalchemy.MetaData(),
+            sqlalchemy.Column("text_record", sqlalchemy_jsonfield.JSONField(enforce_string=True)),
+            sqlalchemy.Column("binary_record", sqlalchemy_jsonfield.JSONField(enforce_binary=True)),
+        )
+        projection = sqlalchemy_jsonfield.json_projection(table.c.text_record, "meta.owner", ("status",), "meta")
+
+        def compile_sql(expression: typing.Any, dialect: typing.Any) -> str:
+            return str(expression.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+        # "meta" covers "meta.owner"
+        self.assertEqual(
+            compile_sql(projection, mysql.dialect()),
+            "JSON_OBJECT('meta', JSON_EXTRACT(query.text_record, '$.\"meta\"'), "
+            "'status', JSON_EXTRACT(query.text_record, '$.\"status\"'))",
+        )
+        self.assertEqual(
+            compile_sql(sqlalchemy_jsonfield.json_projection(table.c.text_record, "a.b", "a.c"), postgresql.dialect()),
+            "jsonb_build_object('a', jsonb_build_object("
+            "'b', CAST(query.text_record AS JSONB) #> ARRAY['a', 'b'], "
+            "'c', CAST(query.text_record AS JSONB) #> ARRAY['a', 'c']))",
+        )
+        self.assertIn("json_object('meta', CASE WHEN", compile_sql(projection, sqlite.dialect()))
+        self.assertEqual(
+            projection._generate_cache_key(),
+            sqlalchemy_jsonfield.json_projection(table.c.text_record, "status", "meta")._generate_cache_key(),
+        )
+
+        partial = sqlalchemy_jsonfield.PartialJSON({"meta": {"tags": [1]}, "status": None}, (("meta",), ("status",)))
+        self.assertEqual(partial, {"meta": {"tags": (1,)}, "status": None})
+        self.assertEqual(partial.paths, (("meta",), ("status",)))
+        self.assertEqual(pickle.loads(pickle.dumps(partial)), partial)  # noqa: S301
+        self.assertEqual(sqlalchemy_jsonfield.thaw(partial), {"meta": {"tags": [1]}, "status": None})
+        with self.assertRaises(TypeError):
+            partial["meta"]["tags"] = 1
+        with self.assertRaises(TypeError):  # Partial document can not be stored
+            table.c.text_record.type.process_bind_param(partial, sqlite.dialect())
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.json_projection(table.c.text_record)
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.json_projection(table.c.text_record, "a..b")
+        with self.assertRaises(sqlalchemy.exc.CompileError):
+            compile_sql(sqlalchemy_jsonfield.json_projection(table.c.binary_record, "a"), sqlite.dialect())
+        with self.assertRaises(sqlalchemy.exc.CompileError):
+            compile_sql(projection, mssql.dialect())
+        quoted = sqlalchemy_jsonfield.json_projection(table.c.text_record, ("a", 'q"k'))
+        self.assertIn("""'$."a"."q\\\\"k"'""", compile_sql(quoted, mysql.dialect()))
+        with self.assertRaises(sqlalchemy.exc.CompileError):  # SQLite JSON path has no escapes in keys
+            compile_sql(quoted, sqlite.dialect())
+
+    def test_indexed_paths(self) -> None:
+        field = sqlalchemy_jsonfield.JSONField(enforce_string=True, indexed_paths={"tenant": sqlalchemy.Integer})
+        table = sqlalchemy.Table(
+            "indexed",
+            sqlalchemy.MetaData(),
+            sqlalchemy.Column("json_record", field),
+        )
+        column = table.c.json_record
+        indexed = field.indexed_paths[("tenant",)]
+        self.assertEqual(indexed.as_type, "integer")
+
+        self.assertEqual(
+            str(AddGeneratedColumn(column, indexed).compile(dialect=mysql.dialect())),
+            "ALTER TABLE indexed ADD COLUMN json_record_tenant INTEGER GENERATED ALWAYS AS "
+            "(CASE JSON_EXTRACT(json_record, '$.\"tenant\"') WHEN 'null' THEN NULL "
+            "ELSE CAST(JSON_EXTRACT(json_record, '$.\"tenant\"') AS SIGNED INTEGER) END) VIRTUAL",
+        )
+        self.assertEqual(
+            str(CreatePathIndex(column, indexed).compile(dialect=mysql.dialect())),
+            "CREATE INDEX ix_indexed_json_record_tenant ON indexed (json_record_tenant)",
+        )
+        self.assertEqual(
+            str(CreatePathIndex(column, indexed).compile(dialect=postgresql.dialect())),
+            "CREATE INDEX ix_indexed_json_record_tenant ON indexed "
+            "((CAST(CAST(json_record AS JSONB) #>> ARRAY['tenant'] AS INTEGER)))",
+        )
+
+        self.assertEqual(
+            str(column["tenant"].as_integer().compile(dialect=mysql.dialect())), "indexed.json_record_tenant"
+        )
+        self.assertIn("POSTCOMPILE", str(column["tenant"].as_integer().compile(dialect=postgresql.dialect())))
+        self.assertIn("JSON_UNQUOTE", str(column["tenant"].as_string().compile(dialect=mysql.dialect())))
+        self.assertNotEqual(
+            field._static_cache_key,
+            sqlalchemy_jsonfield.JSONField(enforce_string=True)._static_cache_key,
+        )
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(enforce_binary=True, indexed_paths={"tenant": sqlalchemy.Integer})
+        with self.assertRaises(TypeError):
+            sqlalchemy_jsonfield.JSONField(indexed_paths={"tenant": sqlalchemy.JSON})
+
+    def test_stream(self) -> None:
+        parser = StdlibParser()
+        self.assertEqual(
+            list(parser.iterate(' { "a" : 1 , "b": [1, {"c": null}] } ')), [("a", 1), ("b", [1, {"c": None}])]
+        )
+        self.assertEqual(list(parser.iterate(b'[1, "x", true]')), [(0, 1), (1, "x"), (2, True)])
+        self.assertEqual(list(parser.iterate("[]")), [])
+        with self.assertRaises(TypeError):
+            list(parser.iterate("1"))
+        for malformed in ('{"a" 1}', "[1 2]", "[1] 2", "{1: 2}"):
+            with self.subTest(malformed=malformed), self.assertRaises(json.JSONDecodeError):
+                list(parser.iterate(malformed))
+
+        value = {"a": 1, "b": [1, 2]}
+        for field in (
+            sqlalchemy_jsonfield.JSONField(enforce_string=True, stream="stdlib"),
+            sqlalchemy_jsonfield.JSONField(compression="zlib", compression_threshold=1, stream="stdlib"),
+        ):
+            with self.subTest(field=field):
+                dialect = sqlite.dialect()
+                stored = field.bind_processor(dialect)(value)  # type: ignore[misc]
+                result = field.result_processor(dialect, None)(stored)  # type: ignore[misc]
+                self.assertIsInstance(result, sqlalchemy_jsonfield.JSONStream)
+                self.assertEqual(list(result), ["a", "b"])
+                self.assertEqual(list(result.items()), list(value.items()))
+                self.assertEqual(list(result.values()), [1, [1, 2]])
+                self.assertFalse(result.is_decoded)
+                self.assertEqual(field.bind_processor(dialect)(result), stored)  # type: ignore[misc]
+                self.assertEqual(result, value)
+                self.assertEqual(list(result.items()), list(value.items()))
+
+        array = sqlalchemy_jsonfield.JSONField(enforce_string=True, stream="stdlib").process_result_value(
+            "[1, 2]", sqlite.dialect()
+        )
+        self.assertEqual(list(array), [1, 2])
+        with self.assertRaises(TypeError):
+            list(array.items())
+
+        passes = []
+
+        class Counting(StdlibParser):
+            __slots__ = ()
+
+            def iterate(self, data: str | bytes) -> typing.Iterator[tuple[str | int, typing.Any]]:
+                passes.append(data)
+                return super().iterate(data)
+
+        document = sqlalchemy_jsonfield.JSONStream('{"a": 1, "b": 2}', json.loads, Counting())
+        self.assertEqual(list(document), ["a", "b"])
+        self.assertEqual(len(document), 2)
+        self.assertEqual(list(document), ["a", "b"])
+        self.assertEqual(len(passes), 1)
+        array = sqlalchemy_jsonfield.JSONStream("[1, 2, 3]", json.loads, Counting())
+        self.assertEqual(list(array.values()), [1, 2, 3])
+        self.assertEqual(len(array), 3)
+        self.assertEqual(len(passes), 2)
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(stream=True, lazy=True)
+
+    @unittest.skipIf(ijson is None, "ijson is not installed")
+    def test_stream_ijson(self) -> None:
+        document = '{"a": 1, "b": [1.5, {"c": null}], "d": "x"}'
+        self.assertEqual(list(IjsonParser().iterate(document)), list(StdlibParser().iterate(document)))
+        self.assertEqual(list(IjsonParser().iterate(b"[1, 2]")), [(0, 1), (1, 2)])
+
+    def test_schema(self) -> None:
+        order = Order(1, [Item("a", 2)], Item("owner"), ("x",), {"b": Item("b")}, [Order(2, [])])
+        builtins = {
+            "id": 1,
+            "items": [{"name": "a", "qty": 2}],
+            "owner": {"name": "owner", "qty": 1},
+            "tags": ["x"],
+            "by_name": {"b": {"name": "b", "qty": 1}},
+            "children": [{"id": 2, "items": [], "owner": None, "tags": [], "by_name": {}, "children": []}],
+        }
+        schema = get_schema(Order)
+        self.assertIs(get_schema(Order), schema)
+        self.assertEqual(json.loads(json.dumps(schema.to_builtins(order))), builtins)
+        self.assertEqual(schema.from_builtins(builtins), order)
+        self.assertEqual(schema.from_builtins({"id": 3, "items": []}), Order(3, []))
+
+        dialect = sqlite.dialect()
+        for field in (
+            sqlalchemy_jsonfield.JSONField(enforce_string=True, schema=Order),
+            sqlalchemy_jsonfield.JSONField(compression="zlib", compression_threshold=1, schema=Order),
+            sqlalchemy_jsonfield.JSONField(enforce_string=True, schema=Order, lazy=True),
+        ):
+            with self.subTest(field=field):
+                self.assertIs(field.schema, Order)
+                stored = field.bind_processor(dialect)(order)  # type: ignore[misc]
+                self.assertEqual(field.result_processor(dialect, None)(stored), order)  # type: ignore[misc]
+                self.assertEqual(field.process_result_value(field.process_bind_param(order, dialect), dialect), order)
+                (encoded,) = field.encode_many([order], dialect)
+                self.assertEqual(field.result_processor(dialect, None)(encoded[0]), order)  # type: ignore[misc]
+
+        typed_dict = sqlalchemy_jsonfield.JSONField(enforce_string=True, schema=OrderDict)
+        stored = typed_dict.process_bind_param({"id": 1, "item": Item("a")}, dialect)
+        self.assertEqual(json.loads(stored), {"id": 1, "item": {"name": "a", "qty": 1}})
+        self.assertEqual(typed_dict.process_result_value(stored, dialect), {"id": 1, "item": Item("a")})
+
+        with self.assertRaises(TypeError):
+            sqlalchemy_jsonfield.JSONField(schema=dict)
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(schema=Order, frozen=True)
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.mutable_json_field(schema=Order)
+
+    def test_schema_msgspec(self) -> None:
+        pytest.importorskip("msgspec")
+        order = Order(1, [Item("a", 2)])
+        dialect = sqlite.dialect()
+        for field in (
+            sqlalchemy_jsonfield.JSONField(enforce_string=True, schema=Order),
+            sqlalchemy_jsonfield.JSONField(schema=Order),  # Native: impl processor decodes value
+            sqlalchemy_jsonfield.JSONField(enforce_string=True, schema=Order, intern_table=True),
+        ):
+            with self.subTest(field=field):
+                stored = field.bind_processor(dialect)(order)  # type: ignore[misc]
+                self.assertEqual(field.result_processor(dialect, None)(stored), order)  # type: ignore[misc]
+
+        # Configured codec decodes the document, typed msgspec decoder is used for stdlib json and msgspec only
+        codec = sqlalchemy_jsonfield.CallableCodec(json.dumps, lambda data: {**json.loads(data), "id": 7})
+        custom = sqlalchemy_jsonfield.JSONField(enforce_string=True, schema=Order, json=codec)
+        self.assertEqual(custom.process_result_value('{"id": 1, "items": []}', dialect), Order(7, []))
+        self.assertIsNone(sqlalchemy_jsonfield.StdlibCodec(types.SimpleNamespace()).typed_decoder(Order))
+        self.assertIsNotNone(sqlalchemy_jsonfield.StdlibCodec().typed_decoder(Order))
+
+        msgspec = importlib.import_module("msgspec")
+        hooked = sqlalchemy_jsonfield.MsgspecCodec(
+            decoder=msgspec.json.Decoder(dec_hook=lambda type_, value: type_(value))
+        )
+        self.assertIsNotNone(hooked.typed_decoder(Order))
+        self.assertIsNone(
+            sqlalchemy_jsonfield.MsgspecCodec(decoder=msgspec.json.Decoder(type=dict)).typed_decoder(Order)
+        )
+
+    def test_schema_unresolved_hints(self) -> None:
+        if importlib.util.find_spec("msgspec") is not None:
+            self.skipTest("msgspec validates annotations itself")
+
+        def make() -> type:
+            class Local:
+                pass
+
+            @dataclasses.dataclass
+            class Partial:
+                item: Item
+                broken: Local
+                items: list[Item]
+
+            return Partial
+
+        partial = make()  # Local is not resolvable: only this field is not converted
+        schema = get_schema(partial)
+        self.assertEqual(
+            schema.from_builtins({"item": {"name": "a"}, "broken": {"x": 1}, "items": [{"name": "b"}]}),
+            partial(Item("a"), {"x": 1}, [Item("b")]),
+        )
+
+    def test_instrumentation(self) -> None:
+        dialect = sqlite.dialect()
+        plain = sqlalchemy_jsonfield.JSONField(enforce_string=True)
+        self.assertIsNone(plain.metrics_name)
+        self.assertNotEqual(plain.bind_processor(dialect).__name__, "encode_instrumented")  # type: ignore[union-attr]
+
+        field = sqlalchemy_jsonfield.JSONField(enforce_string=True, instrument="test_unit.metrics")
+        metrics = instrumentation.get_metrics("test_unit.metrics")
+        metrics.reset()
+        events: list[instrumentation.MetricEvent] = []
+        instrumentation.add_listener(events.append)
+        try:
+            encode = field.bind_processor(dialect)
+            decode = field.result_processor(dialect, None)
+            stored = encode({"a": "b"})  # type: ignore[misc]
+            self.assertEqual(decode(stored), {"a": "b"})  # type: ignore[misc]
+            self.assertIsNone(encode(None))  # type: ignore[misc]
+        finally:
+            instrumentation.remove_listener(events.append)
+
+        self.assertEqual([(event.operation, event.size) for event in events], [("encode", 10), ("decode", 10)])
+        counters = instrumentation.snapshot()["test_unit.metrics"]
+        for operation in ("encode", "decode"):
+            self.assertEqual(counters[operation]["calls"], 1)
+            self.assertEqual(counters[operation]["bytes"], 10)
+            self.assertEqual(counters[operation]["max_size"], 10)
+            self.assertEqual(sum(counters[operation]["histogram_us"].values()), 1)
+            self.assertGreater(counters[operation]["total_ns"], 0)
+
+        with self.assertLogs("sqlalchemy_jsonfield.instrumentation", level="INFO") as logs:
+            instrumentation.log_snapshot()
+        self.assertIn("test_unit.metrics encode: calls=1 bytes=10", "\n".join(logs.output))
+
+        table = sqlalchemy.Table(
+            "instrumented",
+            sqlalchemy.MetaData(),
+            sqlalchemy.Column("json_record", sqlalchemy_jsonfield.JSONField(instrument=True)),
+        )
+        self.assertEqual(table.c.json_record.type.metrics_name, "instrumented.json_record")
+
+    def test_codec(self) -> None:
+        self.assertEqual(sqlalchemy_jsonfield.get_codec(json), sqlalchemy_jsonfield.StdlibCodec(json))
+        self.assertNotEqual(
+            sqlalchemy_jsonfield.StdlibCodec(json), sqlalchemy_jsonfield.CallableCodec(json.dumps, json.loads)
+        )
+
+        field = sqlalchemy_jsonfield.JSONField(enforce_binary=True)
+        self.assertIsInstance(field.load_dialect_impl(sqlite.dialect()), sqlalchemy.types.LargeBinary)
+        self.assertEqual(
+            field.process_bind_param({"key": "val"}, sqlite.dialect()), json.dumps({"key": "val"}).encode()
+        )
+        self.assertEqual(
+            field.process_result_value(memoryview(json.dumps({"key": "val"}).encode()), sqlite.dialect()),
+            {"key": "val"},
+        )
+
+        codec = sqlalchemy_jsonfield.CallableCodec(lambda value: json.dumps(value).encode(), json.loads)
+        field = sqlalchemy_jsonfield.JSONField(enforce_string=True, json=codec)
+        self.assertEqual(field.process_bind_param(["val"], sqlite.dialect()), '["val"]')
+
+        # Unhashable options with value equality: equal codecs have equal hashes
+        first = sqlalchemy_jsonfield.StdlibCodec(types.SimpleNamespace(dumps=json.dumps, loads=json.loads))
+        second = sqlalchemy_jsonfield.StdlibCodec(types.SimpleNamespace(dumps=json.dumps, loads=json.loads))
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+
+        class Incomplete(sqlalchemy_jsonfield.JSONCodec):
+            __slots__ = ()
+
+            def encoder(self, ensure_ascii: bool = True, binary: bool = False, canonical: bool = False) -> typing.Any:
+                return json.dumps
+
+        with self.assertRaises(TypeError):
+            Incomplete()  # type: ignore[abstract]
+
+    def test_canonical(self) -> None:
+        dialect = sqlite.dialect()
+        document = {"b": [1, 2.5, {"y": None, "x": "ю"}], "a": True}
+        expected = '{"a":true,"b":[1,2.5,{"x":"\\u044e","y":null}]}'
+        codecs: list[typing.Any] = [json] if orjson is None else [json, orjson]
+        for codec in codecs:
+            with self.subTest(codec=codec.__name__):
+                field = sqlalchemy_jsonfield.JSONField(enforce_string=True, json=codec, canonical=True)
+                self.assertTrue(field.canonical)
+                self.assertEqual(field.process_bind_param(document, dialect), expected)
+                self.assertEqual(field.encode_many([document], dialect), [(expected,)])
+                self.assertTrue(field.compare_values({"b": 1, "a": 2}, {"a": 2, "b": 1}))
+                self.assertFalse(field.compare_values({"a": 1}, {"a": True}))
+                self.assertFalse(field.compare_values({"a": 1}, None))
+
+                # Strings and keys are NFC normalized, floats have the same representation for all codecs
+                self.assertEqual(
+                    field.process_bind_param({"e\u0301": ["e\u0301", 1e16, 1e-5, 2.5e-7, "1e5"]}, dialect),
+                    '{"\\u00e9":["\\u00e9",1e+16,1e-05,2.5e-07,"1e5"]}',
+                )
+                self.assertTrue(field.compare_values({"é": 0.00001}, {"e\u0301": 1e-5}))
+                unicode = sqlalchemy_jsonfield.JSONField(
+                    enforce_string=True, enforce_unicode=True, json=codec, canonical=True
+                )
+                self.assertEqual(unicode.process_bind_param({"a": "e\u0301"}, dialect), '{"a":"é"}')
+                self.assertEqual(unicode.encode_many([{"a": "e\u0301"}], dialect), [('{"a":"é"}',)])
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(enforce_string=True, canonical=True).process_bind_param(
+                float("nan"), dialect
+            )
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(
+                json=sqlalchemy_jsonfield.CallableCodec(json.dumps, json.loads), canonical=True
+            )
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson(self) -> None:
+        self.assertIsInstance(sqlalchemy_jsonfield.get_codec(orjson), sqlalchemy_jsonfield.OrjsonCodec)
+
+        field = sqlalchemy_jsonfield.JSONField(enforce_binary=True, enforce_unicode=True, json=orjson)
+        self.assertEqual(
+            field.process_bind_param({"ключ": "значение"}, sqlite.dialect()), orjson.dumps({"ключ": "значение"})
+        )
+
+        field = sqlalchemy_jsonfield.JSONField(enforce_string=True, json=orjson)
+        encoded = field.process_bind_param({"ключ": "значение"}, sqlite.dialect())
+        self.assertIsInstance(encoded, str)
+        self.assertTrue(encoded.isascii())
+        self.assertEqual(json.loads(encoded), {"ключ": "значение"})
+        self.assertEqual(field.process_result_value(encoded, sqlite.dialect()), {"ключ": "значение"})
+        codec = sqlalchemy_jsonfield.OrjsonCodec(option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        document = {"b": "значение 😀", "a": 1}
+        self.assertEqual(codec.encoder()(document), json.dumps(document, indent=2, sort_keys=True))
+
+        # Content store documents are encoded by the column codec
+        store = sqlalchemy_jsonfield.ContentStore(sqlalchemy.MetaData())
+        store.attach(sqlalchemy.create_engine("sqlite://"))
+        field = sqlalchemy_jsonfield.JSONField(json=orjson, content_store=store)
+        document = {"at": dt.datetime(2026, 1, 1, tzinfo=dt.timezone.utc), "b": 1}
+        ref = field.process_bind_param(document, sqlite.dialect())
+        self.assertEqual(len(ref), 64)
+        self.assertEqual(store.get(ref), orjson.dumps(document, option=orjson.OPT_SORT_KEYS).decode())
+
+        chunks = sqlalchemy_jsonfield.ChunkStore(sqlalchemy.MetaData(), threshold=20, chunk_size=40)
+        chunks.attach(sqlalchemy.create_engine("sqlite://"))
+        field = sqlalchemy_jsonfield.JSONField(json=orjson, chunk_store=chunks)
+        manifest = field.process_bind_param(document, sqlite.dialect())
+        self.assertTrue(manifest.startswith("@chunks:"))
+        self.assertEqual(field.process_result_value(manifest, sqlite.dialect()), orjson.loads(orjson.dumps(document)))
+
+    def test_chunk_store(self) -> None:
+        store = sqlalchemy_jsonfield.ChunkStore(sqlalchemy.MetaData(), threshold=100, chunk_size=60)
+        store.attach(sqlalchemy.create_engine("sqlite://"))
+        encoded: list[typing.Any] = []
+
+        def dumps(value: typing.Any) -> str:
+            encoded.append(value)
+            return json.dumps(value)
+
+        field = sqlalchemy_jsonfield.JSONField(
+            json=sqlalchemy_jsonfield.CallableCodec(dumps, json.loads), chunk_store=store
+        )
+        document = {f"key{idx}": "x" * 20 for idx in range(10)}
+        manifest = field.process_bind_param(document, sqlite.dialect())
+        self.assertTrue(manifest.startswith(sqlalchemy_jsonfield.chunks.MANIFEST_PREFIX))
+        value = field.process_result_value(manifest, sqlite.dialect())
+        self.assertEqual(len(encoded), value.chunks)  # Oversized document is encoded by chunks only
+        self.assertNotIn(document, encoded)
+        self.assertEqual(value, document)
+        self.assertEqual(field.process_bind_param({"small": 1}, sqlite.dialect()), '{"small": 1}')
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(chunk_store=store, encode_cache=1024)
+
+    def test_native_codec(self) -> None:
+        dialect = sqlite.dialect()
+        calls: list[str] = []
+
+        def dumps(value: typing.Any) -> str:
+            calls.append("dumps")
+            return json.dumps(value, separators=(",", ":"))
+
+        def loads(value: typing.Any) -> typing.Any:
+            calls.append("loads")
+            return json.loads(value)
+
+        field = sqlalchemy_jsonfield.JSONField(json=sqlalchemy_jsonfield.CallableCodec(dumps, loads))
+        self.assertTrue(field.use_native_json(dialect))
+        impl = field.dialect_impl(dialect)
+        bind_processor = impl.bind_processor(dialect)
+        result_processor = impl.result_processor(dialect, None)
+        self.assertEqual(bind_processor({"key": [1, 2]}), '{"key":[1,2]}')
+        self.assertEqual(result_processor('{"key":[1,2]}'), {"key": [1, 2]})
+        self.assertEqual(calls, ["dumps", "loads"])
+        # Dialect NULL handling is kept
+        self.assertIsNone(bind_processor(sqlalchemy.null()))
+        self.assertEqual(bind_processor(sqlalchemy.JSON.NULL), "null")
+        self.assertIsNone(result_processor(None))
+
+        canonical = sqlalchemy_jsonfield.JSONField(canonical=True)
+        self.assertEqual(canonical.dialect_impl(dialect).bind_processor(dialect)({"b": 1, "a": 2}), '{"a":2,"b":1}')
+        # Default codec: engine-wide serializer
+        default = sqlalchemy_jsonfield.JSONField()
+        self.assertEqual(default.dialect_impl(dialect).bind_processor(dialect)({"b": 1, "a": 2}), '{"b": 1, "a": 2}')
+
+    def test_intern_table(self) -> None:
+        dialect = sqlite.dialect()
+        stored = '{"status": "active", "nested": [{"status": "a long status value"}]}'
+        table = sqlalchemy_jsonfield.InternTable(max_value_length=8)
+        codecs: list[typing.Any] = [json, sqlalchemy_jsonfield.CallableCodec(json.dumps, json.loads)]
+        if orjson is not None:
+            codecs.append(orjson)
+        for codec in codecs:
+            with self.subTest(codec=codec):
+                table.clear()
+                field = sqlalchemy_jsonfield.JSONField(enforce_string=True, json=codec, intern_table=table)
+                self.assertIs(field.intern_table, table)
+                first = field.process_result_value(stored, dialect)
+                second = field.process_result_value(stored, dialect)
+                self.assertEqual(first, json.loads(stored))
+                self.assertIs(next(iter(first)), next(iter(second)))
+                self.assertIs(next(iter(second["nested"][0])), next(iter(first)))
+                self.assertIs(first["status"], second["status"])
+                info = table.info()
+                self.assertEqual(info.currsize, 3)
+                self.assertEqual(info.misses, 3)
+                self.assertEqual(info.hits, 5)
+                self.assertGreater(info.saved_bytes, 0)
+
+        # Native JSON mode
+        field = sqlalchemy_jsonfield.JSONField(intern_table=True)
+        result_processor = field.dialect_impl(dialect).result_processor(dialect, None)
+        self.assertIs(
+            next(iter(result_processor('{"shared_key": 1}'))), next(iter(result_processor('{"shared_key": 2}')))
+        )
+
+        bounded = sqlalchemy_jsonfield.InternTable(maxsize=1)
+        self.assertEqual(bounded.intern_value({"a": {"b": 1}}), {"a": {"b": 1}})
+        self.assertEqual(bounded.info().currsize, 1)
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(intern_table=True, stream=True)
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.InternTable(maxsize=0)
+
+    def test_compression(self) -> None:
+        dialect = sqlite.dialect()
+        document = {"key": "value" * 100}
+        encoded = json.dumps(document).encode()
+
+        for compression in ("zlib", "lzma"):
+            field = sqlalchemy_jsonfield.JSONField(compression=compression, compression_threshold=100)
+            self.assertIsInstance(field.load_dialect_impl(dialect), sqlalchemy.types.LargeBinary)
+
+            stored = field.process_bind_param(document, dialect)
+            self.assertEqual(stored[:1], b"\x00")
+            self.assertLess(len(stored), len(encoded))
+            self.assertEqual(field.process_result_value(stored, dialect), document)
+
+            # Below threshold: plain encoded value
+            self.assertEqual(field.process_bind_param({"key": "val"}, dialect), json.dumps({"key": "val"}).encode())
+
+            # Legacy rows
+            self.assertEqual(field.process_result_value(encoded, dialect), document)
+            self.assertEqual(field.process_result_value(encoded.decode(), dialect), document)
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(compression="unknown")
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(compression="zlib").process_result_value(b"\x00\x01\xfe" + encoded, dialect)
+
+    def test_storage_format(self) -> None:
+        dialect = sqlite.dialect()
+        document = {"int": 1, "big": 2**70, "neg": -5, "float": 0.5, "flags": [True, False, None], "text": "значение"}
+
+        field = sqlalchemy_jsonfield.JSONField(storage_format="compact")
+        self.assertEqual(field.storage_format, "compact")
+        self.assertTrue(field.is_binary)
+        self.assertIsInstance(field.load_dialect_impl(dialect), sqlalchemy.types.LargeBinary)
+
+        stored = field.process_bind_param(document, dialect)
+        self.assertEqual(stored[:3], b"\x00\x02\x00")
+        self.assertEqual(field.process_result_value(stored, dialect), document)
+        self.assertEqual(sqlalchemy_jsonfield.formats.compact_decode(stored[3:]), document)
+        # Rows in JSON are readable
+        self.assertEqual(field.process_result_value(json.dumps(document).encode(), dialect), document)
+        bind_processor = field.dialect_impl(dialect).bind_processor(dialect)
+        self.assertEqual(
+            [bind_processor(value) for value in field.encode_many([document, None], dialect)], [stored, None]
+        )
+
+        compressed = sqlalchemy_jsonfield.JSONField(
+            storage_format="compact", compression="zlib", compression_threshold=64
+        )
+        packed = compressed.process_bind_param({"key": "value" * 100}, dialect)
+        self.assertEqual(packed[:3], b"\x00\x02\x01")
+        self.assertEqual(field.process_result_value(packed, dialect), {"key": "value" * 100})
+        # JSON field reads rows in binary format
+        self.assertEqual(
+            sqlalchemy_jsonfield.JSONField(enforce_binary=True).process_result_value(stored, dialect), document
+        )
+
+        custom = sqlalchemy_jsonfield.StorageFormat(
+            "repr",
+            200,
+            lambda value: repr(value).encode(),
+            lambda data: eval(bytes(data)),  # noqa: S307
+        )
+        sqlalchemy_jsonfield.register_format(custom)
+        self.assertEqual(field.process_result_value(b"\x00\xc8\x00[1, 2]", dialect), [1, 2])
+
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.register_format(custom._replace(name="other"))
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.register_format(custom._replace(ident=1))
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(storage_format="unknown")
+        with self.assertRaises(ValueError):
+            sqlalchemy_jsonfield.JSONField(storage_format="compact", canonical=True)
+        with self.assertRaises(ValueError):
+            field.process_result_value(b"\x00\xfe\x00", dialect)
+        for truncated in (stored[3:-1], b"\x03\x01\x02", b"\x05\x00"):  # Missing tail, int and float bytes
+            with self.subTest(truncated=truncated), self.assertRaises(ValueError):
+                sqlalchemy_jsonfield.formats.compact_decode(truncated)
+        with self.assertRaises(TypeError):
+            sqlalchemy_jsonfield.formats.compact_encode({1: 2})
+
+    def test_nested_mutable(self) -> None:
+        document = sqlalchemy_jsonfield.NestedMutable.coerce("json_record", {"a": {"b": [1, {"c": 2}]}, "d": 1})
+        self.assertIsInstance(document, sqlalchemy_jsonfield.NestedMutableDict)
+        self.assertIsNone(document._json_dirty)
+
+        nested = document["a"]["b"]
+        self.assertIsInstance(nested, sqlalchemy_jsonfield.NestedMutableList)
+        nested[1]["c"] = 3
+        del document["d"]
+        document["a"]["e"] = {"f": 1}
+        self.assertEqual(document._json_dirty, {("a", "b", 1, "c"), ("d",), ("a", "e")})
+
+        nested.insert(0, 0)
+        nested[2]["c"] = 4
+        self.assertEqual(
+            sqlalchemy_jsonfield.mutable._normalize_paths(document._json_dirty),
+            [("d",), ("a", "b"), ("a", "e")],
+        )
+        self.assertEqual(document, {"a": {"b": [0, 1, {"c": 4}], "e": {"f": 1}}})
+
+        # Detached containers do not affect the document
+        document._json_dirty = None
+        removed = document.pop("a")
+        removed["b"].append(5)
+        self.assertEqual(document._json_dirty, {("a",)})
+
+        # Pickle support: plain structure is restored
+        restored = pickle.loads(pickle.dumps(removed))  # noqa: S301
+        self.assertEqual(restored, {"b": [0, 1, {"c": 4}, 5], "e": {"f": 1}})
+        self.assertIs(type(restored["b"]), sqlalchemy_jsonfield.NestedMutableList)
+
+        self.assertEqual(sqlalchemy_jsonfield.mutable._text_path(("a", 1, 'q"'), "mysql"), '$."a"[1]."q\\""')
+        self.assertEqual(sqlalchemy_jsonfield.mutable._text_path(("a", 1, "b\\c"), "sqlite"), '$."a"[1]."b\\\\c"')
+        for key in ('q"', "é", "a\nb"):
+            with self.subTest(key=key), self.assertRaises(ValueError):
+                sqlalchemy_jsonfield.mutable._text_path(("a", key), "sqlite")